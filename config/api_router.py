@@ -10,7 +10,8 @@ from lolo.tournament.api.views import (
     ParticipationViewSet,
     UserTournamentProfileViewSet,
     PublicTournamentViewSet,
-    SponsorViewSet
+    SponsorViewSet,
+    ResumableUploadViewSet
 
 )
 
@@ -26,6 +27,7 @@ router.register("videos", VideoSubmissionViewSet)
 router.register('profiles', UserTournamentProfileViewSet, basename='user-profile')
 router.register(r'public', PublicTournamentViewSet, basename='public-tournaments')
 router.register(r'sponsors', SponsorViewSet)
+router.register('resumable-uploads', ResumableUploadViewSet, basename='resumable-upload')
 
 
 app_name = "api"
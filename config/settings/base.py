@@ -91,6 +91,7 @@ LOCAL_APPS = [
     "lolo.users",
     "lolo.tournament",
     "lolo.tickets",
+    "lolo.server_timing",
 
     # Your stuff: custom apps go here
 ]
@@ -148,6 +149,8 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
+    # Last, so its view timing covers only the view
+    "lolo.middleware.ServerTimingMiddleware",
 ]
 
 # STATIC
@@ -173,6 +176,13 @@ MEDIA_URL = "/media/"
 
 MAX_UPLOAD_SIZE = 104857600  # 100MB in bytes
 ALLOWED_VIDEO_EXTENSIONS = ['mp4', 'mov', 'avi']
+MAX_AVATAR_UPLOAD_SIZE = 5242880  # 5MB in bytes
+MAX_IMAGE_UPLOAD_SIZE = 10485760  # 10MB in bytes
+FFMPEG_BINARY = env("FFMPEG_BINARY", default="ffmpeg")
+# Transcodes allowed at once across all media workers
+VIDEO_TRANSCODE_CONCURRENCY = env.int("VIDEO_TRANSCODE_CONCURRENCY", default=2)
+# Partial resumable uploads; must be shared by every web worker
+RESUMABLE_UPLOAD_ROOT = env("DJANGO_RESUMABLE_UPLOAD_ROOT", default=str(APPS_DIR / "uploads"))
 # TEMPLATES
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#templates
@@ -325,17 +335,75 @@ CELERY_TASK_TIME_LIMIT = 5 * 60
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#task-soft-time-limit
 # TODO: set to whatever value is adequate in your circumstances
 CELERY_TASK_SOFT_TIME_LIMIT = 60
+# https://docs.celeryq.dev/en/stable/userguide/configuration.html#task-routes
+# Transcodes get their own queue and workers so they never delay other tasks
+CELERY_TASK_ROUTES = {
+    "lolo.tournament.tasks.transcode_video": {"queue": "media"},
+}
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#beat-scheduler
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#worker-send-task-events
 CELERY_WORKER_SEND_TASK_EVENTS = True
 # https://docs.celeryq.dev/en/stable/userguide/configuration.html#std-setting-task_send_sent_event
 CELERY_TASK_SEND_SENT_EVENT = True
+# https://docs.celeryq.dev/en/stable/userguide/periodic-tasks.html#beat-entries
+# Synced into django_celery_beat's database schedule when beat starts.
+CELERY_BEAT_SCHEDULE = {
+    "refresh-closing-soon-ranking": {
+        "task": "lolo.tournament.tasks.refresh_closing_soon_ranking",
+        "schedule": 60.0,
+    },
+    "flush-view-counters": {
+        "task": "lolo.tournament.tasks.flush_view_counters",
+        "schedule": 30.0,
+    },
+    "clean-resumable-uploads": {
+        "task": "lolo.tournament.tasks.clean_resumable_uploads",
+        "schedule": 60.0 * 60,
+    },
+    # Picks up events whose on-commit enqueue was lost
+    "process-stripe-events": {
+        "task": "lolo.tickets.tasks.process_stripe_events",
+        "schedule": 60.0,
+    },
+    "checkpoint-ticket-balances": {
+        "task": "lolo.tickets.tasks.checkpoint_ticket_balances",
+        "schedule": 60.0 * 60,
+    },
+    "reconcile-ticket-balances": {
+        "task": "lolo.tickets.tasks.reconcile_ticket_balances",
+        "schedule": 60.0 * 60 * 24,
+    },
+}
 # django-allauth
 # ------------------------------------------------------------------------------
 ACCOUNT_ALLOW_REGISTRATION = env.bool("DJANGO_ACCOUNT_ALLOW_REGISTRATION", True)
 
 
+# Payments
+# ------------------------------------------------------------------------------
+# lolo.tickets.gateways.FakeGateway serves checkouts in-process for load tests
+PAYMENT_GATEWAY = env("PAYMENT_GATEWAY", default="lolo.tickets.gateways.StripeGateway")
+# (connect, read) seconds per Stripe request, and retries of failed requests
+STRIPE_TIMEOUT = (3, 8)
+STRIPE_MAX_NETWORK_RETRIES = env.int("STRIPE_MAX_NETWORK_RETRIES", default=2)
+# How long a repeated checkout waits on the first one's session; by default
+# the longest a Stripe call can take, retries included
+CHECKOUT_TIMEOUT = env.float(
+    "CHECKOUT_TIMEOUT",
+    default=sum(STRIPE_TIMEOUT) * (STRIPE_MAX_NETWORK_RETRIES + 1),
+)
+
+# SERVER TIMING
+# ------------------------------------------------------------------------------
+# Fraction of requests reported by lolo.middleware.ServerTimingMiddleware
+SERVER_TIMING_SAMPLE_RATE = env.float("DJANGO_SERVER_TIMING_SAMPLE_RATE", default=0.0)
+# Per-endpoint rates by URL name pattern, first match wins,
+# e.g. {"api:tournament-*": 0.1, "tickets:webhook": 0}
+SERVER_TIMING_ENDPOINTS = {}
+# Also expose the timings to clients as a Server-Timing header (they are always logged)
+SERVER_TIMING_HEADER = env.bool("DJANGO_SERVER_TIMING_HEADER", default=True)
+
 FRONTEND_URL = env('FRONTEND_URL', default='https://lolo-sable.vercel.app')
 FRONTEND_DOMAIN = env('FRONTEND_DOMAIN', default='https://lolo-sable.vercel.app')
 
@@ -362,12 +430,18 @@ SOCIALACCOUNT_FORMS = {"signup": "lolo.users.forms.UserSocialSignupForm"}
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework.authentication.TokenAuthentication",
+        "lolo.users.authentication.CachedTokenAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Multipart uploads are checked for type and size while they stream in
+    "DEFAULT_PARSER_CLASSES": (
+        "rest_framework.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "lolo.tournament.api.parsers.MediaMultiPartParser",
+    ),
     # Add these new settings
     "DEFAULT_FILTER_BACKENDS": (
         "django_filters.rest_framework.DjangoFilterBackend",
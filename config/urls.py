@@ -35,7 +35,8 @@ urlpatterns = [
     
     # Your stuff: custom urls includes go here
     # ...
-    # Media files
+    # Media files; videos go through the range-capable streaming view first
+    path("media/", include("lolo.tournament.urls", namespace="tournament")),
     *static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT),
 ]
 if settings.DEBUG:
@@ -1,3 +1,4 @@
+import fakeredis
 import pytest
 
 from lolo.users.models import User
@@ -9,6 +10,13 @@ def _media_storage(settings, tmpdir) -> None:
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def redis_client(monkeypatch):
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr("lolo.tournament.redis_store._client", client)
+    return client
+
+
 @pytest.fixture
 def user(db) -> User:
     return UserFactory()
@@ -1,3 +1,13 @@
+import json
+import logging
+
+from django.conf import settings
+
+from lolo import server_timing
+
+timing_logger = logging.getLogger("lolo.server_timing")
+
+
 class RequestLoggingMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -36,4 +46,38 @@ class RequestLoggingMiddleware:
             print("Could not decode response content")
             
         print("========================\n")
-        return response
\ No newline at end of file
+        return response
+
+
+class ServerTimingMiddleware:
+    """
+    For a sample of requests, reports SQL queries and time, cache hits and
+    misses, serializer time and view time as a Server-Timing header and one
+    JSON log line on "lolo.server_timing". Sample rates are per view name
+    (SERVER_TIMING_ENDPOINTS), defaulting to SERVER_TIMING_SAMPLE_RATE.
+    Keep this last in MIDDLEWARE so the view time covers just the view and
+    its rendering.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timings = request.server_timing = server_timing.RequestTimings()
+        with server_timing.collecting(timings):
+            response = self.get_response(request)
+        if timings.sampled:
+            if settings.SERVER_TIMING_HEADER:
+                response["Server-Timing"] = timings.header()
+            timing_logger.info(json.dumps({
+                "view": request.resolver_match.view_name,
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                **timings.as_dict(),
+            }))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if server_timing.should_sample(request.resolver_match.view_name):
+            request.server_timing.start()
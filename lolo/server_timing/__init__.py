@@ -0,0 +1,194 @@
+import random
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from fnmatch import fnmatchcase
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+# Timings of the request being handled in this context; only sampled ones collect
+_current = ContextVar("server_timing", default=None)
+_MISS = object()
+
+
+class RequestTimings:
+    """Counters and durations (seconds) collected for one sampled request"""
+
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.serializer_time = 0.0
+        self.view_time = 0.0
+        self.sampled = False
+        self._started = None
+        # Nested instrumented calls (get_many -> get, nested serializers) count once
+        self._depth = 0
+        self._stack = ExitStack()
+
+    def start(self):
+        """Begin collecting; the request was picked for sampling"""
+        self.sampled = True
+        self._started = time.perf_counter()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self.time_query))
+
+    def stop(self):
+        self._stack.close()
+        if self.sampled:
+            self.view_time = time.perf_counter() - self._started
+
+    def time_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.query_time += time.perf_counter() - started
+
+    def as_dict(self):
+        return {
+            "db_queries": self.queries,
+            "db_ms": round(self.query_time * 1000, 1),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "serializer_ms": round(self.serializer_time * 1000, 1),
+            "view_ms": round(self.view_time * 1000, 1),
+        }
+
+    def header(self):
+        """The Server-Timing header value"""
+        return ", ".join([
+            f'db;dur={self.query_time * 1000:.1f};desc="{self.queries} queries"',
+            f'cache;desc="{self.cache_hits} hits {self.cache_misses} misses"',
+            f"serializer;dur={self.serializer_time * 1000:.1f}",
+            f"view;dur={self.view_time * 1000:.1f}",
+        ])
+
+
+def sample_rate(view_name):
+    """
+    The fraction of requests to `view_name` (e.g. "api:tournament-list") to
+    time: the first matching SERVER_TIMING_ENDPOINTS pattern, otherwise
+    SERVER_TIMING_SAMPLE_RATE.
+    """
+    for pattern, rate in settings.SERVER_TIMING_ENDPOINTS.items():
+        if view_name and fnmatchcase(view_name, pattern):
+            return rate
+    return settings.SERVER_TIMING_SAMPLE_RATE
+
+
+@contextmanager
+def collecting(timings):
+    """
+    Make `timings` the current request's for the duration of the block.
+    Set and reset in one frame, so it holds under ASGI too, where the
+    middleware hooks run in copied contexts.
+    """
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        timings.stop()
+        _current.reset(token)
+
+
+def _collecting():
+    timings = _current.get()
+    return timings if timings is not None and timings.sampled else None
+
+
+def should_sample(view_name):
+    rate = sample_rate(view_name)
+    return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+class _Nested:
+    """Counts nesting so calls made inside an instrumented call count once"""
+
+    def __init__(self, timings):
+        self.timings = timings
+
+    def __enter__(self):
+        self.timings._depth += 1
+        return self.timings._depth > 1
+
+    def __exit__(self, *exc):
+        self.timings._depth -= 1
+
+
+def _timed_cache_get(get):
+    @wraps(get)
+    def wrapper(self, key, default=None, version=None, **kwargs):
+        timings = _collecting()
+        if timings is None:
+            return get(self, key, default, version, **kwargs)
+        with _Nested(timings) as nested:
+            if nested:
+                return get(self, key, default, version, **kwargs)
+            value = get(self, key, _MISS, version, **kwargs)
+        if value is _MISS:
+            timings.cache_misses += 1
+            return default
+        timings.cache_hits += 1
+        return value
+    wrapper._server_timing = True
+    return wrapper
+
+
+def _timed_cache_get_many(get_many):
+    @wraps(get_many)
+    def wrapper(self, keys, version=None, **kwargs):
+        timings = _collecting()
+        if timings is None:
+            return get_many(self, keys, version, **kwargs)
+        with _Nested(timings) as nested:
+            if nested:
+                return get_many(self, keys, version, **kwargs)
+            keys = list(keys)
+            found = get_many(self, keys, version, **kwargs)
+        timings.cache_hits += len(found)
+        timings.cache_misses += len(keys) - len(found)
+        return found
+    wrapper._server_timing = True
+    return wrapper
+
+
+def _timed_serializer(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        timings = _collecting()
+        if timings is None:
+            return method(self, *args, **kwargs)
+        with _Nested(timings) as nested:
+            started = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                if not nested:
+                    timings.serializer_time += time.perf_counter() - started
+    wrapper._server_timing = True
+    return wrapper
+
+
+def install():
+    """
+    Hook the configured cache backends and DRF serializers up to the
+    current request's timings. Called once, from ServerTimingConfig.ready;
+    the hooks do nothing outside sampled requests.
+    """
+    from django.core.cache import caches
+    from rest_framework.serializers import BaseSerializer
+
+    for alias in settings.CACHES:
+        backend = type(caches[alias])
+        if not getattr(backend.get, "_server_timing", False):
+            backend.get = _timed_cache_get(backend.get)
+            backend.get_many = _timed_cache_get_many(backend.get_many)
+    # Validation plus representation; nested serializers are inside these calls
+    if not getattr(BaseSerializer.is_valid, "_server_timing", False):
+        BaseSerializer.is_valid = _timed_serializer(BaseSerializer.is_valid)
+        BaseSerializer.data = property(_timed_serializer(BaseSerializer.data.fget))
@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class ServerTimingConfig(AppConfig):
+    name = "lolo.server_timing"
+    verbose_name = "Server timing"
+
+    def ready(self):
+        # Only hook caches and serializers where the middleware can sample
+        if "lolo.middleware.ServerTimingMiddleware" in settings.MIDDLEWARE:
+            from lolo.server_timing import install
+
+            install()
@@ -1,7 +1,9 @@
 from django.contrib import admin
+from django.db import transaction
 from django.utils.translation import gettext_lazy as _
 from django.utils.html import format_html
-from .models import TicketPackage, Order, TicketTransaction
+from .models import TicketPackage, Order, TicketTransaction, StripeEvent, LedgerDrift
+from .tasks import process_stripe_events
 
 @admin.register(TicketPackage)
 class TicketPackageAdmin(admin.ModelAdmin):
@@ -121,4 +123,47 @@ class TicketTransactionAdmin(admin.ModelAdmin):
             'fields': ('created_at',),
             'classes': ('collapse',),
         })
-    ]
\ No newline at end of file
+    ]
+
+@admin.register(StripeEvent)
+class StripeEventAdmin(admin.ModelAdmin):
+    list_display = [
+        'event_id',
+        'event_type',
+        'status',
+        'attempts',
+        'stripe_created',
+        'processed_at',
+    ]
+    list_filter = ['status', 'event_type']
+    search_fields = ['event_id']
+    readonly_fields = [
+        'event_id',
+        'event_type',
+        'payload',
+        'stripe_created',
+        'attempts',
+        'error',
+        'received_at',
+        'processed_at',
+    ]
+    actions = ['requeue_events']
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description=_("Requeue selected events"))
+    def requeue_events(self, request, queryset):
+        queryset.exclude(status='processed').update(status='pending')
+        transaction.on_commit(process_stripe_events.delay)
+
+
+@admin.register(LedgerDrift)
+class LedgerDriftAdmin(admin.ModelAdmin):
+    list_display = ['user', 'tickets', 'ledger_balance', 'detected_at', 'resolved']
+    list_filter = ['resolved', 'detected_at']
+    search_fields = ['user__username', 'user__email']
+    readonly_fields = ['user', 'tickets', 'ledger_balance', 'detected_at']
+
+    def has_add_permission(self, request):
+        return False
@@ -13,4 +13,10 @@ class OrderSerializer(serializers.ModelSerializer):
     class Meta:
         model = Order
         fields = ['id', 'ticket_package', 'status', 'created_at']
-        read_only_fields = ['status']
\ No newline at end of file
+        read_only_fields = ['status']
+
+class TicketTransactionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TicketTransaction
+        fields = ['id', 'transaction_type', 'number_of_tickets', 'balance_after',
+                 'order', 'notes', 'created_at']
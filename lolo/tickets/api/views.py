@@ -1,19 +1,30 @@
+import json
+
 import stripe
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.decorators import method_decorator
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 
-from ..models import TicketPackage, Order, TicketTransaction
-from .serializers import TicketPackageSerializer, OrderSerializer
+from ..checkout import CheckoutError, start_checkout
+from lolo.tournament.api.pagination import KeysetPagination
+from ..ledger import ledger_balance
+from ..models import TicketPackage, TicketTransaction
+from ..tasks import process_stripe_events
+from ..webhooks import record_event
+from .serializers import TicketPackageSerializer, OrderSerializer, TicketTransactionSerializer
 
 stripe.api_key = settings.STRIPE_SECRET_KEY
 
+# No transaction is held open while the payment provider is called
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
 class TicketPackageViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = TicketPackage.objects.filter(is_active=True)
     serializer_class = TicketPackageSerializer
@@ -29,91 +40,56 @@ class TicketPackageViewSet(viewsets.ReadOnlyModelViewSet):
                 {'error': 'return_url is required'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        # Create order first
-        order = Order.objects.create(
-            user=request.user,
-            ticket_package=package,
-            status='pending'
-        )
 
+        # Get the auth token for the user
+        auth_token = request.auth.key if hasattr(request, 'auth') and request.auth else None
         try:
-            # Get the auth token for the user
-            auth_token = request.auth.key if hasattr(request, 'auth') and request.auth else None
-            
-            # Include the token in the success URL
-            success_url = (
-                f"{return_url}?status=success"
-                f"&session_id={{CHECKOUT_SESSION_ID}}"
-                f"&token={auth_token if auth_token else ''}"
-                f"&return_url={return_url}"
-            )
-            
-            # Create Stripe Checkout Session
-            checkout_session = stripe.checkout.Session.create(
-                client_reference_id=request.user.id,
-                customer_email=request.user.email,
-                allow_promotion_codes=True,
-                invoice_creation={
-                    'enabled': True,
-                    'invoice_data': {
-                        'description': f'Purchase of {package.name} - {package.number_of_tickets} Tickets',
-                        'custom_fields': [
-                            {'name': 'Order ID', 'value': str(order.id)},
-                            {'name': 'Package', 'value': package.name}
-                        ],
-                        'footer': 'Thank you for your purchase!'
-                    }
-                },
-                line_items=[{
-                    'price_data': {
-                        'currency': 'eur',
-                        'product_data': {
-                            'name': package.name,
-                            'description': f'{package.number_of_tickets} Tickets',
-                        },
-                        'unit_amount': int(package.price * 100),
-                    },
-                    'quantity': 1,
-                }],
-                mode='payment',
-                success_url=success_url,
-                cancel_url=f"{return_url}?status=cancelled",
-                payment_method_types=['card'],
-                metadata={
-                    'order_id': order.id,
-                    'package_id': package.id,
-                    'number_of_tickets': package.number_of_tickets,
-                    'return_url': return_url
-                }
-            )
-            
-            order.stripe_checkout_session_id = checkout_session.id
-            order.save()
-
-            return Response({
-                'checkout_url': checkout_session.url
-            })
-
-        except Exception as e:
-            order.status = 'failed'
-            order.save()
+            return Response(start_checkout(request.user, package, return_url, auth_token))
+        except CheckoutError as e:
             return Response(
                 {'error': str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+class TicketTransactionViewSet(viewsets.ReadOnlyModelViewSet):
+    """The requesting user's ticket ledger, newest first"""
+    serializer_class = TicketTransactionSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        return TicketTransaction.objects.filter(user=self.request.user).order_by('-id')
+
+    @action(detail=False)
+    def balance(self, request):
+        """Current balance next to the balance the ledger implies"""
+        # Read fresh, not from the (possibly cached) request.user. The row
+        # lock waits out a purchase that moved tickets but hasn't committed
+        # its transaction row yet, so both numbers come from the same moment.
+        tickets = get_user_model().objects.select_for_update(no_key=True).filter(
+            pk=request.user.pk
+        ).values_list('tickets', flat=True).get()
+        ledger = ledger_balance(request.user.pk)
+        return Response({
+            'tickets': tickets,
+            'ledger_balance': ledger,
+            'consistent': ledger == tickets
+        })
+
 class StripeWebhookView(APIView):
+    """
+    Verify and store the event, then answer straight away; a worker applies
+    it (see lolo.tickets.webhooks). Redeliveries are deduplicated by event id.
+    """
     authentication_classes = []
     permission_classes = []
 
-    @transaction.atomic
     def post(self, request, *args, **kwargs):
         payload = request.body
         sig_header = request.META.get('HTTP_STRIPE_SIGNATURE')
 
         try:
-            event = stripe.Webhook.construct_event(
+            stripe.Webhook.construct_event(
                 payload, sig_header, settings.STRIPE_WEBHOOK_SECRET
             )
         except ValueError as e:
@@ -121,39 +97,8 @@ class StripeWebhookView(APIView):
         except stripe.error.SignatureVerificationError as e:
             return Response(status=status.HTTP_400_BAD_REQUEST)
 
-        # Handle the checkout.session.completed event
-        if event['type'] == 'checkout.session.completed':
-            session = event['data']['object']
-            
-            # Retrieve the order
-            order = Order.objects.get(
-                stripe_checkout_session_id=session.id
-            )
-            
-            if order.status == 'completed':
-                return Response(status=status.HTTP_200_OK)
-            
-            # Update order status
-            order.status = 'completed'
-            order.stripe_payment_intent_id = session.payment_intent
-            order.save()
-
-            # Add tickets to user's balance
-            package = order.ticket_package
-            user = order.user
-            
-            # Create ticket transaction
-            TicketTransaction.objects.create(
-                user=user,
-                order=order,
-                transaction_type='purchase',
-                number_of_tickets=package.number_of_tickets,
-                balance_after=user.tickets + package.number_of_tickets,
-                notes=f"Purchase of {package.name} package"
-            )
-            
-            # Update user's ticket balance
-            user.tickets += package.number_of_tickets
-            user.save()
+        # Keep the raw JSON rather than the parsed StripeObject
+        if record_event(json.loads(payload)):
+            transaction.on_commit(process_stripe_events.delay)
 
-        return Response(status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(status=status.HTTP_200_OK)
@@ -0,0 +1,77 @@
+# lolo/tickets/checkout.py
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .gateways import GatewayError, create_checkout_session
+from .models import Order
+
+# A repeated tap within this window gets the session already created
+CHECKOUT_SESSION_CACHE_TIMEOUT = 60
+CHECKOUT_POLL_INTERVAL = 0.1
+PENDING = 'pending'
+
+
+class CheckoutError(Exception):
+    """No checkout session could be created"""
+
+
+def _session_key(user, package, return_url):
+    digest = hashlib.md5(return_url.encode()).hexdigest()
+    return f'checkout:{user.pk}:{package.pk}:{digest}'
+
+
+def _wait_for_session(key):
+    deadline = time.monotonic() + settings.CHECKOUT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(CHECKOUT_POLL_INTERVAL)
+        cached = cache.get(key)
+        if cached is None:
+            # The other attempt failed; let the client retry
+            break
+        if cached != PENDING:
+            return cached
+    raise CheckoutError("A checkout for this package is already in progress")
+
+
+def start_checkout(user, package, return_url, auth_token=None):
+    """
+    {'checkout_url': ...} for a new order on `package`. Double-taps with the
+    same (user, package, return_url) share one order and gateway session:
+    the first claims the cache key, later ones reuse or wait for its result.
+    """
+    key = _session_key(user, package, return_url)
+    cached = cache.get(key)
+    if cached is not None and cached != PENDING:
+        return cached
+    if not cache.add(key, PENDING, settings.CHECKOUT_TIMEOUT + 5):
+        return _wait_for_session(key)
+
+    order = Order.objects.create(user=user, ticket_package=package, status='pending')
+    # Include the token in the success URL
+    success_url = (
+        f"{return_url}?status=success"
+        f"&session_id={{CHECKOUT_SESSION_ID}}"
+        f"&token={auth_token if auth_token else ''}"
+        f"&return_url={return_url}"
+    )
+    try:
+        session = create_checkout_session(
+            order=order,
+            package=package,
+            user=user,
+            success_url=success_url,
+            cancel_url=f"{return_url}?status=cancelled",
+            return_url=return_url
+        )
+    except GatewayError as e:
+        cache.delete(key)
+        Order.objects.filter(pk=order.pk).update(status='failed')
+        raise CheckoutError(str(e))
+
+    Order.objects.filter(pk=order.pk).update(stripe_checkout_session_id=session.id)
+    result = {'checkout_url': session.url}
+    cache.set(key, result, CHECKOUT_SESSION_CACHE_TIMEOUT)
+    return result
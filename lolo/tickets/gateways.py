@@ -0,0 +1,125 @@
+# lolo/tickets/gateways.py
+import abc
+import time
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+
+import stripe
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class GatewayError(Exception):
+    """The payment provider failed, refused or didn't answer in time"""
+
+
+@dataclass
+class CheckoutSession:
+    id: str
+    url: str
+
+
+class PaymentGateway(abc.ABC):
+    """
+    Creates hosted checkout sessions. Select an implementation with the
+    PAYMENT_GATEWAY setting. Implementations bound their own calls and raise
+    GatewayError when the provider fails or doesn't answer in time.
+    """
+
+    @abc.abstractmethod
+    def create_checkout_session(self, *, order, package, user, success_url, cancel_url, return_url):
+        """Return a CheckoutSession for `order`"""
+
+
+class StripeGateway(PaymentGateway):
+    """Stripe Checkout with connect/read timeouts and idempotent retries"""
+
+    def __init__(self):
+        self.client = stripe.StripeClient(
+            settings.STRIPE_SECRET_KEY,
+            http_client=stripe.RequestsClient(timeout=settings.STRIPE_TIMEOUT),
+            max_network_retries=settings.STRIPE_MAX_NETWORK_RETRIES
+        )
+
+    def create_checkout_session(self, *, order, package, user, success_url, cancel_url, return_url):
+        params = {
+            'client_reference_id': str(user.id),
+            'customer_email': user.email,
+            'allow_promotion_codes': True,
+            'invoice_creation': {
+                'enabled': True,
+                'invoice_data': {
+                    'description': f'Purchase of {package.name} - {package.number_of_tickets} Tickets',
+                    'custom_fields': [
+                        {'name': 'Order ID', 'value': str(order.id)},
+                        {'name': 'Package', 'value': package.name}
+                    ],
+                    'footer': 'Thank you for your purchase!'
+                }
+            },
+            'line_items': [{
+                'price_data': {
+                    'currency': 'eur',
+                    'product_data': {
+                        'name': package.name,
+                        'description': f'{package.number_of_tickets} Tickets',
+                    },
+                    'unit_amount': int(package.price * 100),
+                },
+                'quantity': 1,
+            }],
+            'mode': 'payment',
+            'success_url': success_url,
+            'cancel_url': cancel_url,
+            'payment_method_types': ['card'],
+            'metadata': {
+                'order_id': str(order.id),
+                'package_id': str(package.id),
+                'number_of_tickets': str(package.number_of_tickets),
+                'return_url': return_url
+            }
+        }
+        try:
+            session = self.client.v1.checkout.sessions.create(
+                params=params,
+                # Retries of the same order never open a second session
+                options={'idempotency_key': f'checkout-order-{order.id}'}
+            )
+        except stripe.APIConnectionError:
+            # Raised once the connect/read timeouts and retries are used up
+            raise GatewayError("Payment provider timed out")
+        except stripe.StripeError as e:
+            raise GatewayError(e.user_message or str(e))
+        return CheckoutSession(id=session.id, url=session.url)
+
+
+class FakeGateway(PaymentGateway):
+    """
+    In-process gateway for local runs and load tests: no network, optional
+    latency (PAYMENT_GATEWAY_FAKE_LATENCY seconds). Sessions are recorded on
+    the class.
+    """
+    sessions = []
+
+    def create_checkout_session(self, *, order, package, user, success_url, cancel_url, return_url):
+        latency = getattr(settings, 'PAYMENT_GATEWAY_FAKE_LATENCY', 0)
+        if latency:
+            time.sleep(latency)
+        session_id = f'cs_fake_{uuid.uuid4().hex}'
+        session = CheckoutSession(
+            id=session_id,
+            url=success_url.replace('{CHECKOUT_SESSION_ID}', session_id)
+        )
+        self.sessions.append((order.id, session))
+        return session
+
+
+@lru_cache
+def get_gateway(path):
+    return import_string(path)()
+
+
+def create_checkout_session(**kwargs):
+    """Create a checkout session on the configured gateway"""
+    return get_gateway(settings.PAYMENT_GATEWAY).create_checkout_session(**kwargs)
@@ -0,0 +1,143 @@
+# lolo/tickets/ledger.py
+import logging
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, F, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import LedgerDrift, TicketBalanceCheckpoint, TicketTransaction
+
+logger = logging.getLogger(__name__)
+
+# A new checkpoint is written once a user has this many transactions past their last one
+CHECKPOINT_INTERVAL = 50
+# Only transactions at least this old are checkpointed, so a slow commit with a lower id can't be skipped
+CHECKPOINT_SETTLE_TIME = timedelta(minutes=5)
+RECONCILE_CHUNK_SIZE = 2000
+# Newest settled transaction the last checkpoint run looked at. Losing it only costs one full scan.
+CHECKPOINT_MARK_KEY = 'ledger:checkpoint-mark'
+
+
+def _latest_checkpoint(field, user_ref='user'):
+    return Subquery(
+        TicketBalanceCheckpoint.objects.filter(
+            user=OuterRef(user_ref)
+        ).order_by('-last_transaction_id').values(field)[:1]
+    )
+
+
+def ledger_balance(user_id):
+    """Latest checkpoint plus the (short) tail of transactions after it"""
+    checkpoint = TicketBalanceCheckpoint.objects.filter(
+        user_id=user_id
+    ).order_by('-last_transaction_id').values('last_transaction_id', 'balance').first()
+    checkpoint = checkpoint or {'last_transaction_id': 0, 'balance': 0}
+    tail = TicketTransaction.objects.filter(
+        user_id=user_id,
+        id__gt=checkpoint['last_transaction_id']
+    ).aggregate(total=Coalesce(Sum('number_of_tickets'), 0))['total']
+    return checkpoint['balance'] + tail
+
+
+def create_checkpoints(interval=CHECKPOINT_INTERVAL):
+    """
+    Checkpoint every user with at least `interval` settled transactions past
+    their last checkpoint. A user's tail only grows through new transactions,
+    so only users with transactions settled since the previous run are
+    considered; the cost follows recent activity, not total history.
+    Returns the number written.
+    """
+    mark = cache.get(CHECKPOINT_MARK_KEY, 0)
+    settled = TicketTransaction.objects.filter(
+        id__gt=mark,
+        created_at__lt=timezone.now() - CHECKPOINT_SETTLE_TIME
+    )
+    new_mark = settled.aggregate(last=Max('id'))['last']
+    if new_mark is None:
+        return 0
+
+    active_users = settled.filter(id__lte=new_mark).values('user_id')
+    tails = TicketTransaction.objects.filter(
+        user_id__in=active_users,
+        id__lte=new_mark
+    ).annotate(
+        checkpoint_id=Coalesce(_latest_checkpoint('last_transaction_id'), Value(0))
+    ).filter(
+        id__gt=F('checkpoint_id')
+    ).values('user_id').annotate(
+        count=Count('id'),
+        delta=Sum('number_of_tickets'),
+        last_id=Max('id'),
+        base=Coalesce(_latest_checkpoint('balance', 'user_id'), Value(0))
+    ).filter(count__gte=interval).order_by()
+
+    checkpoints = [
+        TicketBalanceCheckpoint(
+            user_id=tail['user_id'],
+            last_transaction_id=tail['last_id'],
+            balance=tail['base'] + tail['delta']
+        )
+        for tail in tails.iterator(chunk_size=RECONCILE_CHUNK_SIZE)
+    ]
+    TicketBalanceCheckpoint.objects.bulk_create(
+        checkpoints, batch_size=RECONCILE_CHUNK_SIZE, ignore_conflicts=True
+    )
+    cache.set(CHECKPOINT_MARK_KEY, new_mark, None)
+    return len(checkpoints)
+
+
+def reconcile():
+    """
+    Compare every User.tickets with its ledger balance in one streamed pass
+    (a server-side cursor; memory stays flat however many users there are)
+    and record a LedgerDrift per mismatch, refreshing the user's open one if
+    they have one. One statement reads both sides from the same snapshot, so
+    in-flight entries can't show up as drift. Returns the number of drifting
+    users.
+    """
+    tail = TicketTransaction.objects.filter(
+        user=OuterRef('pk'),
+        id__gt=OuterRef('checkpoint_id')
+    ).values('user').annotate(total=Sum('number_of_tickets')).values('total')
+    drifting = get_user_model().objects.annotate(
+        checkpoint_id=Coalesce(_latest_checkpoint('last_transaction_id', 'pk'), Value(0)),
+        checkpoint_balance=Coalesce(_latest_checkpoint('balance', 'pk'), Value(0)),
+    ).annotate(
+        ledger=F('checkpoint_balance') + Coalesce(Subquery(tail), Value(0))
+    ).exclude(tickets=F('ledger')).values_list('pk', 'tickets', 'ledger')
+
+    found, batch = 0, []
+    for row in drifting.iterator(chunk_size=RECONCILE_CHUNK_SIZE):
+        batch.append(row)
+        if len(batch) >= RECONCILE_CHUNK_SIZE:
+            found += _record_drifts(batch)
+            batch = []
+    found += _record_drifts(batch)
+    if found:
+        logger.warning("Ticket reconciliation found %s users drifting from the ledger", found)
+    return found
+
+
+def _record_drifts(rows):
+    """
+    One open LedgerDrift per user: a user already flagged and not yet
+    resolved gets their figures refreshed instead of another row.
+    """
+    open_drifts = {
+        drift.user_id: drift
+        for drift in LedgerDrift.objects.filter(resolved=False, user_id__in=[row[0] for row in rows])
+    }
+    new, changed = [], []
+    for user_id, tickets, ledger in rows:
+        drift = open_drifts.get(user_id)
+        if drift is None:
+            new.append(LedgerDrift(user_id=user_id, tickets=tickets, ledger_balance=ledger))
+        elif (drift.tickets, drift.ledger_balance) != (tickets, ledger):
+            drift.tickets, drift.ledger_balance = tickets, ledger
+            changed.append(drift)
+    LedgerDrift.objects.bulk_create(new)
+    LedgerDrift.objects.bulk_update(changed, ['tickets', 'ledger_balance'])
+    return len(rows)
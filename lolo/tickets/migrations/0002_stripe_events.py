@@ -0,0 +1,71 @@
+# Generated by Django 5.0.9 on 2026-10-17 05:13
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def retype_duplicate_purchases(apps, schema_editor):
+    """
+    Redelivered webhooks could credit an order more than once. Keep the first
+    purchase per order and retype the repeats as bonuses so the constraint
+    below can be added; the tickets were really credited, so deleting the
+    rows would only leave the ledger short of User.tickets.
+    """
+    TicketTransaction = apps.get_model('tickets', 'TicketTransaction')
+    orders = TicketTransaction.objects.filter(
+        transaction_type='purchase', order__isnull=False
+    ).values('order').annotate(purchases=Count('id')).filter(purchases__gt=1).values_list('order', flat=True)
+
+    retyped = 0
+    for order_id in orders.iterator():
+        first, *repeats = TicketTransaction.objects.filter(
+            transaction_type='purchase', order_id=order_id
+        ).order_by('id')
+        for repeat in repeats:
+            repeat.transaction_type = 'bonus'
+            repeat.notes = (
+                f"{repeat.notes}\n" if repeat.notes else ''
+            ) + f"Duplicate purchase credit for order {order_id} (first credited by #{first.id})"
+            repeat.save(update_fields=['transaction_type', 'notes'])
+            retyped += 1
+    if retyped:
+        print(f"\n  Retyped {retyped} duplicate purchase transaction(s) as bonus; review them in the admin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StripeEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.CharField(max_length=255, unique=True)),
+                ('event_type', models.CharField(max_length=100)),
+                ('payload', models.JSONField()),
+                ('stripe_created', models.DateTimeField(help_text='When Stripe created the event; events apply in this order')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processed', 'Processed'), ('ignored', 'Ignored'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['stripe_created', 'id'],
+            },
+        ),
+        migrations.RunPython(retype_duplicate_purchases, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='tickettransaction',
+            constraint=models.UniqueConstraint(condition=models.Q(('transaction_type', 'purchase')), fields=('order',), name='unique_purchase_per_order'),
+        ),
+        migrations.AddIndex(
+            model_name='stripeevent',
+            index=models.Index(fields=['status', 'stripe_created'], name='stripeevent_status_created'),
+        ),
+    ]
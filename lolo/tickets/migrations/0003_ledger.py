@@ -0,0 +1,53 @@
+# Generated by Django 5.0.9 on 2026-10-17 05:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0002_stripe_events'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerDrift',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tickets', models.IntegerField(help_text='User.tickets when checked')),
+                ('ledger_balance', models.IntegerField()),
+                ('detected_at', models.DateTimeField(auto_now_add=True)),
+                ('resolved', models.BooleanField(default=False)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TicketBalanceCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_transaction_id', models.BigIntegerField(help_text='Newest TicketTransaction included')),
+                ('balance', models.IntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='tickettransaction',
+            index=models.Index(fields=['user', 'id'], name='tickettransaction_user_id'),
+        ),
+        migrations.AddField(
+            model_name='ledgerdrift',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_drifts', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='ticketbalancecheckpoint',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ticket_checkpoints', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='ticketbalancecheckpoint',
+            constraint=models.UniqueConstraint(fields=('user', 'last_transaction_id'), name='unique_checkpoint_per_transaction'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.0.9 on 2026-10-17 09:12
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+BATCH_SIZE = 2000
+
+
+def _save(TicketBalanceCheckpoint, batch):
+    TicketBalanceCheckpoint.objects.bulk_create(
+        batch,
+        update_conflicts=True,
+        unique_fields=['user', 'last_transaction_id'],
+        update_fields=['balance']
+    )
+
+
+def open_balances(apps, schema_editor):
+    """
+    Balances predate the ledger (and admin edits never wrote transactions),
+    so checkpoint every user at their current tickets through their newest
+    transaction. The ledger is taken as correct from here on.
+    """
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    TicketTransaction = apps.get_model('tickets', 'TicketTransaction')
+    TicketBalanceCheckpoint = apps.get_model('tickets', 'TicketBalanceCheckpoint')
+    newest = TicketTransaction.objects.filter(user=OuterRef('pk')).order_by('-id').values('id')[:1]
+    users = User.objects.annotate(
+        last_transaction_id=Coalesce(Subquery(newest), Value(0))
+    ).values_list('pk', 'tickets', 'last_transaction_id')
+
+    batch = []
+    for user_id, tickets, last_transaction_id in users.iterator(chunk_size=BATCH_SIZE):
+        batch.append(TicketBalanceCheckpoint(
+            user_id=user_id,
+            last_transaction_id=last_transaction_id,
+            balance=tickets
+        ))
+        if len(batch) >= BATCH_SIZE:
+            _save(TicketBalanceCheckpoint, batch)
+            batch = []
+    _save(TicketBalanceCheckpoint, batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0003_ledger'),
+        # The RunPython reads User.tickets
+        ('users', '0002_user_tickets'),
+    ]
+
+    operations = [
+        migrations.RunPython(open_balances, migrations.RunPython.noop),
+    ]
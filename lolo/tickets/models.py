@@ -99,5 +99,87 @@ class TicketTransaction(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     notes = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            # Per-user history pages and checkpoint tails
+            models.Index(fields=['user', 'id'], name='tickettransaction_user_id'),
+        ]
+        constraints = [
+            # An order is credited at most once, however often Stripe delivers its event
+            models.UniqueConstraint(
+                fields=['order'],
+                condition=models.Q(transaction_type='purchase'),
+                name='unique_purchase_per_order'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.transaction_type}: {self.number_of_tickets} tickets for {self.user.username}"
+
+class TicketBalanceCheckpoint(models.Model):
+    """
+    A user's ledger balance through one transaction. The balance implied by
+    the ledger is the latest checkpoint plus the transactions after it.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='ticket_checkpoints'
+    )
+    last_transaction_id = models.BigIntegerField(help_text=_("Newest TicketTransaction included"))
+    balance = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'last_transaction_id'], name='unique_checkpoint_per_transaction'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.balance} through #{self.last_transaction_id}"
+
+class LedgerDrift(models.Model):
+    """A user whose ticket balance disagreed with the ledger at reconciliation"""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='ledger_drifts'
+    )
+    tickets = models.IntegerField(help_text=_("User.tickets when checked"))
+    ledger_balance = models.IntegerField()
+    detected_at = models.DateTimeField(auto_now_add=True)
+    resolved = models.BooleanField(default=False)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.tickets} vs ledger {self.ledger_balance}"
+
+class StripeEvent(models.Model):
+    """
+    A verified Stripe webhook event, stored as received and applied later by
+    a worker. The unique event id turns redeliveries into no-ops.
+    """
+    STATUS_CHOICES = [
+        ('pending', _('Pending')),
+        ('processed', _('Processed')),
+        ('ignored', _('Ignored')),
+        ('failed', _('Failed')),
+    ]
+
+    event_id = models.CharField(max_length=255, unique=True)
+    event_type = models.CharField(max_length=100)
+    payload = models.JSONField()
+    stripe_created = models.DateTimeField(help_text=_("When Stripe created the event; events apply in this order"))
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['stripe_created', 'id']
+        indexes = [
+            models.Index(fields=['status', 'stripe_created'], name='stripeevent_status_created'),
+        ]
+
     def __str__(self):
-        return f"{self.transaction_type}: {self.number_of_tickets} tickets for {self.user.username}"
\ No newline at end of file
+        return f"{self.event_type} {self.event_id}"
\ No newline at end of file
@@ -0,0 +1,22 @@
+from celery import shared_task
+
+from .ledger import create_checkpoints, reconcile
+from .webhooks import apply_pending_events
+
+
+@shared_task()
+def process_stripe_events():
+    """Apply stored Stripe webhook events in the order Stripe created them."""
+    return apply_pending_events()
+
+
+@shared_task()
+def checkpoint_ticket_balances():
+    """Write balance checkpoints for users with a long ledger tail."""
+    return create_checkpoints()
+
+
+@shared_task(soft_time_limit=60 * 60, time_limit=65 * 60)
+def reconcile_ticket_balances():
+    """Flag users whose ticket balance disagrees with the ledger."""
+    return reconcile()
@@ -0,0 +1,105 @@
+# lolo/tickets/test_api/test_checkout.py
+import threading
+from decimal import Decimal
+
+import pytest
+import stripe
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from lolo.users.tests.factories import UserFactory
+from ..checkout import PENDING, _session_key
+from ..gateways import FakeGateway, GatewayError, PaymentGateway, get_gateway
+from ..models import Order, TicketPackage
+
+
+class FailingGateway(PaymentGateway):
+    def create_checkout_session(self, **kwargs):
+        raise GatewayError("card network down")
+
+
+@pytest.fixture(autouse=True)
+def _fake_gateway(settings):
+    settings.PAYMENT_GATEWAY = 'lolo.tickets.gateways.FakeGateway'
+    cache.clear()
+    FakeGateway.sessions.clear()
+
+
+@pytest.fixture
+def package():
+    return TicketPackage.objects.create(name='Ten', number_of_tickets=10, price=Decimal('5.00'))
+
+
+def checkout(user, package, return_url='https://app.example/buy'):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client.post(
+        reverse('tickets:package-create-checkout-session', kwargs={'pk': package.pk}),
+        {'return_url': return_url},
+        format='json'
+    )
+
+
+@pytest.mark.django_db
+class TestCheckout:
+    def test_session_is_created_for_a_new_order(self, package):
+        user = UserFactory()
+
+        response = checkout(user, package)
+
+        order = Order.objects.get(user=user)
+        assert response.status_code == 200
+        assert response.data['checkout_url'].startswith('https://app.example/buy?status=success&session_id=cs_fake_')
+        assert order.stripe_checkout_session_id == FakeGateway.sessions[0][1].id
+        assert order.status == 'pending'
+
+    def test_double_tap_reuses_the_session(self, package):
+        user = UserFactory()
+
+        first = checkout(user, package)
+        second = checkout(user, package)
+        other_return = checkout(user, package, 'https://app.example/other')
+
+        assert first.data == second.data
+        assert other_return.data != first.data
+        assert Order.objects.filter(user=user).count() == 2
+
+    def test_concurrent_tap_waits_for_the_first(self, package):
+        user = UserFactory()
+        key = _session_key(user, package, 'https://app.example/buy')
+        # Another request has claimed the key and is still talking to the gateway
+        cache.set(key, PENDING)
+        threading.Timer(0.2, cache.set, (key, {'checkout_url': 'https://pay.example/1'})).start()
+
+        response = checkout(user, package)
+
+        assert response.data == {'checkout_url': 'https://pay.example/1'}
+        assert not Order.objects.exists()
+
+    def test_gateway_failure_fails_the_order(self, package, settings):
+        settings.PAYMENT_GATEWAY = 'lolo.tickets.test_api.test_checkout.FailingGateway'
+        user = UserFactory()
+
+        response = checkout(user, package)
+
+        assert response.status_code == 400
+        assert response.data == {'error': 'card network down'}
+        assert Order.objects.get(user=user).status == 'failed'
+        # A retry isn't blocked by the failed attempt
+        assert checkout(user, package).status_code == 400
+
+    def test_stripe_timeout_fails_the_checkout(self, package, settings, monkeypatch):
+        settings.PAYMENT_GATEWAY = 'lolo.tickets.gateways.StripeGateway'
+        settings.STRIPE_SECRET_KEY = 'sk_test_checkout'
+        get_gateway.cache_clear()
+
+        def stalled(*args, **kwargs):
+            raise stripe.APIConnectionError("Request timed out")
+
+        monkeypatch.setattr(get_gateway(settings.PAYMENT_GATEWAY).client.v1.checkout.sessions, 'create', stalled)
+        response = checkout(UserFactory(), package)
+        get_gateway.cache_clear()
+
+        assert response.status_code == 400
+        assert response.data == {'error': 'Payment provider timed out'}
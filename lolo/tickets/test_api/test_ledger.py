@@ -0,0 +1,158 @@
+# lolo/tickets/test_api/test_ledger.py
+from datetime import timedelta
+from importlib import import_module
+
+import pytest
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from lolo.users.tests.factories import UserFactory
+from ..ledger import create_checkpoints, ledger_balance, reconcile
+from ..models import LedgerDrift, TicketBalanceCheckpoint, TicketTransaction
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+
+
+def record(user, deltas, age=timedelta(hours=1)):
+    balance = 0
+    for delta in deltas:
+        balance += delta
+        TicketTransaction.objects.create(
+            user=user,
+            transaction_type='purchase' if delta > 0 else 'use',
+            number_of_tickets=delta,
+            balance_after=balance
+        )
+    TicketTransaction.objects.filter(user=user).update(created_at=timezone.now() - age)
+    return balance
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.mark.django_db
+class TestHistory:
+    def test_pages_newest_first(self):
+        user = UserFactory()
+        record(user, [10, -2, -2, 5, -1])
+        record(UserFactory(), [7])
+        url = reverse('tickets:transaction-list')
+
+        first = client_for(user).get(url, {'page_size': 3}).data
+        second = client_for(user).get(first['next']).data
+
+        assert [row['number_of_tickets'] for row in first['results']] == [-1, 5, -2]
+        assert [row['number_of_tickets'] for row in second['results']] == [-2, 10]
+        assert second['next'] is None
+
+    def test_balance_matches_ledger(self):
+        user = UserFactory(tickets=10)
+        record(user, [12, -2])
+
+        data = client_for(user).get(reverse('tickets:transaction-balance')).data
+
+        assert data == {'tickets': 10, 'ledger_balance': 10, 'consistent': True}
+
+    def test_balance_reads_tickets_fresh(self):
+        user = UserFactory(tickets=10)
+        record(user, [10])
+        client = client_for(user)
+        # A purchase lands after the request's user was loaded
+        record(user, [5])
+        get_user_model().objects.filter(pk=user.pk).update(tickets=15)
+
+        data = client.get(reverse('tickets:transaction-balance')).data
+
+        assert data == {'tickets': 15, 'ledger_balance': 15, 'consistent': True}
+
+
+@pytest.mark.django_db
+class TestCheckpoints:
+    def test_checkpoint_plus_tail_gives_the_balance(self):
+        user = UserFactory()
+        record(user, [10, -3, 4])
+
+        assert create_checkpoints(interval=3) == 1
+        checkpoint = TicketBalanceCheckpoint.objects.get(user=user)
+        assert checkpoint.balance == 11
+        assert checkpoint.last_transaction_id == TicketTransaction.objects.filter(user=user).latest('id').id
+
+        TicketTransaction.objects.create(user=user, transaction_type='use', number_of_tickets=-1, balance_after=10)
+        assert ledger_balance(user.pk) == 10
+
+    def test_only_long_settled_tails_are_checkpointed(self):
+        user = UserFactory()
+        record(user, [10, -3, 4])
+        assert create_checkpoints(interval=3) == 1
+        recent = UserFactory()
+        record(recent, [1, 1, 1], age=timedelta(0))
+
+        # user's tail is empty now; the other user's transactions are too fresh
+        assert create_checkpoints(interval=3) == 0
+
+        TicketTransaction.objects.bulk_create([
+            TicketTransaction(user=user, transaction_type='bonus', number_of_tickets=1, balance_after=0)
+            for _ in range(3)
+        ])
+        TicketTransaction.objects.filter(user=user).update(created_at=timezone.now() - timedelta(hours=1))
+        assert create_checkpoints(interval=3) == 1
+        assert TicketBalanceCheckpoint.objects.filter(user=user).latest('last_transaction_id').balance == 14
+
+
+@pytest.mark.django_db
+class TestReconcile:
+    def test_flags_only_drifting_users(self):
+        honest = UserFactory(tickets=8)
+        record(honest, [10, -2])
+        checkpointed = UserFactory(tickets=5)
+        record(checkpointed, [3, 3, -1])
+        create_checkpoints(interval=3)
+        drifting = UserFactory(tickets=50)
+        record(drifting, [10])
+
+        assert reconcile() == 1
+
+        drift = LedgerDrift.objects.get()
+        assert (drift.user, drift.tickets, drift.ledger_balance) == (drifting, 50, 10)
+
+    def test_open_drift_is_refreshed_not_repeated(self):
+        drifting = UserFactory(tickets=50)
+        record(drifting, [10])
+
+        reconcile()
+        drifting.tickets = 60
+        drifting.save(update_fields=['tickets'])
+        assert reconcile() == 1
+
+        drift = LedgerDrift.objects.get()
+        assert (drift.tickets, drift.ledger_balance) == (60, 10)
+
+        drift.resolved = True
+        drift.save()
+        reconcile()
+        assert LedgerDrift.objects.filter(resolved=False).count() == 1
+
+    def test_opening_balances_cover_pre_ledger_tickets(self):
+        migration = import_module('lolo.tickets.migrations.0004_opening_balances')
+        legacy = UserFactory(tickets=30)
+        partial = UserFactory(tickets=25)
+        record(partial, [10, -2])
+
+        migration.open_balances(apps, None)
+        TicketTransaction.objects.create(user=partial, transaction_type='use', number_of_tickets=-5, balance_after=20)
+        partial.tickets = 20
+        partial.save(update_fields=['tickets'])
+
+        assert ledger_balance(legacy.pk) == 30
+        assert ledger_balance(partial.pk) == 20
+        assert reconcile() == 0
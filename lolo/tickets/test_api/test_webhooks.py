@@ -0,0 +1,154 @@
+# lolo/tickets/test_api/test_webhooks.py
+import hashlib
+import hmac
+import json
+import time
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from lolo.users.tests.factories import UserFactory
+from ..models import Order, StripeEvent, TicketPackage, TicketTransaction
+from ..webhooks import MAX_EVENT_ATTEMPTS, apply_pending_events, record_event
+
+SECRET = 'whsec_test'
+
+
+@pytest.fixture(autouse=True)
+def _webhook_secret(settings):
+    settings.STRIPE_WEBHOOK_SECRET = SECRET
+
+
+@pytest.fixture
+def order():
+    package = TicketPackage.objects.create(name='Ten', number_of_tickets=10, price=Decimal('5.00'))
+    return Order.objects.create(
+        user=UserFactory(tickets=3),
+        ticket_package=package,
+        stripe_checkout_session_id='cs_test_1'
+    )
+
+
+def completed_event(order, event_id='evt_1', session_id='cs_test_1', created=None):
+    return {
+        'id': event_id,
+        'object': 'event',
+        'type': 'checkout.session.completed',
+        'created': created or int(time.time()),
+        'data': {'object': {
+            'id': session_id,
+            'object': 'checkout.session',
+            'payment_intent': 'pi_1',
+            'metadata': {'order_id': str(order.pk)},
+        }},
+    }
+
+
+def deliver(event, secret=SECRET):
+    payload = json.dumps(event)
+    timestamp = int(time.time())
+    signature = hmac.new(secret.encode(), f'{timestamp}.{payload}'.encode(), hashlib.sha256).hexdigest()
+    return APIClient().post(
+        reverse('tickets:webhook'),
+        payload,
+        content_type='application/json',
+        HTTP_STRIPE_SIGNATURE=f't={timestamp},v1={signature}'
+    )
+
+
+@pytest.mark.django_db
+class TestStripeWebhook:
+    def test_event_is_stored_then_applied(self, order, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            response = deliver(completed_event(order))
+
+        assert response.status_code == 200
+        assert StripeEvent.objects.get(event_id='evt_1').status == 'processed'
+        order.refresh_from_db()
+        order.user.refresh_from_db()
+        assert order.status == 'completed'
+        assert order.stripe_payment_intent_id == 'pi_1'
+        assert order.user.tickets == 13
+        assert TicketTransaction.objects.get(order=order).balance_after == 13
+
+    def test_redelivery_credits_once(self, order, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            deliver(completed_event(order))
+            deliver(completed_event(order))
+
+        assert len(callbacks) == 1
+        assert StripeEvent.objects.count() == 1
+        order.user.refresh_from_db()
+        assert order.user.tickets == 13
+
+    def test_bad_signature_is_refused(self, order):
+        response = deliver(completed_event(order), secret='whsec_other')
+
+        assert response.status_code == 400
+        assert not StripeEvent.objects.exists()
+
+
+@pytest.mark.django_db
+class TestApplyEvents:
+    def test_distinct_events_for_one_order_credit_once(self, order):
+        record_event(completed_event(order, 'evt_1'))
+        record_event(completed_event(order, 'evt_2'))
+
+        assert apply_pending_events() == 2
+
+        order.user.refresh_from_db()
+        assert order.user.tickets == 13
+        assert TicketTransaction.objects.filter(order=order).count() == 1
+
+    def test_order_is_found_before_its_session_id_is_saved(self, order):
+        Order.objects.filter(pk=order.pk).update(stripe_checkout_session_id=None)
+        record_event(completed_event(order))
+
+        apply_pending_events()
+
+        order.refresh_from_db()
+        assert order.status == 'completed'
+        assert order.stripe_checkout_session_id == 'cs_test_1'
+
+    def test_failed_event_does_not_block_later_ones(self, order):
+        orphan = completed_event(order, 'evt_orphan', session_id='cs_unknown', created=1)
+        orphan['data']['object']['metadata'] = {}
+        record_event(orphan)
+        record_event(completed_event(order, 'evt_ok', created=2))
+        record_event({'id': 'evt_other', 'type': 'customer.created', 'created': 3, 'data': {'object': {}}})
+
+        apply_pending_events()
+
+        assert dict(StripeEvent.objects.values_list('event_id', 'status')) == {
+            'evt_orphan': 'failed', 'evt_ok': 'processed', 'evt_other': 'ignored'
+        }
+        assert 'cs_unknown' in StripeEvent.objects.get(event_id='evt_orphan').error
+        order.user.refresh_from_db()
+        assert order.user.tickets == 13
+
+    def test_failed_event_is_retried_a_bounded_number_of_times(self, order):
+        orphan = completed_event(order, session_id='cs_unknown')
+        orphan['data']['object']['metadata'] = {}
+        record_event(orphan)
+
+        for _ in range(MAX_EVENT_ATTEMPTS + 1):
+            apply_pending_events()
+
+        stripe_event = StripeEvent.objects.get()
+        assert stripe_event.status == 'failed'
+        assert stripe_event.attempts == MAX_EVENT_ATTEMPTS
+
+    def test_failed_event_succeeds_on_retry(self, order):
+        orphan = completed_event(order, session_id='cs_late')
+        orphan['data']['object']['metadata'] = {}
+        record_event(orphan)
+        assert apply_pending_events() == 1
+
+        Order.objects.filter(pk=order.pk).update(stripe_checkout_session_id='cs_late')
+        assert apply_pending_events() == 1
+
+        assert StripeEvent.objects.get().status == 'processed'
+        order.user.refresh_from_db()
+        assert order.user.tickets == 13
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .api.views import TicketPackageViewSet, StripeWebhookView
+from .api.views import TicketPackageViewSet, TicketTransactionViewSet, StripeWebhookView
 from django.http import JsonResponse
 
 def success_view(request):
@@ -13,6 +13,7 @@ app_name = "tickets"
 
 router = DefaultRouter()
 router.register(r'packages', TicketPackageViewSet, basename='package')
+router.register(r'history', TicketTransactionViewSet, basename='transaction')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -0,0 +1,121 @@
+# lolo/tickets/webhooks.py
+import logging
+from datetime import datetime, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from lolo.users.authentication import invalidate_user
+from .models import Order, StripeEvent, TicketTransaction
+
+logger = logging.getLogger(__name__)
+
+# Failed events are retried once per run until they've had this many attempts
+MAX_EVENT_ATTEMPTS = 5
+
+
+class WebhookError(Exception):
+    """A stored event that can't be applied"""
+
+
+def record_event(event):
+    """
+    Store a verified webhook event (the decoded JSON body). Returns False
+    for a redelivery of an event we already have.
+    """
+    _, created = StripeEvent.objects.get_or_create(
+        event_id=event['id'],
+        defaults={
+            'event_type': event['type'],
+            'payload': event,
+            'stripe_created': datetime.fromtimestamp(event['created'], tz=dt_timezone.utc),
+        }
+    )
+    return created
+
+
+def fulfil_checkout(session):
+    """
+    Complete the session's order and credit its tickets exactly once. The
+    order row is locked, so concurrent deliveries queue up behind the first
+    and then see it completed; the balance moves by a single F() UPDATE.
+    """
+    orders = Order.objects.select_for_update().select_related('ticket_package')
+    order = orders.filter(stripe_checkout_session_id=session['id']).first()
+    if order is None:
+        # The webhook can beat the checkout view saving the session id
+        order_id = (session.get('metadata') or {}).get('order_id')
+        order = orders.filter(pk=order_id).first() if order_id else None
+    if order is None:
+        raise WebhookError(f"No order for checkout session {session['id']}")
+    if order.status == 'completed':
+        return False
+
+    order.status = 'completed'
+    order.stripe_checkout_session_id = session['id']
+    order.stripe_payment_intent_id = session.get('payment_intent')
+    order.save(update_fields=['status', 'stripe_checkout_session_id', 'stripe_payment_intent_id', 'updated_at'])
+
+    package = order.ticket_package
+    User = get_user_model()
+    User.objects.filter(pk=order.user_id).update(tickets=F('tickets') + package.number_of_tickets)
+    balance = User.objects.filter(pk=order.user_id).values_list('tickets', flat=True).get()
+    invalidate_user(order.user_id)
+    TicketTransaction.objects.create(
+        user_id=order.user_id,
+        order=order,
+        transaction_type='purchase',
+        number_of_tickets=package.number_of_tickets,
+        balance_after=balance,
+        notes=f"Purchase of {package.name} package"
+    )
+    return True
+
+
+EVENT_HANDLERS = {
+    'checkout.session.completed': lambda event: fulfil_checkout(event['data']['object']),
+}
+
+
+def apply_event(stripe_event):
+    """Apply one locked StripeEvent, recording the outcome on it"""
+    handler = EVENT_HANDLERS.get(stripe_event.event_type)
+    stripe_event.attempts += 1
+    if handler is None:
+        stripe_event.status = 'ignored'
+    else:
+        try:
+            with transaction.atomic():
+                handler(stripe_event.payload)
+        except Exception as e:
+            logger.exception("Applying Stripe event %s failed", stripe_event.event_id)
+            stripe_event.status = 'failed'
+            stripe_event.error = str(e)
+        else:
+            stripe_event.status = 'processed'
+            stripe_event.error = ''
+    stripe_event.processed_at = timezone.now()
+    stripe_event.save(update_fields=['status', 'attempts', 'error', 'processed_at'])
+
+
+def apply_pending_events():
+    """
+    Apply queued events oldest first, one short transaction each. Workers
+    skip events another worker holds rather than waiting on them. A failed
+    event is recorded and skipped so it can't hold up the rest, then retried
+    on later runs up to MAX_EVENT_ATTEMPTS. Returns the number of events
+    handled.
+    """
+    queued = StripeEvent.objects.filter(
+        Q(status='pending') | Q(status='failed', attempts__lt=MAX_EVENT_ATTEMPTS)
+    ).order_by('stripe_created', 'id')
+    handled = []
+    while True:
+        with transaction.atomic():
+            stripe_event = queued.exclude(pk__in=handled).select_for_update(skip_locked=True).first()
+            if stripe_event is None:
+                return len(handled)
+            apply_event(stripe_event)
+        handled.append(stripe_event.pk)
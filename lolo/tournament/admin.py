@@ -2,7 +2,10 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
-from .models import Category, Tournament, VideoSubmission, Participation, Vote, VideoReport, Sponsor
+from .models import (
+    Category, Tournament, VideoSubmission, Participation, Vote, VideoReport, Sponsor,
+    TranscodeJob, VideoRendition
+)
 
 class ParticipationInline(admin.TabularInline):
     model = Participation
@@ -11,6 +14,13 @@ class ParticipationInline(admin.TabularInline):
     can_delete = False
     show_change_link = True
 
+class VideoRenditionInline(admin.TabularInline):
+    model = VideoRendition
+    extra = 0
+    fields = ['kind', 'label', 'width', 'height', 'bitrate', 'file']
+    readonly_fields = ['kind', 'label', 'width', 'height', 'bitrate', 'file']
+    can_delete = False
+
 class VoteInline(admin.TabularInline):
     model = Vote
     extra = 0
@@ -29,7 +39,7 @@ class ChildTournamentInline(admin.TabularInline):
     verbose_name_plural = 'Child Groups'
     
     def participant_count(self, obj):
-        return obj.participations.count()
+        return obj.participant_count
     participant_count.short_description = 'Participants'
     
     def is_active(self, obj):
@@ -105,7 +115,7 @@ class TournamentAdmin(admin.ModelAdmin):
     group_display.short_description = 'Group'
 
     def participant_count(self, obj):
-        count = obj.participations.count()
+        count = obj.participant_count
         limit = f"/{obj.participant_limit}" if obj.participant_limit else ""
         
         return format_html(
@@ -179,10 +189,10 @@ class VideoSubmissionAdmin(admin.ModelAdmin):
     ]
 
     actions = ['mark_as_processed', 'mark_as_unprocessed']
-    inlines = [ParticipationInline]
+    inlines = [ParticipationInline, VideoRenditionInline]
     list_filter = ['processed', 'created_at', 'user']
     search_fields = ['title', 'description', 'user__username']
-    readonly_fields = ['duration', 'processed', 'created_at']
+    readonly_fields = ['duration', 'width', 'height', 'video_codec', 'processed', 'created_at']
     
     def preview_video(self, obj):
         if obj.cover_image:
@@ -274,4 +284,11 @@ class SponsorAdmin(admin.ModelAdmin):
 # Optional: Customize admin site header and title
 admin.site.site_header = 'Tournament Management'
 admin.site.site_title = 'Tournament Admin'
-admin.site.index_title = 'Tournament Administration'
\ No newline at end of file
+admin.site.index_title = 'Tournament Administration'
+
+@admin.register(TranscodeJob)
+class TranscodeJobAdmin(admin.ModelAdmin):
+    list_display = ['video', 'status', 'attempts', 'started_at', 'finished_at']
+    list_filter = ['status']
+    search_fields = ['video__title']
+    readonly_fields = ['video', 'status', 'hls_playlist', 'error', 'attempts', 'started_at', 'finished_at']
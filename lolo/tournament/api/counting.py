@@ -0,0 +1,99 @@
+# lolo/tournament/api/counting.py
+import hashlib
+import logging
+
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import DatabaseError, connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+EXACT_COUNT_LIMIT = 1000
+COUNT_CACHE_TIMEOUT = 10 * 60
+
+
+def count_cache_key(queryset):
+    """Cache key for a queryset's row count, keyed by its SQL and parameters"""
+    sql, params = queryset.query.sql_with_params()
+    signature = f'{queryset.db}|{sql}|{params!r}'
+    return 'pagination:count:' + hashlib.md5(signature.encode()).hexdigest()
+
+
+def planner_estimate(queryset):
+    """Row estimate from the PostgreSQL planner, or None if unavailable"""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.query.sql_with_params()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            return int(cursor.fetchone()[0][0]['Plan']['Plan Rows'])
+    except (DatabaseError, LookupError, TypeError, ValueError):
+        logger.warning("Planner estimate failed", exc_info=True)
+        return None
+
+
+class CountingPaginator(Paginator):
+    """
+    Paginator that only pays for an exact COUNT(*) on small result sets.
+
+    A bounded probe (COUNT over LIMIT n+1) settles sets up to
+    EXACT_COUNT_LIMIT rows. Anything larger is served from a cached count
+    keyed by the filter signature; on a miss the planner's row estimate is
+    used when it's plausible, with an exact count as the fallback. Such
+    counts set `approximate`, and pages past the estimate stay reachable.
+    """
+    exact_count_limit = EXACT_COUNT_LIMIT
+    count_cache_timeout = COUNT_CACHE_TIMEOUT
+
+    @cached_property
+    def _counted(self):
+        """(count, whether it is approximate)"""
+        if not isinstance(self.object_list, QuerySet):
+            return super().count, False
+
+        queryset = self.object_list.order_by()
+        probe = queryset[:self.exact_count_limit + 1].count()
+        if probe <= self.exact_count_limit:
+            return probe, False
+
+        key = count_cache_key(queryset)
+        count = cache.get(key)
+        if count is None:
+            count = planner_estimate(queryset)
+            if count is None or count <= self.exact_count_limit:
+                count = queryset.count()
+            cache.set(key, count, self.count_cache_timeout)
+        return max(count, probe), True
+
+    @cached_property
+    def count(self):
+        return self._counted[0]
+
+    @property
+    def approximate(self):
+        return self._counted[1]
+
+    def is_approximate(self):
+        return self.approximate
+
+    def validate_number(self, number):
+        if not self.is_approximate():
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        if not self.is_approximate():
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom:bottom + self.per_page], number, self)
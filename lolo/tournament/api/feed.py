@@ -0,0 +1,85 @@
+# lolo/tournament/api/feed.py
+from collections import defaultdict
+
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from ..groups import summarize_groups
+from ..models import Participation
+from .serializers import ParticipationSerializer, TournamentListSerializer
+
+
+class TournamentFeed:
+    """
+    Builds list payloads for a page of tournaments in a constant number of
+    queries: the top participants of every tournament and the groups of
+    repeating tournaments are each fetched once per page and handed to the
+    serializers through their context.
+    """
+    participants_per_tournament = 3
+
+    def __init__(self, participant_ordering=('id',), context=None):
+        self.participant_ordering = participant_ordering
+        self.context = context or {}
+
+    @staticmethod
+    def prepare(queryset):
+        """Join the relations every feed row needs onto the page query"""
+        return queryset.select_related('category', 'parent_tournament')
+
+    def build(self, tournaments):
+        tournaments = list(tournaments)
+        if not tournaments:
+            return []
+
+        participants = self._top_participants([tournament.id for tournament in tournaments])
+        context = {
+            **self.context,
+            'group_summaries': self.group_summaries(tournaments),
+        }
+
+        data = TournamentListSerializer(tournaments, many=True, context=context).data
+        for tournament, tournament_data in zip(tournaments, data):
+            tournament_data['participants'] = ParticipationSerializer(
+                participants.get(tournament.id, []),
+                many=True,
+                context=self.context
+            ).data
+        return data
+
+    def _top_participants(self, tournament_ids):
+        """Top N participants per tournament using a ROW_NUMBER() window"""
+        order_by = [
+            F(field[1:]).desc() if field.startswith('-') else F(field).asc()
+            for field in self.participant_ordering
+        ]
+        rows = Participation.objects.filter(
+            tournament_id__in=tournament_ids
+        ).select_related(
+            'user',
+            'video_submission',
+            'video_submission__user'
+        ).annotate(
+            position=Window(
+                expression=RowNumber(),
+                partition_by=[F('tournament_id')],
+                order_by=order_by
+            )
+        ).filter(
+            position__lte=self.participants_per_tournament
+        ).order_by('tournament_id', 'position')
+
+        participants = defaultdict(list)
+        for participation in rows:
+            participants[participation.tournament_id].append(participation)
+        return participants
+
+    def group_summaries(self, tournaments):
+        """Group summaries of the repeating parents on the page"""
+        parent_ids = [
+            tournament.id for tournament in tournaments
+            if tournament.is_repeating and not tournament.parent_tournament_id
+        ]
+        if not parent_ids:
+            return {}
+        return summarize_groups(parent_ids)
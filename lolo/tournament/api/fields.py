@@ -0,0 +1,59 @@
+# lolo/tournament/api/fields.py
+from django.db import models
+from rest_framework import serializers
+
+from ..images import IMAGE_HEADER_LIMIT, ImageRejected, read_image_header, variant_urls
+
+
+def absolute_variant_urls(request, field_file):
+    """variant_urls() with every URL made absolute for the request's host"""
+    urls = variant_urls(field_file)
+    if not urls or request is None:
+        return urls
+    return {
+        key: {
+            **value,
+            'webp': request.build_absolute_uri(value['webp']),
+            'jpg': request.build_absolute_uri(value['jpg']),
+        } if isinstance(value, dict) else value
+        for key, value in urls.items()
+    }
+
+
+class ImageVariantsField(serializers.Field):
+    """
+    Read-only thumb/card/full WebP and JPEG URLs plus a blurhash for an
+    image field; null until the derivatives have been generated.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return absolute_variant_urls(self.context.get('request'), value)
+
+
+class HeaderCheckedImageField(serializers.ImageField):
+    """
+    ImageField that validates the format and dimensions from the image
+    header instead of running Pillow's verify() over the whole file.
+    """
+
+    def to_internal_value(self, data):
+        file_object = serializers.FileField.to_internal_value(self, data)
+        file_object.seek(0)
+        try:
+            read_image_header(file_object.read(IMAGE_HEADER_LIMIT))
+        except ImageRejected:
+            self.fail('invalid_image')
+        finally:
+            file_object.seek(0)
+        return file_object
+
+
+# ModelSerializer.serializer_field_mapping with header-checked image fields
+MEDIA_FIELD_MAPPING = {
+    **serializers.ModelSerializer.serializer_field_mapping,
+    models.ImageField: HeaderCheckedImageField,
+}
@@ -1,16 +1,29 @@
-from rest_framework.pagination import PageNumberPagination
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db.models import Q, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .counting import CountingPaginator
 
 class CustomPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 100
+    # Exact counts for small sets, cached/estimated ones for large sets
+    django_paginator_class = CountingPaginator
 
     def get_paginated_response(self, data):
         return Response({
             'total_pages': self.page.paginator.num_pages,
             'current_page': self.page.number,
             'total_items': self.page.paginator.count,
+            'total_items_approximate': self.page.paginator.approximate,
             'page_size': self.page_size,
             'next': self.get_next_link(),
             'previous': self.get_previous_link(),
@@ -30,4 +43,175 @@ class VideosPagination(PageNumberPagination):
             'next': self.get_next_link(),  # URL for next page
             'previous': self.get_previous_link(),  # URL for previous page
             'results': data  # The page's records
-        })
\ No newline at end of file
+        })
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on the queryset's own ordering.
+
+    The ordering must end in a unique column (e.g. ('-votes_received', 'id')).
+    A cursor carries the sort values of the row it continues from, so each
+    page is a `WHERE (sort columns) beyond cursor LIMIT n` index range scan
+    instead of COUNT(*) plus an OFFSET that grows with depth.
+
+    Sliceable non-queryset sources that are cheap to seek into (e.g. the
+    Redis leaderboard) are paged by position through the same cursor format.
+
+    The cursor also tracks the position of the page, exposed as
+    `start_position`, and `total_items` is only counted when the client asks
+    for it with ?include_total=true.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    total_query_param = 'include_total'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        self.total = None
+        if request.query_params.get(self.total_query_param) in ('1', 'true'):
+            self.total = queryset.count()
+
+        if isinstance(queryset, QuerySet):
+            self.ordering = self.get_ordering(queryset)
+            rows, has_more = self.seek(queryset, cursor)
+        else:
+            self.ordering = None
+            rows, has_more = self.slice(queryset, cursor)
+
+        reverse = cursor is not None and cursor['r']
+        boundary = cursor['p'] if cursor else 0
+        if reverse:
+            # Walking back onto the first page pins positions to the start
+            self.start_position = max(boundary - len(rows), 0) if has_more else 0
+        else:
+            self.start_position = boundary
+        self.has_next = True if reverse else has_more
+        self.has_previous = has_more if reverse else self.start_position > 0
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(size, self.max_page_size) if size > 0 else self.page_size
+
+    def get_ordering(self, queryset):
+        ordering = []
+        for term in queryset.query.order_by:
+            if not isinstance(term, str):
+                raise ImproperlyConfigured('KeysetPagination needs plain field orderings')
+            name = term.lstrip('-')
+            ordering.append((name, term.startswith('-'), self.get_field(queryset, name)))
+        if not ordering or ordering[-1][0] not in ('id', 'pk'):
+            raise ImproperlyConfigured("KeysetPagination ordering must end with 'id'")
+        return ordering
+
+    @staticmethod
+    def get_field(queryset, name):
+        if name in queryset.query.annotations:
+            return queryset.query.annotations[name].output_field
+        model = queryset.model
+        *relations, attname = name.split(LOOKUP_SEP)
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        return model._meta.pk if attname == 'pk' else model._meta.get_field(attname)
+
+    def seek(self, queryset, cursor):
+        reverse = cursor is not None and cursor['r']
+        if cursor is not None and cursor.get('v') is not None:
+            try:
+                values = [
+                    field.to_python(value)
+                    for (_, _, field), value in zip(self.ordering, cursor['v'], strict=True)
+                ]
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+            queryset = queryset.filter(self.beyond(values, reverse))
+        if reverse:
+            queryset = queryset.reverse()
+
+        rows = list(queryset[:self.size + 1])
+        has_more = len(rows) > self.size
+        rows = rows[:self.size]
+        if reverse:
+            rows.reverse()
+        return rows, has_more
+
+    def beyond(self, values, reverse):
+        """(a, b, id) strictly after/before the cursor, for mixed directions"""
+        condition = Q()
+        equal = Q()
+        for (name, descending, _), value in zip(self.ordering, values):
+            lookup = 'lt' if descending != reverse else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def slice(self, sequence, cursor):
+        if cursor is not None and cursor['r']:
+            start = max(cursor['p'] - self.size, 0)
+            rows = list(sequence[start:cursor['p']])
+            return rows, start > 0
+        start = cursor['p'] if cursor else 0
+        rows = list(sequence[start:start + self.size + 1])
+        return rows[:self.size], len(rows) > self.size
+
+    def values_of(self, row):
+        values = []
+        for name, _, _ in self.ordering:
+            value = row
+            for attname in name.split(LOOKUP_SEP):
+                value = getattr(value, attname)
+            values.append(value)
+        return values
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            cursor['p'] = max(int(cursor['p']), 0)
+            cursor['r'] = bool(cursor.get('r'))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, position, reverse, row):
+        cursor = {'p': position, 'r': reverse}
+        if self.ordering is not None:
+            cursor['v'] = self.values_of(row)
+        encoded = urlsafe_b64encode(json.dumps(cursor, default=str).encode('ascii'))
+        return replace_query_param(
+            self.request.build_absolute_uri(), self.cursor_query_param, encoded.decode('ascii')
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.start_position + len(self.page), False, self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self.encode_cursor(self.start_position, True, self.page[0])
+
+    def get_paginated_response(self, data):
+        payload = {
+            'page_size': self.size,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        }
+        if self.total is not None:
+            payload['total_items'] = self.total
+        payload['results'] = data
+        return Response(payload)
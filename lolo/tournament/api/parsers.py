@@ -0,0 +1,29 @@
+# lolo/tournament/api/parsers.py
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException
+from rest_framework.parsers import MultiPartParser
+
+from ..upload_handlers import MediaUploadHandler, UploadRejected
+
+
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'Uploaded file is too large.'
+    default_code = 'upload_too_large'
+
+
+class MediaMultiPartParser(MultiPartParser):
+    """
+    Multipart parser that validates media while it streams in. A rejected
+    file ends parsing right away; the rest of the body is never read.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        request = parser_context['request']
+        request.upload_handlers.insert(0, MediaUploadHandler(request))
+        try:
+            return super().parse(stream, media_type, parser_context)
+        except UploadRejected as e:
+            if e.too_large:
+                raise UploadTooLarge({e.field_name: [str(e)]})
+            raise serializers.ValidationError({e.field_name: [str(e)]})
@@ -1,5 +1,7 @@
 # lolo/tournament/api/serializers.py
 from rest_framework import serializers
+from .fields import MEDIA_FIELD_MAPPING, ImageVariantsField
+from ..groups import summarize_groups
 from ..models import Category, Tournament, VideoSubmission, Participation, Vote, VideoReport, Sponsor
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -10,12 +12,13 @@ class CategorySerializer(serializers.ModelSerializer):
 class TournamentListSerializer(serializers.ModelSerializer):
     category_name = serializers.CharField(source='category.name', read_only=True)
     category_id = serializers.IntegerField(source='category.id', read_only=True) 
-    participant_count = serializers.SerializerMethodField()
+    participant_count = serializers.IntegerField(read_only=True)
     is_active = serializers.BooleanField(read_only=True)
     status = serializers.CharField(read_only=True, required=False)
     time_info = serializers.CharField(read_only=True, required=False)
     participation_info = serializers.DictField(read_only=True, required=False)
     group_info = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField(source='image')
 
     class Meta:
         model = Tournament
@@ -23,6 +26,7 @@ class TournamentListSerializer(serializers.ModelSerializer):
             'id', 
             'title', 
             'image', 
+            'image_variants',
             'category_name',
             'category_id',
             'start_time', 
@@ -41,9 +45,6 @@ class TournamentListSerializer(serializers.ModelSerializer):
             'participant_limit'
         ]
 
-    def get_participant_count(self, obj):
-        return obj.participations.count()
-        
     def get_group_info(self, obj):
         if not obj.is_repeating:
             return None
@@ -56,28 +57,23 @@ class TournamentListSerializer(serializers.ModelSerializer):
                 'group': obj.group_name
             }
         else:
-            # This is a parent tournament
-            group_count = obj.active_group_count
-            child_tournaments = obj.child_tournaments.all()
+            # This is a parent tournament; feeds pass the page's summaries
+            group_summaries = self.context.get('group_summaries', {})
+            if obj.id not in group_summaries:
+                group_summaries = summarize_groups([obj.id])
             
             return {
                 'is_parent': True,
-                'active_groups': group_count,
-                'child_tournaments': [
-                    {
-                        'id': child.id,
-                        'title': child.title,
-                        'group': child.group_name,
-                        'participants': child.participations.count(),
-                        'is_full': child.participations.count() >= child.participant_limit if child.participant_limit else False
-                    } for child in child_tournaments
-                ]
+                'active_groups': obj.active_group_count,
+                'child_tournaments': group_summaries[obj.id]
             }
 
 class TournamentDetailSerializer(serializers.ModelSerializer):
+    serializer_field_mapping = MEDIA_FIELD_MAPPING
     category_name = serializers.CharField(source='category.name', read_only=True)
     is_active = serializers.BooleanField(read_only=True)
     group_info = serializers.SerializerMethodField()
+    image_variants = ImageVariantsField(source='image')
 
     class Meta:
         model = Tournament
@@ -88,11 +84,14 @@ class TournamentDetailSerializer(serializers.ModelSerializer):
             'rules',
             'prizes',
             'image',
+            'image_variants',
             'category',
             'category_name',
             'start_time',
             'end_time',
             'participant_limit',
+            'participant_count',
+            'vote_count',
             'finalists_count',
             'entry_fee',
             'is_final_tournament',
@@ -106,7 +105,7 @@ class TournamentDetailSerializer(serializers.ModelSerializer):
             'group_name',
             'group_info'
         ]
-        read_only_fields = ['created_by', 'created_at', 'updated_at']
+        read_only_fields = ['created_by', 'created_at', 'updated_at', 'participant_count', 'vote_count']
         
     def get_group_info(self, obj):
         if not obj.is_repeating:
@@ -120,45 +119,78 @@ class TournamentDetailSerializer(serializers.ModelSerializer):
                 'group': obj.group_name
             }
         else:
-            # This is a parent tournament
-            group_count = obj.active_group_count
-            child_tournaments = obj.child_tournaments.all()
+            # This is a parent tournament; feeds pass the page's summaries
+            group_summaries = self.context.get('group_summaries', {})
+            if obj.id not in group_summaries:
+                group_summaries = summarize_groups([obj.id])
             
             return {
                 'is_parent': True,
-                'active_groups': group_count,
-                'child_tournaments': [
-                    {
-                        'id': child.id,
-                        'title': child.title,
-                        'group': child.group_name,
-                        'participants': child.participations.count(),
-                        'is_full': child.participations.count() >= child.participant_limit if child.participant_limit else False
-                    } for child in child_tournaments
-                ]
+                'active_groups': obj.active_group_count,
+                'child_tournaments': group_summaries[obj.id]
             }
 
 class VideoSubmissionSerializer(serializers.ModelSerializer):
+    serializer_field_mapping = MEDIA_FIELD_MAPPING
     user_username = serializers.CharField(source='user.username', read_only=True)
+    cover_image_variants = ImageVariantsField(source='cover_image')
 
     class Meta:
         model = VideoSubmission
         fields = [
             'id', 'title', 'description', 'video_file',
-            'cover_image', 'duration', 'user_username',
-            'created_at', 'processed'
+            'cover_image', 'cover_image_variants', 'duration', 'width', 'height', 'video_codec',
+            'user_username', 'created_at', 'processed'
         ]
-        read_only_fields = ['duration', 'processed', 'user_username']
+        read_only_fields = ['duration', 'width', 'height', 'video_codec', 'processed', 'user_username']
+
+class DirectUploadStartSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+    content_type = serializers.CharField(max_length=100, default='video/mp4')
+
+
+class UploadedPartSerializer(serializers.Serializer):
+    part_number = serializers.IntegerField(min_value=1, max_value=10000)
+    etag = serializers.CharField(max_length=100)
+
+
+class DirectVideoSubmissionSerializer(VideoSubmissionSerializer):
+    """A submission whose video was uploaded straight to storage"""
+    upload = serializers.CharField(write_only=True)
+    # JSON-encoded list so it can travel alongside the multipart cover image
+    parts = serializers.JSONField(write_only=True, binary=True)
+
+    class Meta(VideoSubmissionSerializer.Meta):
+        fields = VideoSubmissionSerializer.Meta.fields + ['upload', 'parts']
+        read_only_fields = VideoSubmissionSerializer.Meta.read_only_fields + ['video_file']
+
+    def validate_parts(self, value):
+        parts = UploadedPartSerializer(data=value, many=True, allow_empty=False)
+        parts.is_valid(raise_exception=True)
+        return parts.validated_data
+
+    def create(self, validated_data):
+        validated_data.pop('upload')
+        validated_data.pop('parts')
+        return super().create(validated_data)
+
+class ResumableVideoSubmissionSerializer(VideoSubmissionSerializer):
+    """A submission whose video arrived through a resumable upload"""
+
+    class Meta(VideoSubmissionSerializer.Meta):
+        read_only_fields = VideoSubmissionSerializer.Meta.read_only_fields + ['video_file']
 
 class ParticipationSerializer(serializers.ModelSerializer):
     video = VideoSubmissionSerializer(source='video_submission')
     user_username = serializers.CharField(source='user.username', read_only=True)
     user_avatar = serializers.SerializerMethodField()
+    user_avatar_variants = ImageVariantsField(source='user.avatar')
 
     class Meta:
         model = Participation
         fields = [
-            'id', 'user_username', 'user_avatar',  'tournament', 'video',
+            'id', 'user_username', 'user_avatar', 'user_avatar_variants', 'tournament', 'video',
             'votes_received', 'is_finalist', 'created_at'
         ]
         read_only_fields = ['votes_received', 'is_finalist']
@@ -190,12 +222,14 @@ class VideoReportSerializer(serializers.ModelSerializer):
         fields = ['reason', 'details']
 
 class SponsorSerializer(serializers.ModelSerializer):
+    serializer_field_mapping = MEDIA_FIELD_MAPPING
     tournament_count = serializers.SerializerMethodField()
+    logo_variants = ImageVariantsField(source='logo')
     
     class Meta:
         model = Sponsor
         fields = [
-            'id', 'name', 'description', 'logo', 'website_url', 
+            'id', 'name', 'description', 'logo', 'logo_variants', 'website_url', 
             'is_active', 'tournament_count', 'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
@@ -204,12 +238,14 @@ class SponsorSerializer(serializers.ModelSerializer):
         return obj.tournaments.count()
 
 class SponsorDetailSerializer(serializers.ModelSerializer):
+    serializer_field_mapping = MEDIA_FIELD_MAPPING
     tournaments = serializers.SerializerMethodField()
+    logo_variants = ImageVariantsField(source='logo')
     
     class Meta:
         model = Sponsor
         fields = [
-            'id', 'name', 'description', 'logo', 'website_url', 
+            'id', 'name', 'description', 'logo', 'logo_variants', 'website_url', 
             'is_active', 'tournaments', 'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
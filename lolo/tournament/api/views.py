@@ -1,15 +1,23 @@
 # lolo/tournament/api/views.py
+import base64
+
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.reverse import reverse
 from rest_framework.response import Response
-from django.db import transaction
+from django.db import IntegrityError, transaction
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from ..models import Category, Tournament, VideoSubmission, Participation, Vote, VideoReport, Sponsor
 from .serializers import (
     CategorySerializer,
     TournamentListSerializer,
     TournamentDetailSerializer,
     VideoSubmissionSerializer,
+    DirectUploadStartSerializer,
+    DirectVideoSubmissionSerializer,
+    ResumableVideoSubmissionSerializer,
     ParticipationSerializer,
     VoteSerializer,
     VideoReportSerializer,
@@ -17,12 +25,30 @@ from .serializers import (
     SponsorDetailSerializer
 )
 from .permissions import IsAdminOrReadOnly, IsOwnerOrReadOnly
-from .pagination import CustomPagination, VideosPagination
-from django.db.models import Count, F, Q
+from .pagination import CustomPagination, KeysetPagination, VideosPagination
+from .feed import TournamentFeed
+from .fields import absolute_variant_urls
+from ..direct_uploads import (
+    UploadError,
+    abort_upload,
+    complete_upload,
+    direct_uploads_enabled,
+    discard_upload,
+    start_upload
+)
+from ..entries import submit_entry
+from ..leaderboard import Leaderboard
+from ..public_cache import PUBLIC_CACHE_TIMEOUT, get_public_entry, public_response
+from ..rankings import get_closing_soon_ids
+from ..resumable import OffsetConflict, ResumableUpload, ResumableUploadError
+from ..search import FullTextSearchFilter, search_participations
+from ..view_counters import live_views_count, pending_views, record_view
+from django.db.models import Count, F, Min, Q
 from rest_framework import filters
 from django_filters import rest_framework as django_filters
 from random import sample
 from django.contrib.auth import get_user_model
+from redis.exceptions import RedisError
 
 
 class CategoryViewSet(viewsets.ModelViewSet):
@@ -86,9 +112,7 @@ class TournamentFilter(django_filters.FilterSet):
         return queryset
 
     def filter_by_participants(self, queryset, name, value):
-        return queryset.annotate(
-            participant_count=Count('participations')
-        ).filter(participant_count__gte=value)
+        return queryset.filter(participant_count__gte=value)
 
     def sort_tournaments(self, queryset, name, value):
         if value == 'category':
@@ -96,13 +120,9 @@ class TournamentFilter(django_filters.FilterSet):
         if value == 'most_viewed':
             return queryset.order_by('-views_count')
         elif value == 'most_participants':
-            return queryset.annotate(
-                participant_count=Count('participations')
-            ).order_by('-participant_count')
+            return queryset.order_by('-participant_count')
         elif value == 'most_votes':
-            return queryset.annotate(
-                votes_count=Count('votes')
-            ).order_by('-votes_count')
+            return queryset.order_by('-vote_count')
         elif value == 'newest':
             return queryset.order_by('-created_at')
         elif value == 'oldest':
@@ -118,10 +138,9 @@ class TournamentViewSet(viewsets.ModelViewSet):
     pagination_class = CustomPagination
     filter_backends = [
         django_filters.DjangoFilterBackend,
-        filters.SearchFilter
+        FullTextSearchFilter
     ]
     filterset_class = TournamentFilter
-    search_fields = ['title', 'description']
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -141,10 +160,7 @@ class TournamentViewSet(viewsets.ModelViewSet):
         
         # Increment views only for non-creator views
         if not request.user.is_authenticated or request.user != instance.created_by:
-            Tournament.objects.filter(pk=instance.pk).update(
-                views_count=F('views_count') + 1
-            )
-            instance.refresh_from_db()
+            record_view(Tournament, instance.pk)
 
         # Get participants with user details
         participants = Participation.objects.filter(
@@ -206,101 +222,99 @@ class TournamentViewSet(viewsets.ModelViewSet):
         """
         tournament = self.get_object()
         user = request.user
+        refusal = self._entry_refusal(tournament, user)
+        if refusal is not None:
+            return refusal
 
-        # Validation checks
-        if user.tickets < tournament.entry_fee:
+        try:
+            video_serializer = VideoSubmissionSerializer(data=request.data)
+            if not video_serializer.is_valid():
+                return Response(
+                    video_serializer.errors,
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            # Seat, tickets and ledger row commit together or not at all;
+            # repeating tournaments may hand back the family's open group
+            participation = submit_entry(tournament, user, video_serializer)
             return Response(
-                {"error": f"Insufficient tickets. You need {tournament.entry_fee} tickets to enter."},
+                ParticipationSerializer(participation).data,
+                status=status.HTTP_201_CREATED
+            )
+        except Exception as e:
+            return Response(
+                {"error": str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        if Participation.objects.filter(user=user, tournament=tournament).exists():
+    def _entry_refusal(self, tournament, user):
+        """Cheap up-front checks; submit_entry re-checks them under the writes"""
+        if user.tickets < tournament.entry_fee:
             return Response(
-                {"error": "You have already entered this tournament"},
+                {"error": f"Insufficient tickets. You need {tournament.entry_fee} tickets to enter."},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        if not tournament.is_active:
+        # Full repeating groups aren't "active", but entrants get routed on
+        routable = tournament.is_repeating and tournament.participant_limit
+        if not tournament.is_active and not (routable and tournament.start_time <= timezone.now()):
             return Response(
                 {"error": "This tournament is not currently active"},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
         # Check if tournament is full - reject if it's not a repeating tournament
-        if tournament.participant_limit:
-            current_participants = Participation.objects.filter(tournament=tournament).count()
-            
-            if current_participants >= tournament.participant_limit:
-                if not tournament.is_repeating:
-                    return Response(
-                        {"error": "Tournament has reached maximum participants"},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-                else:
-                    # If it's repeating but full, reject with a message to try the newest group
-                    parent = tournament.parent_tournament or tournament
-                    newest_group = parent.child_tournaments.order_by('-created_at').first()
-                    
-                    if newest_group and newest_group.id != tournament.id:
-                        return Response({
-                            "error": "This group is full. Please join the newest group.",
-                            "newest_group": {
-                                "id": newest_group.id,
-                                "title": newest_group.title,
-                                "group": newest_group.group_name
-                            }
-                        }, status=status.HTTP_400_BAD_REQUEST)
-                        
-                    return Response(
-                        {"error": "Tournament has reached maximum participants and no new groups are available"},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-
-        try:
-            with transaction.atomic():
-                video_serializer = VideoSubmissionSerializer(data=request.data)
-                if video_serializer.is_valid():
-                    video = video_serializer.save(user=user)
-                    
-                    # Create participation
-                    participation = Participation.objects.create(
-                        user=user,
-                        tournament=tournament,
-                        video_submission=video
-                    )
-                    
-                    # Deduct tickets
-                    user.tickets -= tournament.entry_fee
-                    user.save()
-                    
-                    # Check if this participation filled the tournament and it's repeating
-                    if tournament.is_repeating and tournament.participant_limit:
-                        # Refresh participant count from database to ensure accuracy
-                        current_count = Participation.objects.filter(tournament=tournament).count()
-                        
-                        if current_count >= tournament.participant_limit:
-                            # This was the last spot! Create a new group automatically
-                            parent = tournament.parent_tournament or tournament
-                            parent.create_new_group()
-                    
-                    return Response(
-                        ParticipationSerializer(participation).data,
-                        status=status.HTTP_201_CREATED
-                    )
+        if tournament.participant_limit and not tournament.is_repeating:
+            if tournament.participant_count >= tournament.participant_limit:
                 return Response(
-                    video_serializer.errors,
+                    {"error": "Tournament has reached maximum participants"},
                     status=status.HTTP_400_BAD_REQUEST
                 )
+        return None
+
+    @action(detail=True, methods=['post'], url_path='enter-upload')
+    def enter_with_upload(self, request, pk=None):
+        """
+        Enter a tournament with a video already uploaded to storage
+        (see the videos/uploads endpoints)
+        """
+        tournament = self.get_object()
+        user = request.user
+        refusal = self._entry_refusal(tournament, user)
+        if refusal is not None:
+            return refusal
+
+        video_serializer = DirectVideoSubmissionSerializer(data=request.data)
+        if not video_serializer.is_valid():
+            return Response(
+                video_serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            name = complete_upload(
+                video_serializer.validated_data['upload'],
+                user,
+                video_serializer.validated_data['parts']
+            )
+        except UploadError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            participation = submit_entry(tournament, user, video_serializer, video_file=name)
         except Exception as e:
+            discard_upload(name)
             return Response(
                 {"error": str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        return Response(
+            ParticipationSerializer(participation).data,
+            status=status.HTTP_201_CREATED
+        )
 
-    @action(detail=True, methods=['get'])
+    @action(detail=True, methods=['get'], pagination_class=KeysetPagination)
     def participants(self, request, pk=None):
         """
-        Get paginated list of tournament participants with sorting and search
+        Get cursor-paginated list of tournament participants with sorting and search
         """
         tournament = self.get_object()
         participations = Participation.objects.filter(
@@ -311,25 +325,28 @@ class TournamentViewSet(viewsets.ModelViewSet):
         sort_by = request.query_params.get('sort')
         if sort_by:
             if sort_by == 'most_votes':
-                participations = participations.order_by('-votes_received')
+                participations = participations.order_by('-votes_received', 'id')
             elif sort_by == 'most_viewed':
-                participations = participations.order_by('-video_submission__views_count')
+                participations = participations.order_by('-video_submission__views_count', 'id')
             elif sort_by == 'newest':
-                participations = participations.order_by('-created_at')
+                participations = participations.order_by('-created_at', 'id')
             elif sort_by == 'oldest':
-                participations = participations.order_by('created_at')
+                participations = participations.order_by('created_at', 'id')
         else:
             # Default sorting by newest
-            participations = participations.order_by('-created_at')
+            participations = participations.order_by('-created_at', 'id')
 
-        # Handle search
-        search = request.query_params.get('search')
+        # Handle search, most relevant first unless a sort was requested
+        search = request.query_params.get('search', '').strip()
         if search:
-            participations = participations.filter(
-                Q(video_submission__title__icontains=search) |
-                Q(user__username__icontains=search) |
-                Q(video_submission__description__icontains=search)
-            )
+            participations = search_participations(participations, search)
+            if not sort_by:
+                participations = participations.order_by('-search_rank', '-created_at', 'id')
+        elif sort_by == 'most_votes':
+            # Vote order is served straight from the leaderboard
+            leaderboard = self._get_leaderboard(tournament)
+            if leaderboard:
+                participations = leaderboard.as_sequence()
 
         # Pagination
         page = self.paginate_queryset(participations)
@@ -338,9 +355,9 @@ class TournamentViewSet(viewsets.ModelViewSet):
             return self.get_paginated_response({
                 'tournament_info': {
                     'title': tournament.title,
-                    'total_participants': participations.count(),
-                    'views_count': tournament.views_count,
-                    'total_votes': Vote.objects.filter(tournament=tournament).count(),
+                    'total_participants': tournament.participant_count,
+                    'views_count': live_views_count(tournament),
+                    'total_votes': tournament.vote_count,
                 },
                 'participants': serializer.data
             })
@@ -351,14 +368,30 @@ class TournamentViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     def vote(self, request, pk=None):
         """
-        Vote for a participant in the tournament
+        Vote for a participant in the tournament.
+
+        The (voter, tournament) unique constraint is the duplicate check, and
+        counters are bumped with single-column F() updates, so concurrent votes
+        neither lose increments nor rewrite whole rows.
         """
         tournament = self.get_object()
         user = request.user
         participation_id = request.data.get('participation_id')
+        try:
+            target_id = int(participation_id) if participation_id else None
+        except (TypeError, ValueError):
+            # Reported as an unknown entry, after the participant check
+            target_id = None
+
+        # The voter's own entry and the target entry in one query
+        lookup = Q(user=user)
+        if target_id:
+            lookup |= Q(id=target_id)
+        entries = dict(
+            Participation.objects.filter(lookup, tournament=tournament).values_list('id', 'user_id')
+        )
 
-        # Check if user is a participant in this tournament
-        if not Participation.objects.filter(user=user, tournament=tournament).exists():
+        if user.id not in entries.values():
             return Response(
                 {"error": "Only tournament participants can vote"},
                 status=status.HTTP_403_FORBIDDEN
@@ -370,42 +403,54 @@ class TournamentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        try:
-            participation = Participation.objects.get(
-                id=participation_id,
-                tournament=tournament
-            )
-        except Participation.DoesNotExist:
+        participation_id = target_id
+        if participation_id not in entries:
             return Response(
                 {"error": "Invalid participation ID"},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        if participation.user == user:
+        if entries[participation_id] == user.id:
             return Response(
                 {"error": "You cannot vote for your own submission"},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        if Vote.objects.filter(voter=user, tournament=tournament).exists():
-            return Response(
-                {"error": "You have already voted in this tournament"},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
         with transaction.atomic():
-            Vote.objects.create(
-                voter=user,
-                participation=participation,
-                tournament=tournament
+            try:
+                with transaction.atomic():
+                    Vote.objects.create(
+                        voter=user,
+                        participation_id=participation_id,
+                        tournament=tournament
+                    )
+            except IntegrityError:
+                return Response(
+                    {"error": "You have already voted in this tournament"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            # Always lock the participation before the tournament row so
+            # concurrent votes queue up in the same order instead of deadlocking
+            Participation.objects.filter(pk=participation_id).update(
+                votes_received=F('votes_received') + 1
             )
-            participation.votes_received += 1
-            participation.save()
+            Tournament.objects.filter(pk=tournament.pk).update(
+                vote_count=F('vote_count') + 1
+            )
+            Leaderboard(tournament.pk).on_commit_vote(participation_id)
 
-            return Response({
-                "message": "Vote recorded successfully",
-                "participation": ParticipationSerializer(participation).data
-            }, status=status.HTTP_201_CREATED)
+            votes_received = Participation.objects.filter(
+                pk=participation_id
+            ).values_list('votes_received', flat=True).get()
+
+        return Response({
+            "message": "Vote recorded successfully",
+            "participation": {
+                "id": participation_id,
+                "votes_received": votes_received
+            }
+        }, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=['get'])
     def vote_status(self, request, pk=None):
@@ -442,143 +487,97 @@ class TournamentViewSet(viewsets.ModelViewSet):
             'can_vote': can_vote
         })
 
-    @action(detail=True, methods=['get'])
+    @action(detail=True, methods=['get'], pagination_class=KeysetPagination)
     def standings(self, request, pk=None):
         """
-        Get tournament standings ordered by votes
+        Get tournament standings ordered by votes.
+        Pass around_me=true to get the window around the caller's own entry.
         """
         tournament = self.get_object()
-        participations = Participation.objects.filter(
+        leaderboard = self._get_leaderboard(tournament)
+        own_entry = Participation.objects.filter(
+            user=request.user,
             tournament=tournament
-        ).select_related('user', 'video_submission').order_by('-votes_received')
+        ).values_list('id', flat=True).first()
+
+        tournament_info = {
+            'title': tournament.title,
+            'total_participants': tournament.participant_count,
+            'views_count': live_views_count(tournament),
+            'total_votes': tournament.vote_count,
+            'my_rank': leaderboard.rank(own_entry) if leaderboard and own_entry else None,
+        }
+
+        if leaderboard and request.query_params.get('around_me') in ('1', 'true'):
+            entries = leaderboard.around(own_entry) if own_entry else []
+            return Response({
+                'tournament_info': tournament_info,
+                'standings': self._ranked_data(leaderboard.hydrate(entries))
+            })
+
+        if leaderboard:
+            participations = leaderboard.as_sequence()
+        else:
+            participations = Participation.objects.filter(
+                tournament=tournament
+            ).select_related(
+                'user',
+                'video_submission',
+                'video_submission__user'
+            ).order_by('-votes_received', 'id')
 
         page = self.paginate_queryset(participations)
         if page is not None:
-            serializer = ParticipationSerializer(page, many=True)
+            first_rank = self.paginator.start_position + 1
+            for position, participation in enumerate(page):
+                if not hasattr(participation, 'rank'):
+                    participation.rank = first_rank + position
             return self.get_paginated_response({
-                'tournament_info': {
-                    'title': tournament.title,
-                    'total_participants': participations.count(),
-                    'views_count': tournament.views_count,
-                    'total_votes': Vote.objects.filter(tournament=tournament).count(),
-                },
-                'standings': serializer.data
+                'tournament_info': tournament_info,
+                'standings': self._ranked_data(page)
             })
 
         serializer = ParticipationSerializer(participations, many=True)
         return Response(serializer.data)
+
+    def _get_leaderboard(self, tournament):
+        """Warm Redis leaderboard for the tournament, or None if Redis is down"""
+        try:
+            return Leaderboard(tournament.pk).ensure()
+        except RedisError:
+            return None
+
+    def _ranked_data(self, participations):
+        data = ParticipationSerializer(participations, many=True).data
+        for row, participation in zip(data, participations):
+            row['rank'] = participation.rank
+        return data
     
     @action(detail=False)
     def closing_soon(self, request):
         """
         Get 8 tournaments prioritized as follows:
         1. Active tournaments with participant limits that have 0 participants
-        2. Active tournaments that are nearly full (90%+ capacity)
+        2. Active tournaments that are nearly full (80%+ capacity)
         3. Active tournaments closing soon by end_time
-        4. Recently ended tournaments
-        5. Any remaining tournaments if needed to fill up to 8
+        4. Any remaining active tournaments
+        5. Recently ended tournaments
+
+        The ranking is computed in one query and cached; see rankings.py.
         """
         now = timezone.now()
-        limit = 8
-        result_tournaments = []
-
-        # 1. First, get active tournaments with participant limits that have 0 participants
-        empty_active_tournaments = []
-        for tournament in Tournament.objects.filter(
-            start_time__lte=now,
-            participant_limit__isnull=False
-        ).exclude(
-            end_time__lte=now  # Exclude already ended tournaments
-        ):
-            participant_count = tournament.participations.count()
-            if participant_count == 0:
-                empty_active_tournaments.append(tournament)
-        
-        # Prioritize featured empty tournaments, then by newest start time
-        empty_active_tournaments.sort(key=lambda t: (-t.featured, -t.start_time.timestamp()))
-        
-        # Add empty tournaments to results
-        result_tournaments.extend(empty_active_tournaments[:limit])
-        slots_remaining = limit - len(result_tournaments)
-        
-        # 2. Get nearly-full active tournaments
-        if slots_remaining > 0:
-            nearly_full_tournaments = []
-            active_tournaments_with_limits = Tournament.objects.filter(
-                start_time__lte=now,
-                participant_limit__isnull=False
-            ).exclude(
-                id__in=[t.id for t in result_tournaments]
-            ).exclude(
-                end_time__lte=now  # Exclude already ended tournaments
-            )
-            
-            for tournament in active_tournaments_with_limits:
-                participant_count = tournament.participations.count()
-                if tournament.participant_limit and participant_count > 0:
-                    # Calculate how full the tournament is (as a percentage)
-                    capacity_percentage = (participant_count / tournament.participant_limit) * 100
-                    
-                    # If it's over 80% full, consider it "closing soon"
-                    if capacity_percentage >= 80:
-                        nearly_full_tournaments.append({
-                            'tournament': tournament,
-                            'capacity_percentage': capacity_percentage,
-                            'remaining_spots': tournament.participant_limit - participant_count
-                        })
-            
-            # Sort by remaining spots (fewest first)
-            nearly_full_tournaments.sort(key=lambda x: x['remaining_spots'])
-            
-            # Take only what we need to reach our limit
-            for item in nearly_full_tournaments[:slots_remaining]:
-                result_tournaments.append(item['tournament'])
-            
-            slots_remaining = limit - len(result_tournaments)
-        
-        # 3. Get active tournaments closing soon by end_time
-        if slots_remaining > 0:
-            # Look for tournaments ending within the next 48 hours
-            end_threshold = now + timezone.timedelta(hours=48)
-            closing_soon = list(Tournament.objects.filter(
-                start_time__lte=now,
-                end_time__gt=now,
-                end_time__lte=end_threshold
-            ).exclude(
-                id__in=[t.id for t in result_tournaments]
-            ).order_by('end_time')[:slots_remaining])
-            
-            result_tournaments.extend(closing_soon)
-            slots_remaining = limit - len(result_tournaments)
-
-        # 4. If still needed, get any active tournaments
-        if slots_remaining > 0:
-            any_active = list(Tournament.objects.filter(
-                start_time__lte=now
-            ).exclude(
-                end_time__lte=now  # Exclude ended tournaments
-            ).exclude(
-                id__in=[t.id for t in result_tournaments]
-            ).order_by('-start_time')[:slots_remaining])
-            
-            result_tournaments.extend(any_active)
-            slots_remaining = limit - len(result_tournaments)
-
-        # 5. If still needed, get recently ended tournaments
-        if slots_remaining > 0:
-            ended_tournaments = list(Tournament.objects.filter(
-                end_time__lte=now
-            ).exclude(
-                id__in=[t.id for t in result_tournaments]
-            ).order_by('-end_time')[:slots_remaining])
-            
-            result_tournaments.extend(ended_tournaments)
-            slots_remaining = limit - len(result_tournaments)
+        tournament_ids = get_closing_soon_ids()
+        tournaments = TournamentFeed.prepare(Tournament.objects.filter(id__in=tournament_ids)).in_bulk()
+        result_tournaments = [tournaments[pk] for pk in tournament_ids if pk in tournaments]
+        group_summaries = TournamentFeed().group_summaries(result_tournaments)
 
         # Build response data
         tournaments_data = []
         for tournament in result_tournaments:
-            data = TournamentListSerializer(tournament, context={'request': request}).data
+            data = TournamentListSerializer(
+                tournament,
+                context={'request': request, 'group_summaries': group_summaries}
+            ).data
             
             # Add status information
             if tournament.start_time > now:
@@ -593,8 +592,7 @@ class TournamentViewSet(viewsets.ModelViewSet):
                 
                 # If it has a participant limit, show remaining spots
                 if tournament.participant_limit:
-                    participant_count = tournament.participations.count()
-                    remaining = tournament.participant_limit - participant_count
+                    remaining = tournament.participant_limit - tournament.participant_count
                     if remaining == tournament.participant_limit:  # No participants yet
                         data['time_info'] = f"Be the first to join! {remaining} spots available."
                     else:
@@ -658,41 +656,20 @@ class TournamentViewSet(viewsets.ModelViewSet):
 
     def _get_participation_info(self, tournament):
         """Get participation information for tournament"""
-        participation_count = tournament.participations.count()
+        participation_count = tournament.participant_count
         return {
             'total_participants': participation_count,
             'limit_reached': tournament.participant_limit and participation_count >= tournament.participant_limit,
-            'votes_count': tournament.votes.count()
+            'votes_count': tournament.vote_count
         }
 
     def list(self, request, *args, **kwargs):
-        """Enhanced list view with random participants for each tournament"""
-        queryset = self.filter_queryset(self.get_queryset())
+        """Enhanced list view with a few participants for each tournament"""
+        queryset = TournamentFeed.prepare(self.filter_queryset(self.get_queryset()))
         page = self.paginate_queryset(queryset)
 
         if page is not None:
-            tournaments_data = []
-            for tournament in page:
-                # Get random participants for this tournament
-                participants = Participation.objects.filter(
-                    tournament=tournament
-                ).select_related(
-                    'user',
-                    'video_submission'
-                )[:3]  # Limit to 3 participants
-                
-                # Serialize tournament data
-                tournament_data = TournamentListSerializer(tournament).data
-                tournament_data['category_id'] = tournament.category.id
-                # Add participants data
-                tournament_data['participants'] = ParticipationSerializer(
-                    participants, 
-                    many=True
-                ).data
-                
-                tournaments_data.append(tournament_data)
-
-            return self.get_paginated_response(tournaments_data)
+            return self.get_paginated_response(TournamentFeed().build(page))
 
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
@@ -713,29 +690,12 @@ class TournamentViewSet(viewsets.ModelViewSet):
         return self._get_tournaments_with_participants(queryset)
 
     def _get_tournaments_with_participants(self, queryset):
-        """Helper method to get tournaments with participant details"""
-        page = self.paginate_queryset(queryset)
+        """Helper method to get tournaments with their top voted participants"""
+        page = self.paginate_queryset(TournamentFeed.prepare(queryset))
         
         if page is not None:
-            tournaments_data = []
-            for tournament in page:
-                # Get recent participants
-                participants = Participation.objects.filter(
-                    tournament=tournament
-                ).select_related(
-                    'user',
-                    'video_submission'
-                ).order_by('-votes_received')[:3]
-                
-                tournament_data = TournamentListSerializer(tournament).data
-                tournament_data['participants'] = ParticipationSerializer(
-                    participants, 
-                    many=True
-                ).data
-                
-                tournaments_data.append(tournament_data)
-
-            return self.get_paginated_response(tournaments_data)
+            feed = TournamentFeed(participant_ordering=('-votes_received', 'id'))
+            return self.get_paginated_response(feed.build(page))
 
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
@@ -753,7 +713,10 @@ class TournamentViewSet(viewsets.ModelViewSet):
             )
 
         try:
-            participation = Participation.objects.get(
+            participation = Participation.objects.select_related(
+                'user',
+                'video_submission'
+            ).get(
                 tournament=tournament,
                 video_submission_id=video_id
             )
@@ -764,10 +727,7 @@ class TournamentViewSet(viewsets.ModelViewSet):
             )
 
         # Increment view count
-        VideoSubmission.objects.filter(id=video_id).update(
-            views_count=F('views_count') + 1
-        )
-        participation.video_submission.refresh_from_db()
+        record_view(VideoSubmission, participation.video_submission_id)
 
         return Response({
             'tournament': {
@@ -782,7 +742,7 @@ class TournamentViewSet(viewsets.ModelViewSet):
                 'video_file': request.build_absolute_uri(participation.video_submission.video_file.url),
                 'cover_image': request.build_absolute_uri(participation.video_submission.cover_image.url),
                 'duration': participation.video_submission.duration,
-                'views_count': participation.video_submission.views_count,
+                'views_count': live_views_count(participation.video_submission),
                 'created_at': participation.video_submission.created_at,
             },
             'participant': {
@@ -830,7 +790,7 @@ class TournamentViewSet(viewsets.ModelViewSet):
             )
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST) 
 
-    @action(detail=False)
+    @action(detail=False, pagination_class=KeysetPagination)
     def my_voted_videos(self, request):
         """Get videos the current user has voted for"""
         if not request.user.is_authenticated:
@@ -845,26 +805,31 @@ class TournamentViewSet(viewsets.ModelViewSet):
             'participation__video_submission',
             'participation__user',
             'tournament'
-        ).order_by('-created_at')
+        ).order_by('-created_at', 'id')
 
         # Handle sorting
         sort_by = request.query_params.get('sort')
         if sort_by:
             if sort_by == 'most_votes':
-                votes = votes.order_by('-participation__votes_received')
+                votes = votes.order_by('-participation__votes_received', 'id')
             elif sort_by == 'most_viewed':
-                votes = votes.order_by('-participation__video_submission__views_count')
+                votes = votes.order_by('-participation__video_submission__views_count', 'id')
             elif sort_by == 'oldest':
-                votes = votes.order_by('created_at')
+                votes = votes.order_by('created_at', 'id')
 
         # Pagination
         page = self.paginate_queryset(votes)
         if page is not None:
+            pending = pending_views(
+                VideoSubmission,
+                [vote.participation.video_submission_id for vote in page]
+            )
+            voting_stats = Vote.objects.filter(voter=request.user).aggregate(
+                total_votes_cast=Count('id'),
+                tournaments_voted_in=Count('tournament', distinct=True)
+            )
             return self.get_paginated_response({
-                'voting_stats': {
-                    'total_votes_cast': votes.count(),
-                    'tournaments_voted_in': votes.values('tournament').distinct().count()
-                },
+                'voting_stats': voting_stats,
                 'voted_videos': [{
                     'voted_at': vote.created_at,
                     'tournament': {
@@ -881,7 +846,9 @@ class TournamentViewSet(viewsets.ModelViewSet):
                         'cover_image': request.build_absolute_uri(
                             vote.participation.video_submission.cover_image.url
                         ),
-                        'views_count': vote.participation.video_submission.views_count,
+                        'views_count': vote.participation.video_submission.views_count + pending.get(
+                            vote.participation.video_submission_id, 0
+                        ),
                         'votes_received': vote.participation.votes_received,
                     },
                     'participant': {
@@ -901,6 +868,189 @@ class VideoSubmissionViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.action in ('upload_start', 'upload_complete', 'upload_abort') and not direct_uploads_enabled():
+            raise NotFound("Direct uploads are not available")
+
+    @action(detail=False, methods=['post'], url_path='uploads', permission_classes=[permissions.IsAuthenticated])
+    def upload_start(self, request):
+        """
+        Start a direct-to-storage upload: returns one presigned PUT URL per
+        `part_size` chunk and an `upload` token for completing it
+        """
+        serializer = DirectUploadStartSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            upload = start_upload(request.user, **serializer.validated_data)
+        except UploadError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(upload, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'], url_path='uploads/complete', permission_classes=[permissions.IsAuthenticated])
+    def upload_complete(self, request):
+        """
+        Finish a direct upload and create the video submission. Takes the
+        submission fields plus `upload` and the `parts` ETags
+        """
+        serializer = DirectVideoSubmissionSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        try:
+            name = complete_upload(
+                serializer.validated_data['upload'],
+                request.user,
+                serializer.validated_data['parts']
+            )
+        except UploadError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        serializer.save(user=request.user, video_file=name)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'], url_path='uploads/abort', permission_classes=[permissions.IsAuthenticated])
+    def upload_abort(self, request):
+        """Abandon a direct upload"""
+        try:
+            abort_upload(request.data.get('upload', ''), request.user)
+        except UploadError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+TUS_VERSION = '1.0.0'
+
+
+class UploadStateUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Upload state is temporarily unavailable'
+
+
+def parse_upload_metadata(header):
+    """tus Upload-Metadata: comma-separated `key base64value` pairs"""
+    metadata = {}
+    for pair in filter(None, (item.strip() for item in header.split(','))):
+        key, _, value = pair.partition(' ')
+        try:
+            metadata[key] = base64.b64decode(value).decode()
+        except (ValueError, UnicodeDecodeError):
+            raise ResumableUploadError(f"Invalid Upload-Metadata value for {key}")
+    return metadata
+
+
+@method_decorator(transaction.non_atomic_requests, name='dispatch')
+class ResumableUploadViewSet(viewsets.ViewSet):
+    """
+    tus-style resumable video uploads (core protocol, creation and termination).
+
+    POST creates an upload from Upload-Length and Upload-Metadata (filename);
+    HEAD reports Upload-Offset to resume from; PATCH appends one chunk of
+    application/offset+octet-stream at Upload-Offset; DELETE abandons it.
+    Once complete, POST .../submit/ attaches the file to a new VideoSubmission.
+
+    Requests aren't wrapped in a transaction, so streaming a chunk never
+    holds a database connection.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response['Tus-Resumable'] = TUS_VERSION
+        response['Cache-Control'] = 'no-store'
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def _get_upload(self, pk):
+        try:
+            upload = ResumableUpload.get(pk, self.request.user)
+        except RedisError:
+            raise UploadStateUnavailable()
+        if upload is None:
+            raise NotFound("Upload not found")
+        return upload
+
+    def create(self, request):
+        try:
+            length = int(request.headers.get('Upload-Length', ''))
+            metadata = parse_upload_metadata(request.headers.get('Upload-Metadata', ''))
+            upload = ResumableUpload.create(request.user, length, metadata.get('filename', ''))
+        except ValueError:
+            return Response({"error": "Upload-Length is required"}, status=status.HTTP_400_BAD_REQUEST)
+        except ResumableUploadError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except RedisError:
+            raise UploadStateUnavailable()
+
+        response = Response(status=status.HTTP_201_CREATED)
+        response['Location'] = reverse('api:resumable-upload-detail', kwargs={'pk': upload.id}, request=request)
+        response['Upload-Offset'] = upload.offset
+        return response
+
+    def retrieve(self, request, pk=None):
+        # Also answers HEAD, which clients use to find where to resume
+        upload = self._get_upload(pk)
+        response = Response(status=status.HTTP_200_OK)
+        response['Upload-Offset'] = upload.offset
+        response['Upload-Length'] = upload.length
+        return response
+
+    def partial_update(self, request, pk=None):
+        if request.content_type != 'application/offset+octet-stream':
+            return Response(
+                {"error": "Content-Type must be application/offset+octet-stream"},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+            )
+        upload = self._get_upload(pk)
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            size = int(request.headers.get('Content-Length') or 0)
+        except (KeyError, ValueError):
+            return Response({"error": "Upload-Offset is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            # Streamed straight from the socket to disk; never buffered whole
+            new_offset = upload.append(request.stream, offset, size)
+        except OffsetConflict as e:
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+        except ResumableUploadError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except RedisError:
+            raise UploadStateUnavailable()
+
+        response = Response(status=status.HTTP_204_NO_CONTENT)
+        response['Upload-Offset'] = new_offset
+        return response
+
+    def destroy(self, request, pk=None):
+        self._get_upload(pk).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=True, methods=['post'])
+    def submit(self, request, pk=None):
+        """Create a video submission from a completed upload"""
+        upload = self._get_upload(pk)
+        if not upload.is_complete:
+            return Response(
+                {"error": "Upload is not complete", "offset": upload.offset},
+                status=status.HTTP_409_CONFLICT
+            )
+        try:
+            upload.check_content()
+        except ResumableUploadError as e:
+            # Resending can't fix the bytes; drop them
+            upload.delete()
+            return Response({"video_file": [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = ResumableVideoSubmissionSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        if not upload.claim():
+            return Response(
+                {"error": "Upload has already been submitted"},
+                status=status.HTTP_409_CONFLICT
+            )
+        try:
+            with upload.open() as video_file, transaction.atomic():
+                serializer.save(user=request.user, video_file=video_file)
+        except Exception:
+            upload.release()
+            raise
+        upload.delete()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
 class ParticipationViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = ParticipationSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -920,7 +1070,11 @@ class UserTournamentProfileViewSet(viewsets.GenericViewSet):
         """Get user info and stats only"""
         try:
             user = User.objects.get(username=username)
-            participations = Participation.objects.filter(user=user)
+            participations = Participation.objects.filter(user=user).select_related('video_submission')
+            pending = pending_views(
+                VideoSubmission,
+                [p.video_submission_id for p in participations]
+            )
             
             return Response({
                 'user_info': {
@@ -932,7 +1086,7 @@ class UserTournamentProfileViewSet(viewsets.GenericViewSet):
                 'stats': {
                     'total_participations': participations.count(),
                     'total_votes_received': sum(p.votes_received for p in participations),
-                    'total_views': sum(p.video_submission.views_count for p in participations),
+                    'total_views': sum(p.video_submission.views_count for p in participations) + sum(pending.values()),
                     'finalist_count': participations.filter(is_finalist=True).count(),
                     'tournaments_won': participations.filter(is_finalist=True).count()
                 }
@@ -943,7 +1097,12 @@ class UserTournamentProfileViewSet(viewsets.GenericViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-    @action(detail=False, methods=['get'], url_path='user/(?P<username>[^/.]+)/videos')
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path='user/(?P<username>[^/.]+)/videos',
+        pagination_class=KeysetPagination
+    )
     def user_videos(self, request, username=None):
         """Get user's videos with pagination"""
         try:
@@ -958,13 +1117,13 @@ class UserTournamentProfileViewSet(viewsets.GenericViewSet):
             # Handle sorting
             sort_by = request.query_params.get('sort', 'newest')
             if sort_by == 'most_votes':
-                participations = participations.order_by('-votes_received')
+                participations = participations.order_by('-votes_received', 'id')
             elif sort_by == 'most_viewed':
-                participations = participations.order_by('-video_submission__views_count')
+                participations = participations.order_by('-video_submission__views_count', 'id')
             elif sort_by == 'oldest':
-                participations = participations.order_by('created_at')
+                participations = participations.order_by('created_at', 'id')
             else:  # newest
-                participations = participations.order_by('-created_at')
+                participations = participations.order_by('-created_at', 'id')
 
             page = self.paginate_queryset(participations)
             if page is not None:
@@ -990,29 +1149,28 @@ class PublicTournamentViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def showcase(self, request):
         """
-        Public API endpoint for showcasing tournaments
+        Public API endpoint for showcasing tournaments.
+        Served from the public cache and revalidated with ETag/Last-Modified.
         """
+        entry = get_public_entry(request, 'showcase', lambda: self._build_showcase(request))
+        return public_response(request, entry)
+
+    def _build_showcase(self, request):
         now = timezone.now()
-        
+
         # Get active, showcase tournaments
         showcase_tournaments = Tournament.objects.filter(
             is_showcase=True,
             start_time__lte=now
         ).exclude(
             end_time__lte=now  # Exclude ended tournaments
-        ).order_by('-featured', '-start_time')[:10]
-        
-        # Filter for truly active tournaments
-        active_showcase_tournaments = []
-        for tournament in showcase_tournaments:
-            if tournament.is_active:  # Use the is_active property to check
-                active_showcase_tournaments.append(tournament)
-        
+        ).select_related('category').order_by('-featured', '-start_time')[:10]
+
         # Custom limited serialization for public view
         result = []
-        for tournament in active_showcase_tournaments:
-            participant_count = tournament.participations.count()
-            
+        for tournament in showcase_tournaments:
+            if not tournament.is_active:
+                continue
             result.append({
                 'id': tournament.id,
                 'title': tournament.title,
@@ -1020,16 +1178,27 @@ class PublicTournamentViewSet(viewsets.ReadOnlyModelViewSet):
                 'rules': tournament.rules,
                 'prizes': tournament.prizes,
                 'image': request.build_absolute_uri(tournament.image.url) if tournament.image else None,
+                'image_variants': absolute_variant_urls(request, tournament.image),
                 'category': tournament.category.name,
-                'participant_count': participant_count,
+                'participant_count': tournament.participant_count,
                 'participant_limit': tournament.participant_limit,
                 'is_active': True,  # We've already confirmed these are active
                 'featured': tournament.featured,
                 'start_time': tournament.start_time
             })
-        
-        return Response(result)
-    
+
+        # Starts and ends change the listing without any save, so the entry
+        # must not outlive the next one
+        boundaries = Tournament.objects.filter(is_showcase=True).aggregate(
+            next_start=Min('start_time', filter=Q(start_time__gt=now)),
+            next_end=Min('end_time', filter=Q(end_time__gt=now))
+        )
+        upcoming = [moment for moment in boundaries.values() if moment is not None]
+        timeout = PUBLIC_CACHE_TIMEOUT
+        if upcoming:
+            timeout = max(int((min(upcoming) - now).total_seconds()), 1)
+        return result, timeout
+
 class SponsorViewSet(viewsets.ModelViewSet):
     queryset = Sponsor.objects.all()
     permission_classes = [permissions.IsAuthenticated]
@@ -1056,7 +1225,11 @@ class SponsorViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def public(self, request):
-        """Public API endpoint for active sponsors"""
+        """Public API endpoint for active sponsors, served from the public cache"""
+        entry = get_public_entry(request, 'sponsors', lambda: self._build_public(request))
+        return public_response(request, entry)
+
+    def _build_public(self, request):
         sponsors = Sponsor.objects.filter(is_active=True)
         
         result = []
@@ -1066,7 +1239,8 @@ class SponsorViewSet(viewsets.ModelViewSet):
                 'name': sponsor.name,
                 'description': sponsor.description,
                 'logo': request.build_absolute_uri(sponsor.logo.url) if sponsor.logo else None,
+                'logo_variants': absolute_variant_urls(request, sponsor.logo),
                 'website_url': sponsor.website_url
             })
         
-        return Response(result)
\ No newline at end of file
+        return result, PUBLIC_CACHE_TIMEOUT
\ No newline at end of file
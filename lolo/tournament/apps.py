@@ -1,6 +1,12 @@
+import contextlib
+
 from django.apps import AppConfig
 
 
 class TournamentConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'lolo.tournament'
+
+    def ready(self):
+        with contextlib.suppress(ImportError):
+            import lolo.tournament.signals  # noqa: F401
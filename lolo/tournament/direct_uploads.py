@@ -0,0 +1,165 @@
+# lolo/tournament/direct_uploads.py
+import math
+import posixpath
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+
+from .models import VideoSubmission
+from .upload_handlers import VIDEO_SNIFF_SIZE, video_content_error
+
+# S3 rejects non-final parts under 5MB
+UPLOAD_PART_SIZE = 10 * 1024 * 1024
+# Long enough for a slow mobile connection to push every part
+UPLOAD_URL_EXPIRY = 60 * 60 * 6
+UPLOAD_SALT = 'tournament.direct-upload'
+
+
+class UploadError(Exception):
+    """A direct upload that can't be started or completed"""
+
+
+def direct_uploads_enabled():
+    # Only S3-backed storage can hand out presigned URLs
+    return hasattr(default_storage, 'bucket_name')
+
+
+def _client():
+    return default_storage.connection.meta.client
+
+
+def _object_key(name):
+    return posixpath.join(default_storage.location, name) if default_storage.location else name
+
+
+def start_upload(user, filename, size, content_type='video/mp4'):
+    """
+    Open a multipart upload under the video field's `upload_to` and presign
+    a PUT URL per part. The client uploads straight to storage and sends
+    back the returned `upload` token with each part's ETag to finish.
+    """
+    extension = posixpath.splitext(filename)[1].lstrip('.').lower()
+    if extension not in settings.ALLOWED_VIDEO_EXTENSIONS:
+        raise UploadError(
+            f"Unsupported file type. Allowed: {', '.join(settings.ALLOWED_VIDEO_EXTENSIONS)}"
+        )
+    if not 0 < size <= settings.MAX_UPLOAD_SIZE:
+        raise UploadError(f"File size must be between 1 byte and {settings.MAX_UPLOAD_SIZE} bytes")
+
+    upload_to = VideoSubmission._meta.get_field('video_file').upload_to
+    name = f'{upload_to}{uuid.uuid4().hex}.{extension}'
+    client = _client()
+    upload_id = client.create_multipart_upload(
+        Bucket=default_storage.bucket_name,
+        Key=_object_key(name),
+        ContentType=content_type
+    )['UploadId']
+
+    parts = [
+        {
+            'part_number': number,
+            'url': client.generate_presigned_url(
+                'upload_part',
+                Params={
+                    'Bucket': default_storage.bucket_name,
+                    'Key': _object_key(name),
+                    'UploadId': upload_id,
+                    'PartNumber': number,
+                },
+                ExpiresIn=UPLOAD_URL_EXPIRY
+            ),
+        }
+        for number in range(1, math.ceil(size / UPLOAD_PART_SIZE) + 1)
+    ]
+    return {
+        'upload': signing.dumps(
+            {'user': user.pk, 'name': name, 'upload_id': upload_id},
+            salt=UPLOAD_SALT
+        ),
+        'part_size': UPLOAD_PART_SIZE,
+        'parts': parts,
+        'expires_in': UPLOAD_URL_EXPIRY,
+    }
+
+
+def _load(token, user):
+    try:
+        upload = signing.loads(token, salt=UPLOAD_SALT, max_age=UPLOAD_URL_EXPIRY)
+    except signing.BadSignature:
+        raise UploadError("Invalid or expired upload")
+    if upload['user'] != user.pk:
+        raise UploadError("Invalid or expired upload")
+    return upload
+
+
+def _claim_key(upload_id):
+    return f'direct-upload:completed:{upload_id}'
+
+
+def complete_upload(token, user, parts):
+    """
+    Assemble the uploaded parts and verify the object (size, then magic
+    bytes and container against the extension), returning its name for the
+    video FileField. `parts` are {'part_number', 'etag'} dicts. A token
+    completes at most one upload.
+    """
+    upload = _load(token, user)
+    claim_key = _claim_key(upload['upload_id'])
+    # Outlives the token itself, so a replay can't create a second submission
+    if not cache.add(claim_key, True, UPLOAD_URL_EXPIRY):
+        raise UploadError("Upload has already been completed")
+    key = _object_key(upload['name'])
+    client = _client()
+    try:
+        client.complete_multipart_upload(
+            Bucket=default_storage.bucket_name,
+            Key=key,
+            UploadId=upload['upload_id'],
+            MultipartUpload={'Parts': [
+                {'PartNumber': part['part_number'], 'ETag': part['etag']}
+                for part in sorted(parts, key=lambda part: part['part_number'])
+            ]}
+        )
+        size = client.head_object(Bucket=default_storage.bucket_name, Key=key)['ContentLength']
+    except client.exceptions.ClientError:
+        # Nothing was assembled; let the client retry with the right parts
+        cache.delete(claim_key)
+        raise UploadError("Upload is incomplete or has expired")
+
+    if size > settings.MAX_UPLOAD_SIZE:
+        discard_upload(upload['name'])
+        raise UploadError(f"File size cannot exceed {settings.MAX_UPLOAD_SIZE} bytes")
+
+    head = client.get_object(
+        Bucket=default_storage.bucket_name,
+        Key=key,
+        Range=f'bytes=0-{VIDEO_SNIFF_SIZE - 1}'
+    )['Body'].read()
+    extension = posixpath.splitext(upload['name'])[1].lstrip('.').lower()
+    error = video_content_error(head, extension)
+    if error:
+        discard_upload(upload['name'])
+        raise UploadError(error)
+    return upload['name']
+
+
+def abort_upload(token, user):
+    """Drop an unfinished upload and the parts stored for it so far"""
+    upload = _load(token, user)
+    client = _client()
+    try:
+        client.abort_multipart_upload(
+            Bucket=default_storage.bucket_name,
+            Key=_object_key(upload['name']),
+            UploadId=upload['upload_id']
+        )
+    except client.exceptions.ClientError:
+        pass
+
+
+def discard_upload(name):
+    """Delete a completed upload that didn't end up in a submission"""
+    default_storage.delete(name)
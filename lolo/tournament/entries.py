@@ -0,0 +1,73 @@
+# lolo/tournament/entries.py
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from lolo.tickets.models import TicketTransaction
+from lolo.users.authentication import invalidate_user
+from .groups import family_root, invalidate_group_summary, reserve_seat
+from .leaderboard import Leaderboard
+from .models import Participation
+
+
+class EntryError(Exception):
+    """An entry that was refused; nothing it wrote is kept"""
+
+
+def submit_entry(tournament, user, video_serializer, **video_fields):
+    """
+    Enter `user` into `tournament` (or its open group) in one short transaction.
+
+    Every contended write is a guarded single-statement UPDATE, so concurrent
+    entries neither oversell seats nor lose ticket updates:
+    - tickets: UPDATE ... SET tickets = tickets - fee WHERE tickets >= fee
+    - seat:    UPDATE ... SET participant_count + 1 WHERE count < limit
+    - duplicates: the (user, tournament) unique constraint on the INSERT
+    The ticket spend is recorded as a TicketTransaction('use') alongside.
+    `video_fields` are passed through to the video serializer's save().
+    """
+    fee = tournament.entry_fee
+    User = get_user_model()
+
+    with transaction.atomic():
+        video = video_serializer.save(user=user, **video_fields)
+
+        # The user row is locked before the tournament row on every entry
+        charged = User.objects.filter(pk=user.pk, tickets__gte=fee).update(
+            tickets=F('tickets') - fee
+        )
+        if not charged:
+            raise EntryError(f"Insufficient tickets. You need {fee} tickets to enter.")
+
+        group = reserve_seat(tournament, user)
+        if group is None:
+            raise EntryError("Tournament has reached maximum participants")
+
+        try:
+            with transaction.atomic():
+                participation = Participation.objects.create(
+                    user=user,
+                    tournament=group,
+                    video_submission=video
+                )
+        except IntegrityError:
+            raise EntryError("You have already entered this tournament")
+
+        balance = User.objects.filter(pk=user.pk).values_list('tickets', flat=True).get()
+        # The UPDATE skipped the save signals that refresh cached auth snapshots
+        invalidate_user(user.pk)
+        # Ledger rows are signed deltas: spends are negative
+        TicketTransaction.objects.create(
+            user=user,
+            transaction_type='use',
+            number_of_tickets=-fee,
+            balance_after=balance,
+            notes=f"Entry to {group}"
+        )
+
+        Leaderboard(group.pk).on_commit_add(participation.id)
+        if group.participant_limit and group.participant_count + 1 >= group.participant_limit:
+            invalidate_group_summary(family_root(group).pk)
+
+    user.tickets = balance
+    return participation
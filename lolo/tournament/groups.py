@@ -0,0 +1,157 @@
+# lolo/tournament/groups.py
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import BooleanField, Case, Exists, F, OuterRef, Q, When
+from django.utils import timezone
+
+from .models import Participation, Tournament
+
+GROUP_SUMMARY_CACHE_TIMEOUT = 60
+# Provision the next group once the current one is this full
+PROVISION_AHEAD_RATIO = 0.8
+MAX_SEAT_ATTEMPTS = 5
+
+
+def group_summary_key(parent_id):
+    return f'tournament:groups:{parent_id}'
+
+
+def summarize_groups(parent_ids):
+    """
+    {parent_id: [group summary, ...]} for repeating parents.
+
+    Summaries are cached per parent; every miss on a page is resolved
+    together in one query with fullness computed by the database. Participant
+    counts may trail by up to GROUP_SUMMARY_CACHE_TIMEOUT between fills.
+    """
+    keys = {group_summary_key(parent_id): parent_id for parent_id in parent_ids}
+    summaries = {keys[key]: groups for key, groups in cache.get_many(keys).items()}
+
+    missing = [parent_id for parent_id in parent_ids if parent_id not in summaries]
+    if missing:
+        fresh = {parent_id: [] for parent_id in missing}
+        children = Tournament.objects.filter(
+            parent_tournament_id__in=missing
+        ).annotate(
+            is_full=Case(
+                When(
+                    Q(participant_limit__isnull=False) & Q(participant_count__gte=F('participant_limit')),
+                    then=True
+                ),
+                default=False,
+                output_field=BooleanField()
+            )
+        ).order_by('id').values(
+            'id', 'title', 'group_name', 'participant_count', 'is_full', 'parent_tournament_id'
+        )
+        for child in children:
+            fresh[child['parent_tournament_id']].append({
+                'id': child['id'],
+                'title': child['title'],
+                'group': child['group_name'],
+                'participants': child['participant_count'],
+                'is_full': child['is_full'],
+            })
+        cache.set_many(
+            {group_summary_key(parent_id): groups for parent_id, groups in fresh.items()},
+            GROUP_SUMMARY_CACHE_TIMEOUT
+        )
+        summaries.update(fresh)
+    return summaries
+
+
+def invalidate_group_summary(parent_id):
+    # Deferred like the closing_soon ranking, so readers can't re-cache
+    # the pre-commit family
+    transaction.on_commit(lambda: cache.delete(group_summary_key(parent_id)))
+
+
+# Group allocation for repeating tournaments. A family is a parent plus its
+# generated groups; entrants are routed to the oldest group with free seats,
+# and the next group is created before the current one runs out.
+
+def family_root(tournament):
+    return tournament.parent_tournament if tournament.parent_tournament_id else tournament
+
+
+def open_groups(parent, now=None):
+    """Groups of the family still taking entries, oldest first"""
+    now = now or timezone.now()
+    return Tournament.objects.filter(
+        Q(pk=parent.pk) | Q(parent_tournament_id=parent.pk),
+        Q(end_time__isnull=True) | Q(end_time__gt=now),
+        start_time__lte=now,
+        participant_count__lt=F('participant_limit')
+    ).order_by('id')
+
+
+def take_seat(tournament_id):
+    """Claim a seat with a conditional UPDATE; False if the tournament is full"""
+    return Tournament.objects.filter(
+        Q(participant_limit__isnull=True) | Q(participant_count__lt=F('participant_limit')),
+        pk=tournament_id
+    ).update(participant_count=F('participant_count') + 1) == 1
+
+
+def lock_family(parent):
+    """
+    Row-lock the family's parent. Every path that takes seats in a family
+    locks the parent first, so locks are always taken parent -> group.
+    """
+    list(Tournament.objects.select_for_update().filter(pk=parent.pk).values_list('pk'))
+
+
+def ensure_open_groups(parent, minimum=1, exclude=None):
+    """
+    Return an open group of the family, first creating one unless `minimum`
+    are already open. Runs under the parent's row lock, so concurrent callers
+    provision only once. `exclude` filters out groups that don't qualify.
+    Returns None once the family has ended.
+    """
+    if parent.end_time and parent.end_time <= timezone.now():
+        return None
+    with transaction.atomic():
+        lock_family(parent)
+        groups = open_groups(parent)
+        if exclude is not None:
+            groups = groups.exclude(exclude)
+        existing = list(groups[:minimum])
+        if len(existing) >= minimum:
+            return existing[0]
+        return parent.create_new_group()
+
+
+def reserve_seat(tournament, user):
+    """
+    Reserve a seat for `user`, returning the tournament that holds it or None.
+
+    Full repeating tournaments route the entrant to their family's open group
+    (skipping groups the user already entered) instead of turning them away.
+    Must run inside a transaction: the family lock is held until it commits.
+    """
+    if not (tournament.is_repeating and tournament.participant_limit):
+        return tournament if take_seat(tournament.pk) else None
+
+    parent = family_root(tournament)
+    lock_family(parent)
+    entered = Exists(Participation.objects.filter(user=user, tournament=OuterRef('pk')))
+    group = tournament if tournament.is_active and take_seat(tournament.pk) else None
+    for _ in range(MAX_SEAT_ATTEMPTS):
+        if group is not None:
+            break
+        candidate = open_groups(parent).exclude(entered).first()
+        if candidate is None:
+            candidate = ensure_open_groups(parent, exclude=entered)
+            if candidate is None:
+                return None
+        if take_seat(candidate.pk):
+            group = candidate
+    if group is None:
+        return None
+
+    seats_taken = group.participant_count + 1
+    if seats_taken >= PROVISION_AHEAD_RATIO * group.participant_limit:
+        # Have the next group ready before this one fills
+        still_open = seats_taken < group.participant_limit
+        ensure_open_groups(parent, minimum=2 if still_open else 1)
+    return group
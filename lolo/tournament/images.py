@@ -0,0 +1,291 @@
+# lolo/tournament/images.py
+import hashlib
+import logging
+import math
+import posixpath
+import struct
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .models import ImageDerivative
+
+logger = logging.getLogger(__name__)
+
+# Longest edge per variant; originals smaller than a variant aren't upscaled
+IMAGE_VARIANTS = {
+    'thumb': 160,
+    'card': 480,
+    'full': 1280,
+}
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+BLURHASH_COMPONENTS = (4, 3)
+VARIANTS_CACHE_TIMEOUT = 60 * 60 * 24
+# Per-process LRU of resolved variant URLs; derivatives never change for a given source
+VARIANT_LRU_SIZE = 4096
+ALLOWED_IMAGE_FORMATS = ('JPEG', 'PNG', 'GIF', 'WEBP')
+# Headers (JPEG APP segments included) are expected within this many bytes
+IMAGE_HEADER_LIMIT = 1024 * 1024
+IMAGE_SIGNATURES = (b'\xff\xd8\xff', b'\x89PNG\r\n\x1a\n', b'GIF87a', b'GIF89a')
+
+BASE83 = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~'
+
+
+class ImageRejected(Exception):
+    """The bytes aren't an acceptable image"""
+
+
+class ImageHeaderIncomplete(ImageRejected):
+    """The signature matched but the header runs past the bytes given"""
+
+
+def _webp_size(head):
+    chunk = head[12:16]
+    if chunk == b'VP8X' and len(head) >= 30:
+        return (int.from_bytes(head[24:27], 'little') + 1, int.from_bytes(head[27:30], 'little') + 1)
+    if chunk == b'VP8L' and len(head) >= 25:
+        bits = int.from_bytes(head[21:25], 'little')
+        return (bits & 0x3FFF) + 1, (bits >> 14 & 0x3FFF) + 1
+    if chunk == b'VP8 ' and len(head) >= 30:
+        width, height = struct.unpack('<HH', head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk in (b'VP8X', b'VP8L', b'VP8 '):
+        raise ImageHeaderIncomplete("Image header is truncated")
+    raise ImageRejected("Unsupported WebP encoding")
+
+
+def read_image_header(head):
+    """
+    (format, width, height) from the leading bytes of an image, parsing the
+    header only; pixel data is never decoded.
+    """
+    if len(head) < 12:
+        raise ImageHeaderIncomplete("Image header is truncated")
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        # Pillow's WebP plugin hands the whole file to libwebp, so read the chunk header directly
+        image_format, (width, height) = 'WEBP', _webp_size(head)
+    elif head.startswith(IMAGE_SIGNATURES):
+        try:
+            with Image.open(BytesIO(head), formats=ALLOWED_IMAGE_FORMATS[:3]) as image:
+                image_format, (width, height) = image.format, image.size
+        except Image.DecompressionBombError as e:
+            raise ImageRejected(str(e))
+        except (UnidentifiedImageError, OSError, SyntaxError, ValueError, struct.error):
+            raise ImageHeaderIncomplete("Image header is truncated or malformed")
+    else:
+        raise ImageRejected(f"Upload a valid image ({', '.join(ALLOWED_IMAGE_FORMATS)})")
+    if not (width and height) or width * height > Image.MAX_IMAGE_PIXELS:
+        raise ImageRejected(f"Image dimensions {width}x{height} are not allowed")
+    return image_format, width, height
+
+
+def _base83(value, length):
+    return ''.join(BASE83[value // 83 ** (length - index) % 83] for index in range(1, length + 1))
+
+
+def _to_linear(value):
+    value /= 255
+    return value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+
+
+def _to_srgb(value):
+    value = min(max(value, 0), 1)
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def blurhash(image, components=BLURHASH_COMPONENTS):
+    """Encode a (small) RGB image as a blurhash placeholder string"""
+    components_x, components_y = components
+    width, height = image.size
+    pixels = [tuple(_to_linear(channel) for channel in pixel) for pixel in image.getdata()]
+
+    factors = []
+    for j in range(components_y):
+        for i in range(components_x):
+            normalisation = 1 if i == j == 0 else 2
+            r = g = b = 0.0
+            for y in range(height):
+                basis_y = math.cos(math.pi * j * y / height)
+                for x in range(width):
+                    basis = basis_y * math.cos(math.pi * i * x / width)
+                    pixel = pixels[y * width + x]
+                    r += basis * pixel[0]
+                    g += basis * pixel[1]
+                    b += basis * pixel[2]
+            scale = normalisation / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _base83(components_x - 1 + (components_y - 1) * 9, 1)
+    if ac:
+        quantised_max = max(0, min(82, int(max(abs(value) for factor in ac for value in factor) * 166 - 0.5)))
+        maximum = (quantised_max + 1) / 166
+        result += _base83(quantised_max, 1)
+    else:
+        maximum = 1
+        result += _base83(0, 1)
+    result += _base83((_to_srgb(dc[0]) << 16) + (_to_srgb(dc[1]) << 8) + _to_srgb(dc[2]), 4)
+
+    def quantise(value):
+        signed = math.copysign(abs(value / maximum) ** 0.5, value)
+        return max(0, min(18, int(signed * 9 + 9.5)))
+
+    for factor in ac:
+        r, g, b = (quantise(value) for value in factor)
+        result += _base83(r * 19 * 19 + g * 19 + b, 2)
+    return result
+
+
+def _encode(image, image_format):
+    buffer = BytesIO()
+    if image_format == 'webp':
+        image.save(buffer, 'WEBP', quality=WEBP_QUALITY, method=4)
+    else:
+        if image.mode != 'RGB':
+            # JPEG has no alpha: flatten transparent logos onto white
+            background = Image.new('RGB', image.size, 'white')
+            background.paste(image, mask=image.getchannel('A') if 'A' in image.getbands() else None)
+            image = background
+        image.save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return ContentFile(buffer.getvalue())
+
+
+def generate_derivatives(name, storage=default_storage):
+    """
+    Create thumb/card/full WebP and JPEG variants next to the original plus
+    its blurhash, recording them on an ImageDerivative. Idempotent.
+    """
+    if not name or ImageDerivative.objects.filter(source=name).exists():
+        return None
+
+    root = posixpath.splitext(name)[0]
+    record = ImageDerivative(source=name)
+    try:
+        with storage.open(name, 'rb') as original:
+            image = Image.open(original)
+            # Let the JPEG decoder downscale while decoding the largest variant
+            image.draft('RGB', (max(IMAGE_VARIANTS.values()),) * 2)
+            image = ImageOps.exif_transpose(image)
+            image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as e:
+        logger.warning("Could not read image %s: %s", name, e)
+    else:
+        record.width, record.height = image.size
+        for variant, edge in sorted(IMAGE_VARIANTS.items(), key=lambda item: -item[1]):
+            resized = image.copy()
+            resized.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+            record.variants[variant] = {
+                'width': resized.width,
+                'height': resized.height,
+                'webp': storage.save(f'{root}__{variant}.webp', _encode(resized, 'webp')),
+                'jpg': storage.save(f'{root}__{variant}.jpg', _encode(resized, 'jpg')),
+            }
+            image = resized
+        placeholder = image.convert('RGB')
+        placeholder.thumbnail((32, 32))
+        record.blurhash = blurhash(placeholder)
+
+    try:
+        with transaction.atomic():
+            record.save()
+    except IntegrityError:
+        # Another worker got there first
+        return None
+    cache.delete(_cache_key(name))
+    return record
+
+
+def queue_derivatives(name):
+    """Generate an image's derivatives in the background once the upload commits"""
+    from .tasks import generate_image_derivatives
+
+    if name:
+        transaction.on_commit(lambda: generate_image_derivatives.delay(name))
+
+
+class LRUCache:
+    """A small thread-safe LRU mapping"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key in self.data:
+                self.data.move_to_end(key)
+                return self.data[key]
+        return None
+
+    def set(self, key, value):
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+
+_variant_urls = LRUCache(VARIANT_LRU_SIZE)
+
+
+def _cache_key(name):
+    return f'image:variants:{hashlib.md5(name.encode()).hexdigest()}'
+
+
+def variant_urls(field_file):
+    """
+    {'blurhash', 'width', 'height', 'thumb': {'webp', 'jpg', 'width', 'height'}, ...}
+    for an image field, or None until its derivatives exist. Resolved through
+    the in-process LRU, then the shared cache, then the database.
+    """
+    if not field_file:
+        return None
+    name = field_file.name
+    urls = _variant_urls.get(name)
+    if urls is not None:
+        return urls or None
+
+    entry = cache.get(_cache_key(name))
+    if entry is None:
+        record = ImageDerivative.objects.filter(source=name).values(
+            'variants', 'blurhash', 'width', 'height'
+        ).first()
+        if record is None:
+            # Not generated yet; don't remember the miss
+            return None
+        entry = record
+        cache.set(_cache_key(name), entry, VARIANTS_CACHE_TIMEOUT)
+    if not entry['variants']:
+        urls = {}
+    else:
+        storage = field_file.storage
+        urls = {
+            'blurhash': entry['blurhash'],
+            'width': entry['width'],
+            'height': entry['height'],
+            **{
+                variant: {
+                    'webp': storage.url(files['webp']),
+                    'jpg': storage.url(files['jpg']),
+                    'width': files['width'],
+                    'height': files['height'],
+                }
+                for variant, files in entry['variants'].items()
+            },
+        }
+    _variant_urls.set(name, urls)
+    return urls or None
@@ -0,0 +1,210 @@
+# lolo/tournament/leaderboard.py
+import logging
+import uuid
+
+from django.db import transaction
+from redis.exceptions import RedisError, WatchError
+
+from .models import Participation
+from .redis_store import get_redis
+
+logger = logging.getLogger(__name__)
+
+LEADERBOARD_TTL = 24 * 60 * 60
+REBUILD_ATTEMPTS = 3
+
+
+class Leaderboard:
+    """
+    Tournament standings kept in a Redis sorted set.
+
+    Members are zero-padded participation ids scored by *negative* votes, so
+    an ascending ZRANGE yields the same order as ('-votes_received', 'id') in
+    the database: most votes first, ties broken by the older entry. Rank
+    lookups and windows are O(log n) and need no COUNT/OFFSET.
+    """
+
+    def __init__(self, tournament_id):
+        self.tournament_id = tournament_id
+        self.key = f'leaderboard:{tournament_id}'
+        self.ready_key = f'{self.key}:ready'
+        self.writes_key = f'{self.key}:writes'
+        self.client = get_redis()
+
+    @staticmethod
+    def _member(participation_id):
+        return f'{int(participation_id):012d}'
+
+    def ensure(self):
+        """Rebuild the sorted set from the database on a cold start"""
+        if not self.client.exists(self.ready_key):
+            self.rebuild()
+        return self
+
+    def rebuild(self):
+        """
+        Build the set under a scratch key and RENAME it over the live one.
+
+        Every write bumps a counter; if it moved between the database read
+        and the swap, a vote may be missing from the snapshot, so the swap is
+        abandoned and the rows re-read. If writes keep racing, the last
+        snapshot is swapped in but left unready, so the next read rebuilds.
+        """
+        scratch = f'{self.key}:build:{uuid.uuid4().hex}'
+        try:
+            for attempt in range(REBUILD_ATTEMPTS):
+                seen = self.client.get(self.writes_key)
+                rows = Participation.objects.filter(
+                    tournament_id=self.tournament_id
+                ).values_list('id', 'votes_received')
+                members = {self._member(pk): -votes for pk, votes in rows}
+                if members:
+                    pipe = self.client.pipeline()
+                    pipe.delete(scratch)
+                    pipe.zadd(scratch, members)
+                    pipe.expire(scratch, LEADERBOARD_TTL)
+                    pipe.execute()
+
+                last = attempt == REBUILD_ATTEMPTS - 1
+                with self.client.pipeline() as pipe:
+                    try:
+                        pipe.watch(self.writes_key)
+                        if pipe.get(self.writes_key) != seen and not last:
+                            continue
+                        pipe.multi()
+                        if members:
+                            pipe.rename(scratch, self.key)
+                        else:
+                            pipe.delete(self.key)
+                        if last:
+                            pipe.delete(self.ready_key)
+                        else:
+                            pipe.set(self.ready_key, 1, ex=LEADERBOARD_TTL)
+                        pipe.execute()
+                        return
+                    except WatchError:
+                        if last:
+                            raise
+        finally:
+            self.client.delete(scratch)
+
+    def _is_ready(self):
+        return self.client.exists(self.ready_key)
+
+    def _write(self, pipe):
+        """Run `pipe` along with the counter bump that tells a rebuild to re-read"""
+        pipe.incr(self.writes_key)
+        pipe.expire(self.writes_key, LEADERBOARD_TTL)
+        pipe.execute()
+
+    def add(self, participation_id, votes=0):
+        pipe = self.client.pipeline()
+        if self._is_ready():
+            pipe.zadd(self.key, {self._member(participation_id): -votes})
+        self._write(pipe)
+
+    def record_vote(self, participation_id):
+        pipe = self.client.pipeline()
+        if self._is_ready():
+            pipe.zincrby(self.key, -1, self._member(participation_id))
+        self._write(pipe)
+
+    def remove(self, participation_id):
+        pipe = self.client.pipeline()
+        pipe.zrem(self.key, self._member(participation_id))
+        self._write(pipe)
+
+    def invalidate(self):
+        """Drop the set so the next read rebuilds it from the database"""
+        pipe = self.client.pipeline()
+        pipe.delete(self.key, self.ready_key)
+        self._write(pipe)
+
+    def size(self):
+        return self.client.zcard(self.key)
+
+    def rank(self, participation_id):
+        """1-based rank of a participation, or None if it isn't ranked"""
+        position = self.client.zrank(self.key, self._member(participation_id))
+        return None if position is None else position + 1
+
+    def entries(self, start, stop):
+        """[(rank, participation_id, votes)] for 0-based positions start..stop-1"""
+        if stop <= start:
+            return []
+        members = self.client.zrange(self.key, start, stop - 1, withscores=True)
+        return [
+            (start + offset + 1, int(member), int(-score))
+            for offset, (member, score) in enumerate(members)
+        ]
+
+    def top(self, count):
+        return self.entries(0, count)
+
+    def around(self, participation_id, radius=5):
+        """Window of up to `radius` entries either side of a participation"""
+        position = self.client.zrank(self.key, self._member(participation_id))
+        if position is None:
+            return []
+        start = max(position - radius, 0)
+        return self.entries(start, position + radius + 1)
+
+    def hydrate(self, entries):
+        """Load the participations for `entries` in one query, keeping rank order"""
+        participations = Participation.objects.select_related(
+            'user',
+            'video_submission',
+            'video_submission__user'
+        ).in_bulk([participation_id for _, participation_id, _ in entries])
+
+        hydrated = []
+        for rank, participation_id, _ in entries:
+            participation = participations.get(participation_id)
+            if participation is not None:
+                participation.rank = rank
+                hydrated.append(participation)
+        return hydrated
+
+    def as_sequence(self):
+        return LeaderboardSequence(self)
+
+    # Transaction-aware hooks for the write paths: Redis is only touched once
+    # the database change is committed, and a Redis outage never fails it.
+
+    def on_commit_add(self, participation_id):
+        transaction.on_commit(lambda: self._safely(self.add, participation_id))
+
+    def on_commit_vote(self, participation_id):
+        transaction.on_commit(lambda: self._safely(self.record_vote, participation_id))
+
+    def on_commit_invalidate(self):
+        transaction.on_commit(lambda: self._safely(self.invalidate))
+
+    def _safely(self, method, *args):
+        try:
+            method(*args)
+        except RedisError:
+            logger.warning("Leaderboard %s not updated", self.tournament_id, exc_info=True)
+
+
+class LeaderboardSequence:
+    """
+    Sliceable, countable view of a leaderboard so the existing page-number
+    paginators can page through it without touching the database.
+    """
+
+    def __init__(self, leaderboard):
+        self.leaderboard = leaderboard
+
+    def count(self):
+        return self.leaderboard.size()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start = index.start or 0
+            stop = index.stop if index.stop is not None else self.count()
+            return self.leaderboard.hydrate(self.leaderboard.entries(start, stop))
+        return self.leaderboard.hydrate(self.leaderboard.entries(index, index + 1))[0]
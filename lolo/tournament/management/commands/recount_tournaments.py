@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from lolo.tournament.models import Tournament
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized participant and vote counters on tournaments"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Number of tournaments updated per statement"
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        tournament_ids = list(Tournament.objects.order_by('id').values_list('id', flat=True))
+
+        updated = 0
+        for start in range(0, len(tournament_ids), batch_size):
+            batch = tournament_ids[start:start + batch_size]
+            updated += Tournament.objects.filter(id__in=batch).recount()
+
+        self.stdout.write(self.style.SUCCESS(f"Recounted {updated} tournaments"))
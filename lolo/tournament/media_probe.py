@@ -0,0 +1,282 @@
+# lolo/tournament/media_probe.py
+import io
+import logging
+import posixpath
+import struct
+from dataclasses import dataclass
+from datetime import timedelta
+
+from .models import VideoSubmission
+
+logger = logging.getLogger(__name__)
+
+# Enough for any header we actually decode; bounds memory per read
+MAX_HEADER_READ = 64 * 1024
+# Ranged storage reads fetch at least this much per request
+RANGE_READ_SIZE = 64 * 1024
+# MP4 boxes worth descending into on the way to the video track
+MP4_CONTAINERS = {b'moov', b'trak', b'mdia', b'minf', b'stbl'}
+# Boxes an ISO base media (MP4/MOV) file can start with
+MP4_LEADING_BOXES = (b'ftyp', b'moov', b'wide', b'free', b'skip', b'mdat')
+
+
+class ProbeError(Exception):
+    """The file isn't a container we can read"""
+
+
+@dataclass
+class VideoMetadata:
+    duration: timedelta | None = None
+    width: int | None = None
+    height: int | None = None
+    codec: str = ''
+
+
+class RangedReader(io.RawIOBase):
+    """
+    Seekable read-only view of an S3 object that fetches only the byte
+    ranges asked for, so skipping a multi-GB mdat box costs nothing.
+    """
+
+    def __init__(self, client, bucket, key):
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.size = client.head_object(Bucket=bucket, Key=key)['ContentLength']
+        self.position = 0
+        self.window_start = 0
+        self.window = b''
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.size}[whence]
+        self.position = max(base + offset, 0)
+        return self.position
+
+    def read(self, size=-1):
+        if size < 0:
+            size = self.size - self.position
+        size = min(size, self.size - self.position)
+        if size <= 0:
+            return b''
+        start = self.position - self.window_start
+        if not (0 <= start and start + size <= len(self.window)):
+            end = min(self.position + max(size, RANGE_READ_SIZE), self.size) - 1
+            self.window = self.client.get_object(
+                Bucket=self.bucket,
+                Key=self.key,
+                Range=f'bytes={self.position}-{end}'
+            )['Body'].read()
+            self.window_start = self.position
+            start = 0
+        data = self.window[start:start + size]
+        self.position += len(data)
+        return data
+
+
+def open_for_probe(field_file):
+    """Seekable binary handle on a stored file, ranged for S3-backed storage"""
+    storage = field_file.storage
+    if hasattr(storage, 'bucket_name'):
+        return RangedReader(
+            storage.connection.meta.client,
+            storage.bucket_name,
+            posixpath.join(storage.location, field_file.name) if storage.location else field_file.name
+        )
+    return storage.open(field_file.name, 'rb')
+
+
+def _read_exact(stream, size):
+    if size > MAX_HEADER_READ:
+        raise ProbeError("Header is unexpectedly large")
+    data = stream.read(size)
+    if len(data) != size:
+        raise ProbeError("File is truncated")
+    return data
+
+
+def _mp4_boxes(stream, end):
+    """Yield (type, payload_start, payload_end) for the boxes up to `end`"""
+    position = stream.tell()
+    while end is None or position + 8 <= end:
+        stream.seek(position)
+        header = stream.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack('>I4s', header)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack('>Q', _read_exact(stream, 8))[0]
+            header_size = 16
+        elif size == 0:
+            # Box runs to the end of its parent (or the file)
+            size = (end if end is not None else stream.seek(0, io.SEEK_END)) - position
+        if size < header_size:
+            raise ProbeError("Malformed box")
+        yield box_type, position + header_size, position + size
+        position += size
+
+
+def probe_mp4(stream):
+    """
+    Read duration from moov/mvhd and the video track's size and codec from
+    trak/tkhd and stsd, seeking past everything else (mdat, sample tables).
+    """
+    metadata = VideoMetadata()
+
+    def walk(end, track):
+        for box_type, start, stop in _mp4_boxes(stream, end):
+            stream.seek(start)
+            if box_type in MP4_CONTAINERS:
+                if box_type == b'trak':
+                    track = {}
+                walk(stop, track)
+                if box_type == b'trak' and track.get('handler') == b'vide' and not metadata.codec:
+                    metadata.width = track.get('width') or track.get('sample_width')
+                    metadata.height = track.get('height') or track.get('sample_height')
+                    metadata.codec = track.get('codec', '')
+            elif box_type == b'mvhd':
+                payload = _read_exact(stream, min(stop - start, 32))
+                if payload[0] == 1:
+                    timescale, duration = struct.unpack('>IQ', payload[20:32])
+                else:
+                    timescale, duration = struct.unpack('>II', payload[12:20])
+                if timescale:
+                    metadata.duration = timedelta(seconds=duration / timescale)
+            elif box_type == b'tkhd':
+                payload = _read_exact(stream, stop - start)
+                width, height = struct.unpack('>II', payload[-8:])
+                # 16.16 fixed point
+                track['width'], track['height'] = width >> 16, height >> 16
+            elif box_type == b'hdlr':
+                track['handler'] = _read_exact(stream, 12)[8:12]
+            elif box_type == b'stsd':
+                payload = _read_exact(stream, min(stop - start, 8 + 8 + 28))
+                if struct.unpack('>I', payload[4:8])[0]:
+                    track['codec'] = payload[12:16].decode('latin-1').strip()
+                    if len(payload) >= 44:
+                        track['sample_width'], track['sample_height'] = struct.unpack('>HH', payload[40:44])
+
+    stream.seek(0)
+    for box_type, start, stop in _mp4_boxes(stream, None):
+        if box_type == b'moov':
+            stream.seek(start)
+            walk(stop, {})
+            return metadata
+    raise ProbeError("No moov box found")
+
+
+def _riff_chunks(stream, end):
+    """Yield (id, list_type, data_start, data_end) for RIFF chunks up to `end`"""
+    position = stream.tell()
+    while position + 8 <= end:
+        stream.seek(position)
+        header = stream.read(8)
+        if len(header) < 8:
+            return
+        chunk_id, size = struct.unpack('<4sI', header)
+        list_type = stream.read(4) if chunk_id in (b'RIFF', b'LIST') else None
+        data_start = position + 12 if list_type else position + 8
+        yield chunk_id, list_type, data_start, position + 8 + size
+        # Chunks are word aligned
+        position += 8 + size + (size & 1)
+
+
+def probe_avi(stream):
+    """Read avih (frame count, frame time, size) and the video strh/strf from hdrl"""
+    metadata = VideoMetadata()
+    stream.seek(0)
+    header = _read_exact(stream, 12)
+    if header[:4] != b'RIFF' or header[8:12] != b'AVI ':
+        raise ProbeError("Not an AVI file")
+    riff_end = 8 + struct.unpack('<I', header[4:8])[0]
+
+    for chunk_id, list_type, start, stop in _riff_chunks(stream, riff_end):
+        if chunk_id != b'LIST' or list_type != b'hdrl':
+            # hdrl comes first; the movi payload after it is never read
+            continue
+        stream.seek(start)
+        for sub_id, sub_type, sub_start, sub_stop in _riff_chunks(stream, stop):
+            stream.seek(sub_start)
+            if sub_id == b'avih':
+                avih = _read_exact(stream, 40)
+                usec_per_frame, total_frames = struct.unpack('<I12xI', avih[:20])
+                metadata.width, metadata.height = struct.unpack('<II', avih[32:40])
+                metadata.duration = timedelta(microseconds=usec_per_frame * total_frames)
+            elif sub_id == b'LIST' and sub_type == b'strl' and not metadata.codec:
+                stream_type = handler = None
+                for strl_id, _, strl_start, _ in _riff_chunks(stream, sub_stop):
+                    stream.seek(strl_start)
+                    if strl_id == b'strh':
+                        stream_type, handler = struct.unpack('<4s4s', _read_exact(stream, 8))
+                    elif strl_id == b'strf' and stream_type == b'vids':
+                        # BITMAPINFOHEADER.biCompression is more reliable than fccHandler
+                        compression = _read_exact(stream, 20)[16:20]
+                        metadata.codec = (compression.strip(b'\x00') or handler).decode('latin-1').strip()
+        return metadata
+    raise ProbeError("No AVI header list found")
+
+
+def probe(stream):
+    """Container metadata from header reads only; memory use is independent of file size"""
+    stream.seek(0)
+    magic = stream.read(12)
+    if magic[:4] == b'RIFF':
+        return probe_avi(stream)
+    if magic[4:8] in MP4_LEADING_BOXES:
+        return probe_mp4(stream)
+    raise ProbeError("Unrecognised container")
+
+
+def sniff_container(head):
+    """
+    'mp4' or 'avi' if the first bytes of a file are a well-formed container
+    start, else ProbeError. Only the box/chunk headers within `head` are read.
+    """
+    if head[:4] == b'RIFF':
+        if head[8:12] != b'AVI ':
+            raise ProbeError("Not an AVI file")
+        if len(head) >= 24 and (head[12:16] != b'LIST' or head[20:24] != b'hdrl'):
+            raise ProbeError("AVI header list is missing")
+        return 'avi'
+    if head[4:8] not in MP4_LEADING_BOXES:
+        raise ProbeError("Unrecognised container")
+    stream = io.BytesIO(head)
+    for box_type, _, _ in _mp4_boxes(stream, len(head)):
+        if not all(32 <= byte < 127 for byte in box_type):
+            raise ProbeError("Malformed box")
+    return 'mp4'
+
+
+def extract_video_metadata(video_id):
+    """
+    Probe a submission's video and store what was found, marking it
+    processed. Returns the metadata, or None if the file couldn't be read.
+    """
+    video = VideoSubmission.objects.filter(pk=video_id).only('video_file').first()
+    if video is None or not video.video_file:
+        return None
+    try:
+        with open_for_probe(video.video_file) as stream:
+            metadata = probe(stream)
+    except (ProbeError, OSError, struct.error) as e:
+        logger.warning("Could not probe video %s: %s", video_id, e)
+        return None
+
+    # update() keeps the save signals (search vectors, re-probing) out of it
+    VideoSubmission.objects.filter(pk=video_id).update(
+        duration=metadata.duration,
+        width=metadata.width,
+        height=metadata.height,
+        video_codec=metadata.codec[:32],
+        processed=True
+    )
+    return metadata
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.9 on 2026-10-17 04:33
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Tournament = apps.get_model('tournament', 'Tournament')
+    Participation = apps.get_model('tournament', 'Participation')
+    Vote = apps.get_model('tournament', 'Vote')
+    participants = Participation.objects.filter(
+        tournament=OuterRef('pk')
+    ).order_by().values('tournament').annotate(total=Count('id')).values('total')
+    votes = Vote.objects.filter(
+        tournament=OuterRef('pk')
+    ).order_by().values('tournament').annotate(total=Count('id')).values('total')
+    Tournament.objects.update(
+        participant_count=Coalesce(Subquery(participants), 0),
+        vote_count=Coalesce(Subquery(votes), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0008_sponsor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='participant_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, help_text='Number of participants (maintained automatically)'),
+        ),
+        migrations.AddField(
+            model_name='tournament',
+            name='vote_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, help_text='Number of votes cast (maintained automatically)'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
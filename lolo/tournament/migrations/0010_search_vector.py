@@ -0,0 +1,48 @@
+# Generated by Django 5.0.9 on 2026-10-17 04:41
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def backfill_search_vectors(apps, schema_editor):
+    for model_name in ('Tournament', 'VideoSubmission'):
+        model = apps.get_model('tournament', model_name)
+        model.objects.update(
+            search_vector=(
+                SearchVector('title', weight='A', config='english')
+                + SearchVector('description', weight='B', config='english')
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0009_tournament_participant_count_vote_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='videosubmission',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='tournament',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='tournament_search_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='videosubmission',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='videosubmission_search_gin'),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.0.9 on 2026-10-17 04:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0010_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='participation',
+            index=models.Index(fields=['tournament', '-votes_received', 'id'], name='participation_votes_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='participation',
+            index=models.Index(fields=['tournament', '-created_at', 'id'], name='participation_newest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='participation',
+            index=models.Index(fields=['user', '-created_at', 'id'], name='participation_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vote',
+            index=models.Index(fields=['voter', '-created_at', 'id'], name='vote_voter_newest_idx'),
+        ),
+    ]
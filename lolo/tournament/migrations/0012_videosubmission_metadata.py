@@ -0,0 +1,28 @@
+# Generated by Django 5.0.9 on 2026-10-17 04:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0011_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videosubmission',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='videosubmission',
+            name='video_codec',
+            field=models.CharField(blank=True, help_text='Codec of the video track, e.g. avc1 (automatically detected)', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='videosubmission',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.9 on 2026-10-17 05:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0012_videosubmission_metadata'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranscodeJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('hls_playlist', models.FileField(blank=True, help_text='HLS master playlist listing every rendition', upload_to='video_renditions/')),
+                ('error', models.TextField(blank=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('video', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='transcode_job', to='tournament.videosubmission')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='VideoRendition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('mp4', 'Progressive MP4'), ('hls', 'HLS variant playlist')], max_length=10)),
+                ('label', models.CharField(help_text='e.g. 720p', max_length=20)),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('bitrate', models.PositiveIntegerField(help_text='Target video bitrate in kbit/s')),
+                ('file', models.FileField(max_length=255, upload_to='video_renditions/')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('video', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='renditions', to='tournament.videosubmission')),
+            ],
+            options={
+                'ordering': ['video', 'kind', '-height'],
+                'unique_together': {('video', 'kind', 'label')},
+            },
+        ),
+    ]
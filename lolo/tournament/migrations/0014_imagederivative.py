@@ -0,0 +1,25 @@
+# Generated by Django 5.0.9 on 2026-10-17 05:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0013_transcoding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageDerivative',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(help_text='Storage name of the original', max_length=255, unique=True)),
+                ('variants', models.JSONField(default=dict, help_text="{variant: {format: storage name, 'width': w, 'height': h}}; empty if the original was unreadable")),
+                ('blurhash', models.CharField(blank=True, max_length=64)),
+                ('width', models.PositiveIntegerField(blank=True, null=True)),
+                ('height', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
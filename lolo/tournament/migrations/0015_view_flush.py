@@ -0,0 +1,21 @@
+# Generated by Django 5.0.9 on 2026-10-17 05:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament', '0014_imagederivative'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ViewFlush',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('batch', models.CharField(max_length=100, unique=True)),
+                ('flushed_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+    ]
@@ -1,7 +1,10 @@
 # lolo/tournament/models.py
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import FileExtensionValidator
+from django.db.models.functions import Coalesce
 
 class Category(models.Model):
     """Tournament categories (e.g., Gaming, Music, Sports)"""
@@ -23,6 +26,34 @@ class Category(models.Model):
 
 # lolo/tournament/models.py
 
+class TournamentQuerySet(models.QuerySet):
+    def recount(self):
+        """Recompute the denormalized participant/vote counters in one UPDATE"""
+        participants = Participation.objects.filter(
+            tournament=models.OuterRef('pk')
+        ).order_by().values('tournament').annotate(
+            total=models.Count('id')
+        ).values('total')
+        votes = Vote.objects.filter(
+            tournament=models.OuterRef('pk')
+        ).order_by().values('tournament').annotate(
+            total=models.Count('id')
+        ).values('total')
+        return self.update(
+            participant_count=Coalesce(models.Subquery(participants), 0),
+            vote_count=Coalesce(models.Subquery(votes), 0)
+        )
+
+def group_label(index):
+    """Spreadsheet-style group names: A..Z, AA..AZ, BA.. and so on"""
+    label = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        label = chr(ord('A') + remainder) + label
+    return label
+
+
 class Tournament(models.Model):
     """
     Main tournament model with rules and prizes as text fields
@@ -117,7 +148,27 @@ class Tournament(models.Model):
         related_name='created_tournaments'
     )
     views_count = models.PositiveIntegerField(default=0)
+    # Denormalized counters, kept in step by the entry/vote endpoints and the
+    # delete signals. `manage.py recount_tournaments` repairs any drift.
+    participant_count = models.PositiveIntegerField(
+        default=0,
+        db_index=True,
+        help_text="Number of participants (maintained automatically)"
+    )
+    vote_count = models.PositiveIntegerField(
+        default=0,
+        db_index=True,
+        help_text="Number of votes cast (maintained automatically)"
+    )
+    # Weighted title/description tsvector, refreshed on save (see search.py)
+    search_vector = SearchVectorField(null=True, editable=False)
 
+    objects = TournamentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='tournament_search_gin'),
+        ]
 
     def __str__(self):
         if self.group_name:
@@ -134,8 +185,7 @@ class Tournament(models.Model):
             # Check if tournament has started and is not full
             if self.start_time <= now:
                 if self.participant_limit:
-                    participant_count = self.participations.count()
-                    return participant_count < self.participant_limit
+                    return self.participant_count < self.participant_limit
                 return True  # No participant limit, always active after start
             return False  # Not started yet
         
@@ -149,36 +199,42 @@ class Tournament(models.Model):
             
         # For parent tournaments
         if not self.parent_tournament:
-            # Generate next group letter (A, B, C, etc.)
-            next_group = chr(ord('A') + self.active_group_count)
             from django.utils import timezone
-            current_time = timezone.now()
-            # Create new tournament with same settings
-            new_tournament = Tournament.objects.create(
-                title=self.title,
-                description=self.description,
-                rules=self.rules,
-                prizes=self.prizes,
-                image=self.image,
-                category=self.category,
-                featured=self.featured,
-                is_showcase=self.is_showcase,
-                start_time=current_time,
-                end_time=self.end_time,
-                participant_limit=self.participant_limit,
-                finalists_count=self.finalists_count,
-                entry_fee=self.entry_fee,
-                is_final_tournament=self.is_final_tournament,
-                created_by=self.created_by,
-                # New fields
-                is_repeating=True,
-                parent_tournament=self,
-                group_name=next_group
-            )
-            
-            # Update the parent tournament
-            self.active_group_count += 1
-            self.save(update_fields=['active_group_count'])
+            with transaction.atomic():
+                # The parent row lock serializes rollover within a family, so
+                # concurrent callers can't create duplicate or misnamed groups
+                locked = Tournament.objects.select_for_update().only(
+                    'active_group_count'
+                ).get(pk=self.pk)
+                # Generate next group name (A..Z, AA, AB, etc.)
+                next_group = group_label(locked.active_group_count)
+                current_time = timezone.now()
+                # Create new tournament with same settings
+                new_tournament = Tournament.objects.create(
+                    title=self.title,
+                    description=self.description,
+                    rules=self.rules,
+                    prizes=self.prizes,
+                    image=self.image,
+                    category=self.category,
+                    featured=self.featured,
+                    is_showcase=self.is_showcase,
+                    start_time=current_time,
+                    end_time=self.end_time,
+                    participant_limit=self.participant_limit,
+                    finalists_count=self.finalists_count,
+                    entry_fee=self.entry_fee,
+                    is_final_tournament=self.is_final_tournament,
+                    created_by=self.created_by,
+                    # New fields
+                    is_repeating=True,
+                    parent_tournament=self,
+                    group_name=next_group
+                )
+                
+                # Update the parent tournament
+                self.active_group_count = locked.active_group_count + 1
+                self.save(update_fields=['active_group_count'])
             
             return new_tournament
             
@@ -203,6 +259,13 @@ class VideoSubmission(models.Model):
         blank=True,
         help_text="Video duration (automatically calculated)"
     )
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    video_codec = models.CharField(
+        max_length=32,
+        blank=True,
+        help_text="Codec of the video track, e.g. avc1 (automatically detected)"
+    )
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -213,6 +276,12 @@ class VideoSubmission(models.Model):
         default=False,
         help_text="Indicates if the video has been processed"
     )
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='videosubmission_search_gin'),
+        ]
 
     def __str__(self):
         return self.title
@@ -241,6 +310,12 @@ class Participation(models.Model):
     class Meta:
         unique_together = ['user', 'tournament']
         verbose_name_plural = "Participations"
+        # Keyset pagination walks these (sort column, id) ranges
+        indexes = [
+            models.Index(fields=['tournament', '-votes_received', 'id'], name='participation_votes_idx'),
+            models.Index(fields=['tournament', '-created_at', 'id'], name='participation_newest_idx'),
+            models.Index(fields=['user', '-created_at', 'id'], name='participation_user_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.tournament.title}"
@@ -267,6 +342,9 @@ class Vote(models.Model):
     class Meta:
         unique_together = ['voter', 'tournament']  # Fixed unique_together
         verbose_name_plural = "Votes"
+        indexes = [
+            models.Index(fields=['voter', '-created_at', 'id'], name='vote_voter_newest_idx'),
+        ]
 
     def __str__(self):
         return f"{self.voter.username} voted for {self.participation}"
@@ -350,4 +428,92 @@ class Sponsor(models.Model):
     )
     
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+class TranscodeJob(models.Model):
+    """State of the media pipeline for one video submission"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    video = models.OneToOneField(
+        VideoSubmission,
+        on_delete=models.CASCADE,
+        related_name='transcode_job'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pending'
+    )
+    hls_playlist = models.FileField(
+        upload_to='video_renditions/',
+        blank=True,
+        help_text="HLS master playlist listing every rendition"
+    )
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.video} ({self.status})"
+
+
+class VideoRendition(models.Model):
+    """A transcoded copy of a video submission at one bitrate"""
+    KIND_CHOICES = [
+        ('mp4', 'Progressive MP4'),
+        ('hls', 'HLS variant playlist'),
+    ]
+
+    video = models.ForeignKey(
+        VideoSubmission,
+        on_delete=models.CASCADE,
+        related_name='renditions'
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    label = models.CharField(max_length=20, help_text="e.g. 720p")
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    bitrate = models.PositiveIntegerField(help_text="Target video bitrate in kbit/s")
+    file = models.FileField(upload_to='video_renditions/', max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['video', 'kind', 'label']
+        ordering = ['video', 'kind', '-height']
+
+    def __str__(self):
+        return f"{self.video} {self.label} {self.kind}"
+
+
+class ImageDerivative(models.Model):
+    """Resized variants and a blurhash placeholder for one stored image"""
+    source = models.CharField(max_length=255, unique=True, help_text="Storage name of the original")
+    variants = models.JSONField(
+        default=dict,
+        help_text="{variant: {format: storage name, 'width': w, 'height': h}}; empty if the original was unreadable"
+    )
+    blurhash = models.CharField(max_length=64, blank=True)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.source
+
+
+class ViewFlush(models.Model):
+    """
+    A buffered view batch already added to views_count. Written in the same
+    transaction as the counts, so a batch is never applied twice.
+    """
+    batch = models.CharField(max_length=100, unique=True)
+    flushed_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.batch
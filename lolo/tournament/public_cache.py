@@ -0,0 +1,70 @@
+# lolo/tournament/public_cache.py
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+PUBLIC_VERSION_KEY = 'public:version'
+PUBLIC_CACHE_TIMEOUT = 60 * 60
+# How long clients/CDNs may reuse a response before revalidating
+PUBLIC_MAX_AGE = 60
+
+
+def get_public_version():
+    """
+    Current version of the public payloads: the time (ns) of the last change.
+    Cache entries embed it in their key, so bumping it retires all of them.
+    """
+    version = cache.get(PUBLIC_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(PUBLIC_VERSION_KEY, version, None):
+            version = cache.get(PUBLIC_VERSION_KEY, version)
+    return version
+
+
+def bump_public_version():
+    transaction.on_commit(lambda: cache.set(PUBLIC_VERSION_KEY, time.time_ns(), None))
+
+
+def get_public_entry(request, name, build):
+    """
+    Cached payload for a public endpoint. `build()` returns (data, timeout);
+    the timeout lets time-dependent payloads expire at their next boundary.
+    """
+    version = get_public_version()
+    # Payloads contain absolute URLs, so each host gets its own entry
+    origin = hashlib.md5(request.build_absolute_uri('/').encode()).hexdigest()
+    key = f'public:{name}:{version}:{origin}'
+
+    entry = cache.get(key)
+    if entry is None:
+        data, timeout = build()
+        body = json.dumps(data, default=str, sort_keys=True)
+        entry = {
+            'data': data,
+            'etag': quote_etag(hashlib.md5(body.encode()).hexdigest()),
+            'last_modified': version // 10 ** 9,
+        }
+        cache.set(key, entry, min(timeout, PUBLIC_CACHE_TIMEOUT))
+    return entry
+
+
+def public_response(request, entry):
+    """Response for a cached entry, or a 304 when the client's copy is current"""
+    response = get_conditional_response(
+        request,
+        etag=entry['etag'],
+        last_modified=entry['last_modified']
+    )
+    if response is None:
+        response = Response(entry['data'])
+    response['ETag'] = entry['etag']
+    response['Last-Modified'] = http_date(entry['last_modified'])
+    patch_cache_control(response, public=True, max_age=PUBLIC_MAX_AGE)
+    return response
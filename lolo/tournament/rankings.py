@@ -0,0 +1,84 @@
+# lolo/tournament/rankings.py
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, FloatField, IntegerField, Q, When
+from django.db.models.functions import Cast, NullIf
+from django.utils import timezone
+
+from .models import Tournament
+
+CLOSING_SOON_CACHE_KEY = 'tournament:closing_soon:ids'
+CLOSING_SOON_CACHE_TIMEOUT = 5 * 60
+CLOSING_SOON_LIMIT = 8
+
+# Bucket numbers double as the priority order of the closing_soon listing
+EMPTY, NEARLY_FULL, ENDING_SOON, ACTIVE, ENDED = range(1, 6)
+
+
+def rank_closing_soon(now=None, limit=CLOSING_SOON_LIMIT):
+    """
+    Rank tournaments for the closing_soon listing in a single query:
+    1. Active tournaments with participant limits that have 0 participants
+    2. Active tournaments that are nearly full (80%+ capacity)
+    3. Active tournaments ending within the next 48 hours
+    4. Any other active tournaments
+    5. Recently ended tournaments
+    """
+    now = now or timezone.now()
+    active = Q(start_time__lte=now) & (Q(end_time__isnull=True) | Q(end_time__gt=now))
+    limited = Q(participant_limit__isnull=False)
+
+    queryset = Tournament.objects.annotate(
+        fill_ratio=Cast('participant_count', FloatField()) / Cast(NullIf('participant_limit', 0), FloatField()),
+        remaining_spots=Cast(F('participant_limit') - F('participant_count'), IntegerField()),
+    ).annotate(
+        bucket=Case(
+            When(active & limited & Q(participant_count=0), then=EMPTY),
+            When(active & limited & Q(fill_ratio__gte=0.8), then=NEARLY_FULL),
+            When(active & Q(end_time__lte=now + timezone.timedelta(hours=48)), then=ENDING_SOON),
+            When(active, then=ACTIVE),
+            When(end_time__lte=now, then=ENDED),
+            default=None,
+            output_field=IntegerField()
+        )
+    ).filter(bucket__isnull=False)
+
+    def within(bucket, expression):
+        return Case(When(bucket=bucket, then=expression), default=None)
+
+    return list(queryset.order_by(
+        'bucket',
+        # Empty: featured first, then newest start time
+        within(EMPTY, F('featured')).desc(nulls_last=True),
+        within(EMPTY, F('start_time')).desc(nulls_last=True),
+        # Nearly full: fewest remaining spots first
+        within(NEARLY_FULL, F('remaining_spots')).asc(nulls_last=True),
+        # Ending soon: closest end time first
+        within(ENDING_SOON, F('end_time')).asc(nulls_last=True),
+        # Other active: most recently started first
+        within(ACTIVE, F('start_time')).desc(nulls_last=True),
+        # Ended: most recently ended first
+        within(ENDED, F('end_time')).desc(nulls_last=True),
+        'id'
+    ).values_list('id', flat=True)[:limit])
+
+
+def refresh_closing_soon():
+    """Recompute the closing_soon ranking and store it in the cache"""
+    tournament_ids = rank_closing_soon()
+    cache.set(CLOSING_SOON_CACHE_KEY, tournament_ids, CLOSING_SOON_CACHE_TIMEOUT)
+    return tournament_ids
+
+
+def get_closing_soon_ids():
+    """Ranked tournament ids for closing_soon, computed on a cache miss"""
+    tournament_ids = cache.get(CLOSING_SOON_CACHE_KEY)
+    if tournament_ids is None:
+        tournament_ids = refresh_closing_soon()
+    return tournament_ids
+
+
+def invalidate_closing_soon():
+    # Drop the ranking once the change is visible to other connections, so a
+    # concurrent request can't re-cache the pre-commit state.
+    transaction.on_commit(lambda: cache.delete(CLOSING_SOON_CACHE_KEY))
@@ -0,0 +1,21 @@
+# lolo/tournament/redis_store.py
+import redis
+from django.conf import settings
+
+_client = None
+
+
+def get_redis():
+    """
+    Shared Redis connection for buffered counters and leaderboards.
+    Timeouts are kept short so callers can fall back to the database
+    instead of stalling a request when Redis is unavailable.
+    """
+    global _client  # noqa: PLW0603
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5
+        )
+    return _client
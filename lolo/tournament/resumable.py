@@ -0,0 +1,224 @@
+# lolo/tournament/resumable.py
+import fcntl
+import logging
+import os
+import posixpath
+import time
+import uuid
+
+from django.conf import settings
+from django.core.files import File
+
+from .redis_store import get_redis
+from .upload_handlers import VIDEO_SNIFF_SIZE, video_content_error
+
+logger = logging.getLogger(__name__)
+
+# Largest body accepted per PATCH; clients resend at most this much after a drop
+RESUMABLE_CHUNK_SIZE = 5 * 1024 * 1024
+# Idle uploads (and their state) expire after a day
+RESUMABLE_UPLOAD_TIMEOUT = 60 * 60 * 24
+# Part files this old with no Redis state left are abandoned
+RESUMABLE_ORPHAN_AGE = 60 * 60
+READ_SIZE = 64 * 1024
+
+
+class ResumableUploadError(Exception):
+    """A request the upload can't accept"""
+
+
+class OffsetConflict(ResumableUploadError):
+    """The client's offset doesn't match the stored one; it should HEAD and retry"""
+
+
+class AssembledFile(File):
+    """
+    The finished upload. Exposes its path like a TemporaryUploadedFile, so
+    FileSystemStorage moves it into place instead of copying it.
+    """
+    def temporary_file_path(self):
+        return self.file.name
+
+
+class ResumableUpload:
+    """
+    A tus-style upload: chunks are appended in place to a single partial file
+    under RESUMABLE_UPLOAD_ROOT, so the finished file needs no assembly.
+    Redis keeps the owner, declared length and committed offset.
+    """
+
+    def __init__(self, upload_id, state):
+        self.id = upload_id
+        self.user_id = int(state[b'user'])
+        self.length = int(state[b'length'])
+        self.offset = int(state[b'offset'])
+        self.filename = state[b'filename'].decode()
+
+    @staticmethod
+    def key(upload_id):
+        return f'resumable:{upload_id}'
+
+    @staticmethod
+    def path_for(upload_id):
+        return os.path.join(settings.RESUMABLE_UPLOAD_ROOT, f'{upload_id}.part')
+
+    @property
+    def path(self):
+        return self.path_for(self.id)
+
+    @property
+    def is_complete(self):
+        return self.offset == self.length
+
+    @classmethod
+    def create(cls, user, length, filename):
+        extension = posixpath.splitext(filename)[1].lstrip('.').lower()
+        if extension not in settings.ALLOWED_VIDEO_EXTENSIONS:
+            raise ResumableUploadError(
+                f"Unsupported file type. Allowed: {', '.join(settings.ALLOWED_VIDEO_EXTENSIONS)}"
+            )
+        if not 0 < length <= settings.MAX_UPLOAD_SIZE:
+            raise ResumableUploadError(
+                f"File size must be between 1 byte and {settings.MAX_UPLOAD_SIZE} bytes"
+            )
+
+        upload_id = uuid.uuid4().hex
+        state = {
+            'user': user.pk,
+            'length': length,
+            'offset': 0,
+            'filename': posixpath.basename(filename),
+        }
+        os.makedirs(settings.RESUMABLE_UPLOAD_ROOT, exist_ok=True)
+        open(cls.path_for(upload_id), 'xb').close()
+        pipe = get_redis().pipeline()
+        pipe.hset(cls.key(upload_id), mapping=state)
+        pipe.expire(cls.key(upload_id), RESUMABLE_UPLOAD_TIMEOUT)
+        pipe.execute()
+        return cls(upload_id, {key.encode(): str(value).encode() for key, value in state.items()})
+
+    @classmethod
+    def get(cls, upload_id, user):
+        """The user's upload, or None if it doesn't exist, expired or isn't theirs"""
+        state = get_redis().hgetall(cls.key(upload_id))
+        if not state or not os.path.exists(cls.path_for(upload_id)):
+            return None
+        upload = cls(upload_id, state)
+        return upload if upload.user_id == user.pk else None
+
+    def append(self, stream, offset, size):
+        """
+        Write `size` bytes from `stream` at `offset`, returning the new offset.
+        If the connection drops mid-chunk, whatever arrived is kept.
+        """
+        if size > RESUMABLE_CHUNK_SIZE:
+            raise ResumableUploadError(f"Chunks cannot exceed {RESUMABLE_CHUNK_SIZE} bytes")
+        if offset + size > self.length:
+            raise ResumableUploadError("Chunk extends past the declared upload length")
+
+        redis = get_redis()
+        with open(self.path, 'r+b') as partial:
+            # Held until the file is closed, however long the chunk takes, and
+            # released by the kernel if the process dies, so two PATCHes can't
+            # interleave
+            try:
+                fcntl.flock(partial, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise OffsetConflict("Another chunk for this upload is in progress")
+
+            self.offset = int(redis.hget(self.key(self.id), 'offset'))
+            if offset != self.offset:
+                raise OffsetConflict(f"Upload offset is {self.offset}")
+
+            written = 0
+            # Drop bytes a crashed request wrote past the committed offset
+            partial.truncate(offset)
+            partial.seek(offset)
+            try:
+                while written < size:
+                    data = stream.read(min(READ_SIZE, size - written))
+                    if not data:
+                        break
+                    partial.write(data)
+                    written += len(data)
+            finally:
+                partial.flush()
+                os.fsync(partial.fileno())
+                self.offset = offset + written
+                pipe = redis.pipeline()
+                pipe.hset(self.key(self.id), 'offset', self.offset)
+                pipe.expire(self.key(self.id), RESUMABLE_UPLOAD_TIMEOUT)
+                pipe.execute()
+        return self.offset
+
+    def check_content(self):
+        """Refuse a finished file whose bytes aren't the container its name claims"""
+        with open(self.path, 'rb') as partial:
+            head = partial.read(VIDEO_SNIFF_SIZE)
+        extension = posixpath.splitext(self.filename)[1].lstrip('.').lower()
+        error = video_content_error(head, extension)
+        if error:
+            raise ResumableUploadError(error)
+
+    def claim(self):
+        """
+        Mark the upload as being submitted. Only the first caller gets True,
+        so concurrent submits can't each save the same file.
+        """
+        pipe = get_redis().pipeline()
+        pipe.hsetnx(self.key(self.id), 'submitted', 1)
+        pipe.expire(self.key(self.id), RESUMABLE_UPLOAD_TIMEOUT)
+        claimed, _ = pipe.execute()
+        return bool(claimed)
+
+    def release(self):
+        """Undo claim() after a submit that didn't go through"""
+        get_redis().hdel(self.key(self.id), 'submitted')
+
+    def open(self):
+        """The finished file, ready to assign to a FileField"""
+        if not self.is_complete:
+            raise ResumableUploadError("Upload is not complete")
+        return AssembledFile(open(self.path, 'rb'), name=self.filename)
+
+    def delete(self):
+        get_redis().delete(self.key(self.id))
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def remove_orphaned_parts():
+    """
+    Delete part files whose Redis state has expired: uploads abandoned for
+    longer than RESUMABLE_UPLOAD_TIMEOUT. Recent files are left alone, as
+    create() writes the file just before its state. Returns the number removed.
+    """
+    try:
+        entries = list(os.scandir(settings.RESUMABLE_UPLOAD_ROOT))
+    except FileNotFoundError:
+        return 0
+    cutoff = time.time() - RESUMABLE_ORPHAN_AGE
+    parts = [
+        entry for entry in entries
+        if entry.name.endswith('.part') and entry.stat().st_mtime < cutoff
+    ]
+    if not parts:
+        return 0
+
+    pipe = get_redis().pipeline(transaction=False)
+    for entry in parts:
+        pipe.exists(ResumableUpload.key(entry.name[:-len('.part')]))
+    removed = 0
+    for entry, exists in zip(parts, pipe.execute()):
+        if exists:
+            continue
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            continue
+        removed += 1
+    if removed:
+        logger.info("Removed %s abandoned resumable upload parts", removed)
+    return removed
@@ -0,0 +1,79 @@
+# lolo/tournament/search.py
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import F, Q
+from rest_framework import filters
+
+from .models import Tournament, VideoSubmission
+
+SEARCH_CONFIG = 'english'
+
+# Columns folded into each model's search_vector, with their rank weight
+SEARCH_DOCUMENTS = {
+    Tournament: (('title', 'A'), ('description', 'B')),
+    VideoSubmission: (('title', 'A'), ('description', 'B')),
+}
+
+
+def search_vector(model):
+    document = SEARCH_DOCUMENTS[model]
+    vectors = [
+        SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        for field, weight in document
+    ]
+    combined = vectors[0]
+    for vector in vectors[1:]:
+        combined = combined + vector
+    return combined
+
+
+def update_search_vectors(model, pks):
+    """Recompute the stored search_vector of the given rows in one UPDATE"""
+    return model.objects.filter(pk__in=pks).update(search_vector=search_vector(model))
+
+
+def search_query(term):
+    # websearch syntax accepts free text, "quoted phrases" and -exclusions
+    return SearchQuery(term, search_type='websearch', config=SEARCH_CONFIG)
+
+
+def search_participations(queryset, term):
+    """
+    Filter participations by video title/description or entrant username.
+
+    Each branch is resolved by its own index (GIN on the video search_vector,
+    trigram GIN on the username) and results carry a `search_rank`.
+    """
+    query = search_query(term)
+    videos = VideoSubmission.objects.filter(search_vector=query).values('pk')
+    users = get_user_model().objects.filter(username__icontains=term).values('pk')
+    return queryset.filter(
+        Q(video_submission__in=videos) | Q(user__in=users)
+    ).annotate(
+        search_rank=SearchRank(F('video_submission__search_vector'), query)
+    )
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    Drop-in replacement for SearchFilter on models with a stored search_vector.
+
+    Matches the `search` parameter against the vector and orders by relevance
+    unless the queryset already carries an explicit ordering (e.g. sort_by).
+    Detail routes are left alone so actions like participants can use the
+    same parameter for their own search without 404ing in get_object().
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, '').strip()
+        if not term or getattr(view, 'detail', False):
+            return queryset
+
+        query = search_query(term)
+        explicit_ordering = queryset.query.order_by
+        queryset = queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F('search_vector'), query)
+        )
+        if explicit_ordering:
+            return queryset
+        return queryset.order_by('-search_rank', 'pk')
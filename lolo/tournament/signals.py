@@ -0,0 +1,119 @@
+# lolo/tournament/signals.py
+from celery import chain
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .groups import invalidate_group_summary
+from .images import queue_derivatives
+from .leaderboard import Leaderboard
+from .models import Participation, Sponsor, Tournament, VideoSubmission, Vote
+from .public_cache import bump_public_version
+from .rankings import invalidate_closing_soon
+from .search import SEARCH_DOCUMENTS, update_search_vectors
+from .tasks import probe_video_metadata, transcode_video
+
+
+@receiver(post_delete, sender=Participation)
+def decrement_participant_count(sender, instance, **kwargs):
+    Tournament.objects.filter(pk=instance.tournament_id).update(
+        participant_count=Greatest(F('participant_count') - 1, 0)
+    )
+
+
+@receiver(post_delete, sender=Vote)
+def decrement_vote_count(sender, instance, **kwargs):
+    Tournament.objects.filter(pk=instance.tournament_id).update(
+        vote_count=Greatest(F('vote_count') - 1, 0)
+    )
+
+
+@receiver(post_save, sender=Tournament)
+@receiver(post_delete, sender=Tournament)
+@receiver(post_save, sender=Participation)
+@receiver(post_delete, sender=Participation)
+def invalidate_rankings(sender, instance, **kwargs):
+    invalidate_closing_soon()
+
+
+@receiver(post_delete, sender=Participation)
+@receiver(post_delete, sender=Vote)
+def invalidate_leaderboard(sender, instance, **kwargs):
+    # Deletions are rare admin actions; a rebuild is simpler than patching scores
+    Leaderboard(instance.tournament_id).on_commit_invalidate()
+
+
+@receiver(post_save, sender=Tournament)
+@receiver(post_save, sender=VideoSubmission)
+def refresh_search_vector(sender, instance, created, update_fields=None, **kwargs):
+    # Counter and view saves pass update_fields and leave the text untouched
+    searchable = {field for field, _ in SEARCH_DOCUMENTS[sender]}
+    if created or update_fields is None or searchable & set(update_fields):
+        update_search_vectors(sender, [instance.pk])
+
+
+@receiver(post_save, sender=Tournament)
+@receiver(post_delete, sender=Tournament)
+@receiver(post_save, sender=Participation)
+@receiver(post_delete, sender=Participation)
+@receiver(post_save, sender=Sponsor)
+@receiver(post_delete, sender=Sponsor)
+def invalidate_public_cache(sender, instance, **kwargs):
+    bump_public_version()
+
+
+@receiver(post_save, sender=Tournament)
+@receiver(post_delete, sender=Tournament)
+def invalidate_parent_groups(sender, instance, **kwargs):
+    # Covers groups being created, edited or removed
+    if instance.parent_tournament_id:
+        invalidate_group_summary(instance.parent_tournament_id)
+
+
+@receiver(post_delete, sender=Participation)
+def invalidate_groups_on_leave(sender, instance, **kwargs):
+    # A freed seat can turn a full group open again
+    parent_id = Tournament.objects.filter(
+        pk=instance.tournament_id
+    ).values_list('parent_tournament_id', flat=True).first()
+    if parent_id:
+        invalidate_group_summary(parent_id)
+
+
+@receiver(post_save, sender=VideoSubmission)
+def queue_media_pipeline(sender, instance, created, update_fields=None, **kwargs):
+    # Probe first: the transcoder sizes its renditions from the metadata
+    if created or (update_fields and 'video_file' in update_fields):
+        pipeline = chain(probe_video_metadata.si(instance.pk), transcode_video.si(instance.pk))
+        transaction.on_commit(pipeline.delay)
+
+
+IMAGE_FIELDS = {
+    Tournament: 'image',
+    VideoSubmission: 'cover_image',
+    Sponsor: 'logo',
+    get_user_model(): 'avatar',
+}
+
+
+@receiver(pre_save, sender=Tournament)
+@receiver(pre_save, sender=VideoSubmission)
+@receiver(pre_save, sender=Sponsor)
+@receiver(pre_save, sender=get_user_model())
+def flag_new_image(sender, instance, **kwargs):
+    # The file is still uncommitted here; after save it has its final name
+    image = getattr(instance, IMAGE_FIELDS[sender])
+    instance._new_image = bool(image) and not image._committed
+
+
+@receiver(post_save, sender=Tournament)
+@receiver(post_save, sender=VideoSubmission)
+@receiver(post_save, sender=Sponsor)
+@receiver(post_save, sender=get_user_model())
+def queue_image_derivatives(sender, instance, **kwargs):
+    if getattr(instance, '_new_image', False):
+        instance._new_image = False
+        queue_derivatives(getattr(instance, IMAGE_FIELDS[sender]).name)
@@ -0,0 +1,250 @@
+# lolo/tournament/streaming.py
+import mimetypes
+import os
+import posixpath
+import uuid
+
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+# Storage prefixes served by the streaming view
+VIDEO_STREAM_PREFIXES = ('tournament_videos/', 'video_renditions/')
+VIDEO_CACHE_MAX_AGE = 60 * 60 * 24
+# More ranges than this (after merging) are answered with the whole file
+MAX_RANGES = 16
+PROXY_CHUNK_SIZE = 64 * 1024
+FILE_BLOCK_SIZE = 64 * 1024
+CONTENT_TYPES = {
+    '.m3u8': 'application/vnd.apple.mpegurl',
+    '.ts': 'video/mp2t',
+    '.mov': 'video/quicktime',
+}
+
+
+class RangeNotSatisfiable(Exception):
+    """No requested range overlaps the file"""
+
+
+def parse_range_header(header, size):
+    """
+    Sorted, merged, inclusive (start, end) byte ranges from a Range header,
+    or None when the header should be ignored (absent, malformed, not bytes,
+    or too many ranges). Raises RangeNotSatisfiable if nothing overlaps.
+    """
+    if not header:
+        return None
+    unit, _, specs = header.partition('=')
+    if unit.strip().lower() != 'bytes':
+        return None
+    ranges = []
+    for spec in specs.split(','):
+        first, dash, last = spec.strip().partition('-')
+        if not dash:
+            return None
+        try:
+            if not first:
+                # Suffix range: the final `last` bytes
+                length = int(last)
+                if length <= 0:
+                    continue
+                start, end = max(size - length, 0), size - 1
+            else:
+                start = int(first)
+                end = int(last) if last else size - 1
+                if last and end < start:
+                    return None
+                end = min(end, size - 1)
+        except ValueError:
+            return None
+        if start < size:
+            ranges.append((start, end))
+    if not ranges:
+        raise RangeNotSatisfiable()
+
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged if len(merged) <= MAX_RANGES else None
+
+
+class RangeFile:
+    """
+    A file limited to `length` bytes from its current position. Keeps
+    fileno() so WSGI servers with sendfile can send it zero-copy; they
+    stop at the response's Content-Length.
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.name = file.name
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+class FileSource:
+    """Stored video on the local filesystem"""
+
+    def __init__(self, storage, name):
+        self.path = storage.path(name)
+        stat = os.stat(self.path)
+        self.size = stat.st_size
+        self.last_modified = int(stat.st_mtime)
+        self.etag = f'{stat.st_mtime_ns:x}-{stat.st_size:x}'
+
+    def open(self, start, length):
+        file = open(self.path, 'rb')
+        file.seek(start)
+        return RangeFile(file, length)
+
+    def iter_range(self, start, end):
+        with open(self.path, 'rb') as file:
+            file.seek(start)
+            remaining = end - start + 1
+            while remaining:
+                data = file.read(min(FILE_BLOCK_SIZE, remaining))
+                if not data:
+                    return
+                remaining -= len(data)
+                yield data
+
+
+class S3Source:
+    """Stored video in S3, read with ranged GETs"""
+
+    def __init__(self, storage, name):
+        self.client = storage.connection.meta.client
+        self.bucket = storage.bucket_name
+        self.key = posixpath.join(storage.location, name) if storage.location else name
+        head = self.client.head_object(Bucket=self.bucket, Key=self.key)
+        self.size = head['ContentLength']
+        self.last_modified = int(head['LastModified'].timestamp())
+        self.etag = head['ETag'].strip('"')
+
+    def iter_range(self, start, end):
+        body = self.client.get_object(Bucket=self.bucket, Key=self.key, Range=f'bytes={start}-{end}')['Body']
+        try:
+            yield from body.iter_chunks(PROXY_CHUNK_SIZE)
+        finally:
+            body.close()
+
+
+def open_source(name, storage=default_storage):
+    """FileSource or S3Source for a stored name; FileNotFoundError if it's missing"""
+    if hasattr(storage, 'bucket_name'):
+        from botocore.exceptions import ClientError
+
+        try:
+            return S3Source(storage, name)
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey'):
+                raise FileNotFoundError(name)
+            raise
+    return FileSource(storage, name)
+
+
+def content_type_for(name):
+    extension = posixpath.splitext(name)[1].lower()
+    return CONTENT_TYPES.get(extension) or mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+
+def _if_range_matches(request, source):
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        # Only a strong validator may resume a partial download
+        return if_range == quote_etag(source.etag)
+    modified = parse_http_date_safe(if_range)
+    return modified is not None and modified >= source.last_modified
+
+
+def _multipart(source, ranges, content_type, boundary):
+    for start, end in ranges:
+        yield (
+            f'\r\n--{boundary}\r\n'
+            f'Content-Type: {content_type}\r\n'
+            f'Content-Range: bytes {start}-{end}/{source.size}\r\n\r\n'
+        ).encode()
+        yield from source.iter_range(start, end)
+    yield f'\r\n--{boundary}--\r\n'.encode()
+
+
+def range_response(request, name, storage=default_storage):
+    """
+    Serve a stored video honouring Range (single and multi-range), If-Range
+    and the ETag/Last-Modified validators. Filesystem files are handed to the
+    server as file objects for sendfile; S3 objects are proxied range by range.
+    """
+    source = open_source(name, storage)
+    etag = quote_etag(source.etag)
+    content_type = content_type_for(name)
+
+    response = get_conditional_response(request, etag=etag, last_modified=source.last_modified)
+    if response is not None:
+        response.headers['Accept-Ranges'] = 'bytes'
+        return response
+
+    ranges = None
+    if source.size and _if_range_matches(request, source):
+        try:
+            ranges = parse_range_header(request.headers.get('Range'), source.size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response.headers['Content-Range'] = f'bytes */{source.size}'
+            response.headers['Accept-Ranges'] = 'bytes'
+            return response
+
+    if ranges is None:
+        ranges = [(0, source.size - 1)] if source.size else []
+        status, partial = 200, False
+    else:
+        status, partial = 206, True
+
+    head = request.method == 'HEAD'
+    if len(ranges) > 1:
+        boundary = uuid.uuid4().hex
+        part_headers = sum(
+            len(f'\r\n--{boundary}\r\nContent-Type: {content_type}\r\n'
+                f'Content-Range: bytes {start}-{end}/{source.size}\r\n\r\n') + end - start + 1
+            for start, end in ranges
+        )
+        length = part_headers + len(f'\r\n--{boundary}--\r\n')
+        body = () if head else _multipart(source, ranges, content_type, boundary)
+        response = StreamingHttpResponse(
+            body, status=status, content_type=f'multipart/byteranges; boundary={boundary}'
+        )
+    else:
+        start, end = ranges[0] if ranges else (0, -1)
+        length = end - start + 1
+        if head or not length:
+            response = HttpResponse(status=status, content_type=content_type)
+        elif isinstance(source, FileSource):
+            response = FileResponse(source.open(start, length), status=status, content_type=content_type)
+        else:
+            response = StreamingHttpResponse(source.iter_range(start, end), status=status, content_type=content_type)
+        if partial:
+            response.headers['Content-Range'] = f'bytes {start}-{end}/{source.size}'
+
+    response.headers['Content-Length'] = str(length)
+    response.headers['Accept-Ranges'] = 'bytes'
+    response.headers['ETag'] = etag
+    response.headers['Last-Modified'] = http_date(source.last_modified)
+    patch_cache_control(response, public=True, max_age=VIDEO_CACHE_MAX_AGE)
+    return response
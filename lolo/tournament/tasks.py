@@ -0,0 +1,58 @@
+from celery import shared_task
+
+from .images import generate_derivatives
+from .media_probe import extract_video_metadata
+from .public_cache import bump_public_version
+from .rankings import refresh_closing_soon
+from .resumable import remove_orphaned_parts
+from .transcoding import acquire_slot, release_slot, run_pipeline
+from .view_counters import flush_all_views
+
+
+@shared_task()
+def refresh_closing_soon_ranking():
+    """Recompute the cached closing_soon ranking."""
+    return refresh_closing_soon()
+
+
+@shared_task()
+def flush_view_counters():
+    """Write buffered tournament and video views to the database."""
+    return flush_all_views()
+
+
+@shared_task()
+def clean_resumable_uploads():
+    """Delete the part files of resumable uploads that expired unfinished."""
+    return remove_orphaned_parts()
+
+
+@shared_task()
+def probe_video_metadata(video_id):
+    """Fill in duration, resolution and codec from the video's container headers."""
+    metadata = extract_video_metadata(video_id)
+    return metadata is not None
+
+
+@shared_task(bind=True, acks_late=True, max_retries=None, soft_time_limit=45 * 60, time_limit=50 * 60)
+def transcode_video(self, video_id):
+    """Produce HLS/MP4 renditions (and a cover if needed). Routed to the media queue."""
+    slot = acquire_slot()
+    if slot is None:
+        # Every transcode slot is busy; wait without holding a worker
+        raise self.retry(countdown=30)
+    try:
+        job = run_pipeline(video_id)
+    finally:
+        release_slot(slot)
+    return job.status if job else None
+
+
+@shared_task(acks_late=True)
+def generate_image_derivatives(name):
+    """Resize an uploaded image into WebP/JPEG variants and compute its blurhash."""
+    record = generate_derivatives(name)
+    if record is not None:
+        # Public payloads embed the variant URLs
+        bump_public_version()
+    return record is not None
@@ -0,0 +1,96 @@
+# lolo/tournament/test_api/test_counters.py
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from lolo.users.tests.factories import UserFactory
+from ..models import Category, Participation, Tournament, VideoSubmission, Vote
+
+
+@pytest.fixture
+def tournament():
+    now = timezone.now()
+    return Tournament.objects.create(
+        title='Counter Tournament',
+        description='Counters',
+        category=Category.objects.create(name='Counters'),
+        start_time=now - timezone.timedelta(days=1),
+        end_time=now + timezone.timedelta(days=1)
+    )
+
+
+def enter(tournament, user=None):
+    user = user or UserFactory()
+    participation = Participation.objects.create(
+        user=user,
+        tournament=tournament,
+        video_submission=VideoSubmission.objects.create(title='Entry', user=user)
+    )
+    return participation
+
+
+@pytest.mark.django_db
+class TestTournamentCounters:
+    def test_vote_increments_vote_count(self, tournament):
+        voter_entry = enter(tournament)
+        target = enter(tournament)
+        Tournament.objects.recount()
+        client = APIClient()
+        client.force_authenticate(user=voter_entry.user)
+
+        response = client.post(
+            reverse('api:tournament-vote', kwargs={'pk': tournament.pk}),
+            {'participation_id': target.id}
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        tournament.refresh_from_db()
+        assert tournament.participant_count == 2
+        assert tournament.vote_count == 1
+
+    def test_deletes_decrement_counters(self, tournament):
+        voter_entry = enter(tournament)
+        target = enter(tournament)
+        Vote.objects.create(voter=voter_entry.user, participation=target, tournament=tournament)
+        Tournament.objects.recount()
+
+        # Deleting the participation cascades to the vote it received
+        target.delete()
+
+        tournament.refresh_from_db()
+        assert tournament.participant_count == 1
+        assert tournament.vote_count == 0
+
+    def test_recount_command_repairs_drift(self, tournament):
+        enter(tournament)
+        enter(tournament)
+        Tournament.objects.filter(pk=tournament.pk).update(participant_count=7, vote_count=3)
+
+        call_command('recount_tournaments', batch_size=1)
+
+        tournament.refresh_from_db()
+        assert tournament.participant_count == 2
+        assert tournament.vote_count == 0
+
+    def test_filters_and_sorts_use_counter_columns(self, tournament, user):
+        busy = Tournament.objects.create(
+            title='Busy',
+            description='Busy',
+            category=tournament.category,
+            start_time=tournament.start_time,
+            end_time=tournament.end_time,
+            participant_count=5,
+            vote_count=9
+        )
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse('api:tournament-list')
+
+        response = client.get(url, {'sort_by': 'most_votes'})
+        assert [row['id'] for row in response.data['results']] == [busy.id, tournament.id]
+
+        response = client.get(url, {'min_participants': 3})
+        assert [row['id'] for row in response.data['results']] == [busy.id]
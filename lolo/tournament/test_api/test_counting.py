@@ -0,0 +1,71 @@
+# lolo/tournament/test_api/test_counting.py
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from ..api.counting import CountingPaginator, count_cache_key
+from ..models import Category, Tournament
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def tournaments():
+    category = Category.objects.create(name='Counting')
+    now = timezone.now()
+    return [
+        Tournament.objects.create(
+            title=f'Counted {index}',
+            description='Counted',
+            category=category,
+            start_time=now - timezone.timedelta(days=1),
+            end_time=now + timezone.timedelta(days=1)
+        )
+        for index in range(5)
+    ]
+
+
+@pytest.mark.django_db
+class TestCountingPagination:
+    def test_small_sets_are_counted_exactly(self, tournaments, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response = client.get(reverse('api:tournament-list'))
+
+        assert response.data['total_items'] == 5
+        assert response.data['total_items_approximate'] is False
+
+    def test_large_sets_use_cached_count(self, tournaments, user, monkeypatch):
+        monkeypatch.setattr(CountingPaginator, 'exact_count_limit', 2)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse('api:tournament-list')
+
+        first = client.get(url, {'page_size': 2})
+        with CaptureQueriesContext(connection) as queries:
+            second = client.get(url, {'page_size': 2})
+
+        assert first.data['total_items_approximate'] is True
+        assert second.data['total_items'] == first.data['total_items'] >= 3
+        # Only the bounded probe counts; the full count came from the cache
+        counts = [query['sql'] for query in queries.captured_queries if 'COUNT(' in query['sql']]
+        assert len(counts) == 1
+        assert 'LIMIT 3' in counts[0]
+
+    def test_pages_past_the_estimate_stay_reachable(self, tournaments):
+        paginator = CountingPaginator(Tournament.objects.order_by('id'), 2)
+        paginator.exact_count_limit = 2
+        cache.set(count_cache_key(Tournament.objects.order_by()), 3)
+
+        page = paginator.page(3)
+
+        assert paginator.approximate
+        assert [tournament.id for tournament in page] == [tournaments[4].id]
@@ -0,0 +1,176 @@
+# lolo/tournament/test_api/test_direct_uploads.py
+import json
+
+import pytest
+import requests
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from lolo.users.tests.factories import UserFactory
+from ..models import Category, Participation, Tournament, VideoSubmission
+from .test_groups import upload
+from .test_media_probe import mp4
+
+VIDEO = mp4(media_size=1024)
+
+
+@pytest.fixture(autouse=True)
+def _media(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    cache.clear()
+
+
+@pytest.fixture
+def s3_storage(settings, monkeypatch):
+    for name in ('AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY'):
+        monkeypatch.setenv(name, 'testing')
+    # Django 5.0's override_settings drops STORAGES options, so configure via AWS_*
+    settings.AWS_STORAGE_BUCKET_NAME = 'lolo-test'
+    settings.AWS_LOCATION = 'media'
+    settings.AWS_S3_REGION_NAME = 'us-east-1'
+    settings.STORAGES = {
+        **settings.STORAGES,
+        'default': {'BACKEND': 'storages.backends.s3.S3Storage'},
+    }
+
+
+@pytest.fixture
+def bucket(s3_storage):
+    moto = pytest.importorskip('moto')
+    with moto.mock_aws():
+        default_storage.connection.meta.client.create_bucket(Bucket='lolo-test')
+        yield
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def push(client, content=VIDEO, filename='clip.mp4'):
+    """Start an upload and PUT its parts the way a mobile client would"""
+    started = client.post(
+        reverse('api:videosubmission-upload-start'),
+        {'filename': filename, 'size': len(content)},
+        format='json'
+    )
+    assert started.status_code == status.HTTP_201_CREATED
+    parts = []
+    for part in started.data['parts']:
+        offset = (part['part_number'] - 1) * started.data['part_size']
+        response = requests.put(part['url'], data=content[offset:offset + started.data['part_size']])
+        parts.append({'part_number': part['part_number'], 'etag': response.headers['ETag']})
+    return started.data['upload'], parts
+
+
+def finish_fields(token, parts, name='direct'):
+    fields = upload(name)
+    del fields['video_file']
+    return {**fields, 'upload': token, 'parts': json.dumps(parts)}
+
+
+@pytest.mark.django_db
+class TestDirectUploads:
+    def test_unavailable_without_object_storage(self, user):
+        response = client_for(user).post(
+            reverse('api:videosubmission-upload-start'),
+            {'filename': 'clip.mp4', 'size': 10},
+            format='json'
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_rejects_unsupported_files_up_front(self, s3_storage, user):
+        response = client_for(user).post(
+            reverse('api:videosubmission-upload-start'),
+            {'filename': 'clip.exe', 'size': 10},
+            format='json'
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_completed_upload_becomes_submission(self, bucket, user):
+        client = client_for(user)
+        token, parts = push(client)
+
+        response = client.post(
+            reverse('api:videosubmission-upload-complete'),
+            finish_fields(token, parts),
+            format='multipart'
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        video = VideoSubmission.objects.get(pk=response.data['id'])
+        assert video.user == user
+        assert video.video_file.name.startswith('tournament_videos/')
+        assert video.video_file.size == len(VIDEO)
+
+    def test_token_completes_one_upload(self, bucket, user):
+        client = client_for(user)
+        token, parts = push(client)
+        url = reverse('api:videosubmission-upload-complete')
+
+        first = client.post(url, finish_fields(token, parts), format='multipart')
+        replay = client.post(url, finish_fields(token, parts, name='again'), format='multipart')
+
+        assert first.status_code == status.HTTP_201_CREATED
+        assert replay.status_code == status.HTTP_400_BAD_REQUEST
+        assert VideoSubmission.objects.count() == 1
+
+    def test_renamed_binary_is_discarded(self, bucket, user):
+        client = client_for(user)
+        token, parts = push(client, content=b'MZ\x90\x00' + bytes(2048))
+
+        response = client.post(
+            reverse('api:videosubmission-upload-complete'),
+            finish_fields(token, parts),
+            format='multipart'
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not VideoSubmission.objects.exists()
+        assert not default_storage.listdir('tournament_videos')[1]
+
+    def test_token_is_bound_to_its_uploader(self, bucket, user):
+        token, parts = push(client_for(user))
+
+        response = client_for(UserFactory()).post(
+            reverse('api:videosubmission-upload-complete'),
+            finish_fields(token, parts),
+            format='multipart'
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not VideoSubmission.objects.exists()
+
+    def test_entry_from_uploaded_video(self, bucket):
+        now = timezone.now()
+        tournament = Tournament.objects.create(
+            title='Direct',
+            description='Direct',
+            category=Category.objects.create(name='Direct'),
+            start_time=now - timezone.timedelta(days=1),
+            end_time=now + timezone.timedelta(days=1),
+            entry_fee=1
+        )
+        entrant = UserFactory(tickets=1)
+        client = client_for(entrant)
+        token, parts = push(client)
+
+        response = client.post(
+            reverse('api:tournament-enter-with-upload', kwargs={'pk': tournament.pk}),
+            finish_fields(token, parts),
+            format='multipart'
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        participation = Participation.objects.get(user=entrant)
+        assert participation.tournament == tournament
+        assert participation.video_submission.video_file.name.startswith('tournament_videos/')
+        entrant.refresh_from_db()
+        assert entrant.tickets == 0
@@ -0,0 +1,108 @@
+# lolo/tournament/test_api/test_entries.py
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from lolo.tickets.models import TicketTransaction
+from lolo.users.tests.factories import UserFactory
+from ..models import Category, Participation, Tournament, VideoSubmission
+from .test_groups import upload
+
+
+@pytest.fixture(autouse=True)
+def _media(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    cache.clear()
+
+
+@pytest.fixture
+def tournament():
+    now = timezone.now()
+    return Tournament.objects.create(
+        title='Entry',
+        description='Entry',
+        category=Category.objects.create(name='Entries'),
+        start_time=now - timezone.timedelta(days=1),
+        end_time=now + timezone.timedelta(days=1),
+        entry_fee=2,
+        participant_limit=1
+    )
+
+
+def enter(user, tournament, name='entry'):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client.post(
+        reverse('api:tournament-enter-tournament', kwargs={'pk': tournament.pk}),
+        upload(name),
+        format='multipart'
+    )
+
+
+@pytest.mark.django_db
+class TestEntries:
+    def test_entry_charges_and_records_ledger_row(self, tournament):
+        entrant = UserFactory(tickets=5)
+
+        response = enter(entrant, tournament)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        entrant.refresh_from_db()
+        tournament.refresh_from_db()
+        assert entrant.tickets == 3
+        assert tournament.participant_count == 1
+        spend = TicketTransaction.objects.get(user=entrant)
+        assert spend.transaction_type == 'use'
+        assert spend.number_of_tickets == -2
+        assert spend.balance_after == 3
+
+    def test_full_tournament_leaves_nothing_behind(self, tournament):
+        enter(UserFactory(tickets=5), tournament)
+        late = UserFactory(tickets=5)
+
+        response = enter(late, tournament, 'late')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['error'] == 'Tournament has reached maximum participants'
+        late.refresh_from_db()
+        assert late.tickets == 5
+        assert not TicketTransaction.objects.filter(user=late).exists()
+        assert not VideoSubmission.objects.filter(user=late).exists()
+
+    def test_stale_balance_is_rechecked_in_the_update(self, tournament):
+        entrant = UserFactory(tickets=5)
+        client = APIClient()
+        client.force_authenticate(user=entrant)
+        # Spent elsewhere after the request loaded the user
+        type(entrant).objects.filter(pk=entrant.pk).update(tickets=1)
+
+        response = client.post(
+            reverse('api:tournament-enter-tournament', kwargs={'pk': tournament.pk}),
+            upload(),
+            format='multipart'
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        entrant.refresh_from_db()
+        tournament.refresh_from_db()
+        assert entrant.tickets == 1
+        assert tournament.participant_count == 0
+
+    def test_duplicate_entry_is_refused(self, tournament):
+        tournament.participant_limit = None
+        tournament.save()
+        entrant = UserFactory(tickets=5)
+        enter(entrant, tournament)
+
+        response = enter(entrant, tournament, 'again')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['error'] == 'You have already entered this tournament'
+        entrant.refresh_from_db()
+        tournament.refresh_from_db()
+        assert entrant.tickets == 3
+        assert tournament.participant_count == 1
+        assert Participation.objects.filter(user=entrant).count() == 1
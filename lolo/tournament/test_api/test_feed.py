@@ -0,0 +1,112 @@
+# lolo/tournament/test_api/test_feed.py
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from lolo.users.tests.factories import UserFactory
+from ..models import Category, Participation, Tournament, VideoSubmission
+
+
+@pytest.fixture
+def api_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def category():
+    return Category.objects.create(name='Comedy')
+
+
+def make_tournaments(category, count, participants=4):
+    now = timezone.now()
+    tournaments = []
+    for index in range(count):
+        tournament = Tournament.objects.create(
+            title=f'Tournament {index}',
+            description='Feed tournament',
+            category=category,
+            start_time=now - timezone.timedelta(days=1),
+            end_time=now + timezone.timedelta(days=1),
+            participant_limit=10
+        )
+        for _ in range(participants):
+            entrant = UserFactory()
+            Participation.objects.create(
+                user=entrant,
+                tournament=tournament,
+                video_submission=VideoSubmission.objects.create(title='Entry', user=entrant)
+            )
+        tournaments.append(tournament)
+    Tournament.objects.recount()
+    return tournaments
+
+
+@pytest.mark.django_db
+class TestTournamentFeed:
+    def test_list_returns_top_three_participants(self, api_client, category):
+        make_tournaments(category, 2)
+
+        response = api_client.get(reverse('api:tournament-list'))
+
+        assert response.status_code == status.HTTP_200_OK
+        for tournament_data in response.data['results']:
+            assert tournament_data['participant_count'] == 4
+            assert len(tournament_data['participants']) == 3
+            assert tournament_data['category_name'] == 'Comedy'
+
+    def test_list_query_count_is_independent_of_page_size(
+        self, api_client, category, django_assert_max_num_queries
+    ):
+        make_tournaments(category, 2)
+        with django_assert_max_num_queries(10) as small_page:
+            api_client.get(reverse('api:tournament-list'))
+
+        make_tournaments(category, 8)
+        with django_assert_max_num_queries(len(small_page.captured_queries)):
+            response = api_client.get(reverse('api:tournament-list'), {'page_size': 10})
+
+        assert len(response.data['results']) == 10
+
+    def test_category_view_orders_participants_by_votes(self, api_client, category):
+        tournament = make_tournaments(category, 1)[0]
+        leader = tournament.participations.order_by('id').last()
+        Participation.objects.filter(pk=leader.pk).update(votes_received=5)
+
+        response = api_client.get(
+            reverse('api:tournament-category-view'),
+            {'category': category.id}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        participants = response.data['results'][0]['participants']
+        assert participants[0]['id'] == leader.id
+
+    def test_repeating_parent_group_info(self, api_client, category):
+        parent = make_tournaments(category, 1, participants=0)[0]
+        Tournament.objects.filter(pk=parent.pk).update(is_repeating=True, end_time=None)
+        parent.refresh_from_db()
+        group = parent.create_new_group()
+        entrant = UserFactory()
+        Participation.objects.create(
+            user=entrant,
+            tournament=group,
+            video_submission=VideoSubmission.objects.create(title='Entry', user=entrant)
+        )
+        Tournament.objects.recount()
+
+        response = api_client.get(reverse('api:tournament-list'))
+
+        results = {row['id']: row for row in response.data['results']}
+        children = results[parent.id]['group_info']['child_tournaments']
+        assert children == [{
+            'id': group.id,
+            'title': group.title,
+            'group': 'A',
+            'participants': 1,
+            'is_full': False,
+        }]
+        assert results[group.id]['group_info']['parent_id'] == parent.id
@@ -0,0 +1,162 @@
+# lolo/tournament/test_api/test_groups.py
+from io import BytesIO
+
+import pytest
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from lolo.users.tests.factories import UserFactory
+from ..groups import ensure_open_groups, reserve_seat, summarize_groups
+from ..models import Category, Tournament, group_label
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def category():
+    return Category.objects.create(name='Groups')
+
+
+def make_parent(category, title='Family', limit=2):
+    return Tournament.objects.create(
+        title=title,
+        description=title,
+        category=category,
+        start_time=timezone.now() - timezone.timedelta(days=1),
+        participant_limit=limit,
+        is_repeating=True
+    )
+
+
+@pytest.mark.django_db
+class TestGroupSummaries:
+    def test_page_of_parents_resolves_in_one_query(self, category, django_capture_on_commit_callbacks):
+        parents = [make_parent(category, f'Family {index}') for index in range(3)]
+        with django_capture_on_commit_callbacks(execute=True):
+            for parent in parents:
+                parent.create_new_group()
+                parent.create_new_group()
+        Tournament.objects.filter(group_name='A').update(participant_count=2)
+
+        with CaptureQueriesContext(connection) as queries:
+            summaries = summarize_groups([parent.id for parent in parents])
+        with CaptureQueriesContext(connection) as cached:
+            summarize_groups([parent.id for parent in parents])
+
+        assert len(queries) == 1
+        assert len(cached) == 0
+        assert [group['group'] for group in summaries[parents[0].id]] == ['A', 'B']
+        assert [group['is_full'] for group in summaries[parents[0].id]] == [True, False]
+
+    def test_new_group_invalidates_summary(self, category, django_capture_on_commit_callbacks):
+        parent = make_parent(category)
+        with django_capture_on_commit_callbacks(execute=True):
+            parent.create_new_group()
+        assert len(summarize_groups([parent.id])[parent.id]) == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            parent.create_new_group()
+
+        assert len(summarize_groups([parent.id])[parent.id]) == 2
+
+    def test_detail_uses_summary(self, category, user):
+        parent = make_parent(category)
+        group = parent.create_new_group()
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response = client.get(reverse('api:tournament-detail', kwargs={'pk': parent.pk}))
+
+        assert response.data['group_info']['child_tournaments'] == [{
+            'id': group.id,
+            'title': group.title,
+            'group': 'A',
+            'participants': 0,
+            'is_full': False,
+        }]
+
+
+def upload(name='entry'):
+    image = BytesIO()
+    Image.new('RGB', (2, 2)).save(image, 'PNG')
+    return {
+        'title': name,
+        'video_file': SimpleUploadedFile(f'{name}.mp4', b'\x00\x00\x00\x18ftypmp42', 'video/mp4'),
+        'cover_image': SimpleUploadedFile(f'{name}.png', image.getvalue(), 'image/png'),
+    }
+
+
+@pytest.mark.django_db
+class TestGroupAllocation:
+    def test_labels_continue_past_z(self):
+        assert [group_label(index) for index in (0, 25, 26, 27, 51, 52, 701, 702)] == [
+            'A', 'Z', 'AA', 'AB', 'AZ', 'BA', 'ZZ', 'AAA'
+        ]
+
+    def test_full_group_routes_to_open_group(self, category):
+        parent = make_parent(category, limit=2)
+        Tournament.objects.filter(pk=parent.pk).update(participant_count=2)
+        parent.refresh_from_db()
+
+        group = reserve_seat(parent, UserFactory())
+
+        assert group.parent_tournament_id == parent.id
+        assert group.group_name == 'A'
+        group.refresh_from_db()
+        assert group.participant_count == 1
+
+    def test_parent_locked_before_group_seat(self, category):
+        parent = make_parent(category, limit=5)
+        group = parent.create_new_group()
+        user = UserFactory()
+
+        with CaptureQueriesContext(connection) as queries:
+            assert reserve_seat(group, user) == group
+
+        sql = [query['sql'] for query in queries.captured_queries]
+        lock = next(i for i, q in enumerate(sql) if 'FOR UPDATE' in q)
+        seat = next(i for i, q in enumerate(sql) if q.startswith('UPDATE'))
+        assert f'"id" = {parent.pk}' in sql[lock]
+        assert lock < seat
+
+    def test_next_group_is_provisioned_ahead(self, category):
+        parent = make_parent(category, limit=5)
+        Tournament.objects.filter(pk=parent.pk).update(participant_count=3)
+        parent.refresh_from_db()
+
+        assert reserve_seat(parent, UserFactory()) == parent
+
+        # The parent is now 80% full, so group A is already waiting
+        assert list(parent.child_tournaments.values_list('group_name', flat=True)) == ['A']
+        assert ensure_open_groups(parent, minimum=2).pk == parent.pk
+        assert parent.child_tournaments.count() == 1
+
+    def test_entry_endpoint_routes_instead_of_erroring(self, category, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+        parent = make_parent(category, limit=1)
+        Tournament.objects.filter(pk=parent.pk).update(participant_count=1)
+        entrant = UserFactory(tickets=5)
+        client = APIClient()
+        client.force_authenticate(user=entrant)
+
+        response = client.post(
+            reverse('api:tournament-enter-tournament', kwargs={'pk': parent.pk}),
+            upload(),
+            format='multipart'
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        group = Tournament.objects.get(parent_tournament=parent, group_name='A')
+        assert response.data['tournament'] == group.id
+        # Group A filled at once, so B was provisioned for the next entrant
+        assert parent.child_tournaments.filter(group_name='B').exists()
@@ -0,0 +1,98 @@
+# lolo/tournament/test_api/test_images.py
+from io import BytesIO
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test.client import RequestFactory
+from PIL import Image
+
+from ..api.serializers import SponsorSerializer
+from ..images import _variant_urls, generate_derivatives, variant_urls
+from ..models import ImageDerivative, Sponsor
+
+
+def png(size=(2000, 1000), mode='RGB'):
+    image = BytesIO()
+    Image.new(mode, size, 'red').save(image, 'PNG')
+    return image.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def _clear_lru():
+    _variant_urls.clear()
+    yield
+    _variant_urls.clear()
+
+
+@pytest.mark.django_db
+class TestDerivatives:
+    def test_variants_in_both_formats(self):
+        name = default_storage.save('sponsor_logos/logo.png', ContentFile(png()))
+
+        record = generate_derivatives(name)
+
+        assert (record.width, record.height) == (2000, 1000)
+        assert {variant: (files['width'], files['height']) for variant, files in record.variants.items()} == {
+            'full': (1280, 640), 'card': (480, 240), 'thumb': (160, 80)
+        }
+        with default_storage.open(record.variants['thumb']['webp']) as thumb:
+            assert Image.open(thumb).format == 'WEBP'
+        with default_storage.open(record.variants['thumb']['jpg']) as thumb:
+            assert Image.open(thumb).format == 'JPEG'
+        # 4x3 components: 1 size + 1 max + 4 DC + 11 * 2 AC characters
+        assert len(record.blurhash) == 28
+        assert generate_derivatives(name) is None
+
+    def test_small_transparent_images_are_not_upscaled(self):
+        name = default_storage.save('sponsor_logos/small.png', ContentFile(png((100, 50), 'RGBA')))
+
+        record = generate_derivatives(name)
+
+        assert record.variants['full']['width'] == 100
+        with default_storage.open(record.variants['card']['jpg']) as card:
+            assert Image.open(card).mode == 'RGB'
+
+    def test_unreadable_image_is_recorded_once(self):
+        name = default_storage.save('sponsor_logos/broken.png', ContentFile(b'not an image'))
+
+        generate_derivatives(name)
+
+        assert ImageDerivative.objects.get(source=name).variants == {}
+        assert variant_urls(default_storage.open(name)) is None
+
+
+@pytest.mark.django_db
+class TestVariantUrls:
+    def test_pending_until_generated(self, django_capture_on_commit_callbacks):
+        sponsor = Sponsor.objects.create(
+            name='Acme', logo=SimpleUploadedFile('acme.png', png(), 'image/png')
+        )
+        assert variant_urls(sponsor.logo) is None
+
+        with django_capture_on_commit_callbacks(execute=True):
+            sponsor = Sponsor.objects.create(
+                name='Globex', logo=SimpleUploadedFile('globex.png', png(), 'image/png')
+            )
+
+        urls = variant_urls(sponsor.logo)
+        assert urls['card']['webp'].endswith('__card.webp')
+        assert urls['blurhash']
+
+    def test_resolved_urls_are_kept_in_process(self, django_assert_num_queries):
+        sponsor = Sponsor.objects.create(name='Acme', logo=ContentFile(png(), 'acme.png'))
+        generate_derivatives(sponsor.logo.name)
+        variant_urls(sponsor.logo)
+
+        with django_assert_num_queries(0):
+            assert variant_urls(sponsor.logo)['thumb']['width'] == 160
+
+    def test_serializer_exposes_absolute_urls(self):
+        sponsor = Sponsor.objects.create(name='Acme', logo=ContentFile(png(), 'acme.png'))
+        generate_derivatives(sponsor.logo.name)
+
+        data = SponsorSerializer(sponsor, context={'request': RequestFactory().get('/')}).data
+
+        assert data['logo_variants']['full']['jpg'].endswith('/sponsor_logos/acme__full.jpg')
+        assert data['logo_variants']['width'] == 2000
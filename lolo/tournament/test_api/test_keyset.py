@@ -0,0 +1,143 @@
+# lolo/tournament/test_api/test_keyset.py
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from lolo.users.tests.factories import UserFactory
+from ..models import Category, Participation, Tournament, VideoSubmission, Vote
+
+
+@pytest.fixture
+def tournament():
+    now = timezone.now()
+    return Tournament.objects.create(
+        title='Paged',
+        description='Paged',
+        category=Category.objects.create(name='Keyset'),
+        start_time=now - timezone.timedelta(days=1),
+        end_time=now + timezone.timedelta(days=1)
+    )
+
+
+def enter(tournament, votes=0, views=0, user=None):
+    user = user or UserFactory()
+    return Participation.objects.create(
+        user=user,
+        tournament=tournament,
+        video_submission=VideoSubmission.objects.create(
+            title='Entry',
+            user=user,
+            views_count=views,
+            video_file='tournament_videos/entry.mp4',
+            cover_image='video_covers/entry.jpg'
+        ),
+        votes_received=votes
+    )
+
+
+def walk(client, url, params, key):
+    """Follow next links to the end, returning the ids of every page"""
+    pages = []
+    response = client.get(url, params)
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        results = response.data['results']
+        rows = results[key] if key else results
+        pages.append([row['id'] for row in rows])
+        if not response.data['next']:
+            return pages, response
+        response = client.get(response.data['next'])
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    def test_participants_pages_cover_every_entry_once(self, tournament, user):
+        # Ties on views_count make the id tie-breaker do the work
+        entries = [enter(tournament, views=index % 3) for index in range(7)]
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse('api:tournament-participants', kwargs={'pk': tournament.pk})
+
+        pages, last = walk(client, url, {'sort': 'most_viewed', 'page_size': 3}, 'participants')
+
+        expected = [
+            entry.id for entry in sorted(entries, key=lambda e: (-e.video_submission.views_count, e.id))
+        ]
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert sum(pages, []) == expected
+        assert 'total_items' not in last.data
+        assert 'tournament_info' in last.data['results']
+
+        previous = client.get(last.data['previous'])
+        assert [row['id'] for row in previous.data['results']['participants']] == pages[1]
+
+    def test_deep_pages_skip_count_query(self, tournament, user):
+        for _ in range(5):
+            enter(tournament)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse('api:tournament-participants', kwargs={'pk': tournament.pk})
+        next_page = client.get(url, {'page_size': 2}).data['next']
+
+        with CaptureQueriesContext(connection) as queries:
+            client.get(next_page)
+
+        assert not any('COUNT(' in query['sql'] for query in queries.captured_queries)
+        assert not any('OFFSET' in query['sql'] for query in queries.captured_queries)
+
+    def test_my_voted_videos_by_votes(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        category = Category.objects.create(name='Voted')
+        targets = []
+        for votes in (3, 8, 3):
+            now = timezone.now()
+            tournament = Tournament.objects.create(
+                title='Voted', description='Voted', category=category,
+                start_time=now, end_time=now + timezone.timedelta(days=1)
+            )
+            target = enter(tournament, votes=votes)
+            Vote.objects.create(voter=user, participation=target, tournament=tournament)
+            targets.append(target)
+        url = reverse('api:tournament-my-voted-videos')
+
+        response = client.get(url, {'sort': 'most_votes', 'page_size': 2})
+        second = client.get(response.data['next'])
+
+        ids = [row['video']['id'] for row in response.data['results']['voted_videos']]
+        ids += [row['video']['id'] for row in second.data['results']['voted_videos']]
+        assert ids == [targets[1].video_submission_id, targets[0].video_submission_id, targets[2].video_submission_id]
+        assert second.data['results']['voting_stats'] == {'total_votes_cast': 3, 'tournaments_voted_in': 3}
+
+    def test_user_videos_newest_first(self, tournament, user):
+        owner = UserFactory()
+        older = enter(tournament, user=owner)
+        now = timezone.now()
+        other = Tournament.objects.create(
+            title='Other', description='Other', category=tournament.category,
+            start_time=now, end_time=now + timezone.timedelta(days=1)
+        )
+        newer = enter(other, user=owner)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse('api:user-profile-user-videos', kwargs={'username': owner.username})
+
+        pages, last = walk(client, url, {'page_size': 1, 'include_total': 'true'}, None)
+
+        assert pages == [[newer.id], [older.id]]
+        assert last.data['total_items'] == 2
+
+    def test_garbage_cursor_is_404(self, tournament, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response = client.get(
+            reverse('api:tournament-participants', kwargs={'pk': tournament.pk}),
+            {'cursor': 'not-a-cursor'}
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
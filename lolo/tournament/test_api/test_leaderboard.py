@@ -0,0 +1,153 @@
+# lolo/tournament/test_api/test_leaderboard.py
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from redis.exceptions import ConnectionError as RedisConnectionError
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from lolo.users.tests.factories import UserFactory
+from ..leaderboard import Leaderboard
+from ..models import Category, Participation, Tournament, VideoSubmission
+
+
+@pytest.fixture
+def tournament():
+    now = timezone.now()
+    return Tournament.objects.create(
+        title='Ranked',
+        description='Ranked',
+        category=Category.objects.create(name='Leaderboard'),
+        start_time=now - timezone.timedelta(days=1),
+        end_time=now + timezone.timedelta(days=1)
+    )
+
+
+def enter(tournament, votes=0, user=None):
+    user = user or UserFactory()
+    return Participation.objects.create(
+        user=user,
+        tournament=tournament,
+        video_submission=VideoSubmission.objects.create(title='Entry', user=user),
+        votes_received=votes
+    )
+
+
+@pytest.mark.django_db
+class TestLeaderboard:
+    def test_orders_by_votes_then_entry(self, tournament):
+        first = enter(tournament, votes=2)
+        second = enter(tournament, votes=5)
+        third = enter(tournament, votes=2)
+
+        leaderboard = Leaderboard(tournament.pk).ensure()
+
+        assert leaderboard.top(3) == [(1, second.id, 5), (2, first.id, 2), (3, third.id, 2)]
+        assert leaderboard.rank(third.id) == 3
+
+    def test_around_returns_window(self, tournament):
+        entries = [enter(tournament, votes=10 - index) for index in range(10)]
+        leaderboard = Leaderboard(tournament.pk).ensure()
+
+        window = leaderboard.around(entries[5].id, radius=2)
+
+        assert [rank for rank, _, _ in window] == [4, 5, 6, 7, 8]
+        assert window[2][1] == entries[5].id
+
+    def test_cold_start_rebuilds_from_database(self, tournament, redis_client):
+        entry = enter(tournament, votes=3)
+        Leaderboard(tournament.pk).ensure()
+        redis_client.flushall()
+
+        assert Leaderboard(tournament.pk).ensure().top(1) == [(1, entry.id, 3)]
+
+    def test_rebuild_keeps_vote_cast_mid_rebuild(self, tournament, redis_client, monkeypatch):
+        entry = enter(tournament, votes=1)
+        leaderboard = Leaderboard(tournament.pk)
+        member = Leaderboard._member
+        raced = []
+
+        def vote_after_read(participation_id):
+            # A vote commits after the rows were read but before the swap
+            if not raced:
+                raced.append(participation_id)
+                Participation.objects.filter(pk=entry.pk).update(votes_received=2)
+                leaderboard.record_vote(entry.pk)
+            return member(participation_id)
+
+        monkeypatch.setattr(Leaderboard, '_member', staticmethod(vote_after_read))
+        leaderboard.rebuild()
+
+        assert leaderboard.top(1) == [(1, entry.id, 2)]
+        assert redis_client.exists(leaderboard.ready_key)
+        assert redis_client.keys(f'{leaderboard.key}:build:*') == []
+
+    def test_vote_moves_entry_up(self, tournament, django_capture_on_commit_callbacks):
+        leader = enter(tournament, votes=1)
+        challenger = enter(tournament)
+        Leaderboard(tournament.pk).ensure()
+        client = APIClient()
+
+        # Only entrants may vote, so both voters enter first
+        with django_capture_on_commit_callbacks(execute=True):
+            for voter in (leader.user, enter(tournament).user):
+                client.force_authenticate(user=voter)
+                response = client.post(
+                    reverse('api:tournament-vote', kwargs={'pk': tournament.pk}),
+                    {'participation_id': challenger.id}
+                )
+                assert response.status_code == status.HTTP_201_CREATED
+
+        leaderboard = Leaderboard(tournament.pk)
+        assert leaderboard.rank(challenger.id) == 1
+        assert leaderboard.rank(leader.id) == 2
+
+    def test_standings_pages_with_ranks(self, tournament):
+        entries = [enter(tournament, votes=index) for index in range(12)]
+        me = entries[0].user
+        client = APIClient()
+        client.force_authenticate(user=me)
+        url = reverse('api:tournament-standings', kwargs={'pk': tournament.pk})
+
+        next_page = client.get(url).data['next']
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(f'{next_page}&include_total=true')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['total_items'] == 12
+        assert [row['rank'] for row in response.data['results']['standings']] == [11, 12]
+        assert response.data['results']['standings'][1]['id'] == entries[0].id
+        assert response.data['results']['tournament_info']['my_rank'] == 12
+        # tournament, own entry and one hydrate query for the page
+        selects = [query for query in queries.captured_queries if query['sql'].startswith('SELECT')]
+        assert len(selects) == 3
+
+    def test_standings_around_me(self, tournament):
+        entries = [enter(tournament, votes=index) for index in range(20)]
+        client = APIClient()
+        client.force_authenticate(user=entries[10].user)
+
+        response = client.get(
+            reverse('api:tournament-standings', kwargs={'pk': tournament.pk}),
+            {'around_me': 'true'}
+        )
+
+        assert [row['rank'] for row in response.data['standings']] == list(range(5, 16))
+
+    def test_standings_fall_back_to_database(self, tournament, redis_client, monkeypatch):
+        low = enter(tournament, votes=1)
+        high = enter(tournament, votes=4)
+
+        def unavailable(*args, **kwargs):
+            raise RedisConnectionError
+
+        monkeypatch.setattr(redis_client, 'exists', unavailable)
+        client = APIClient()
+        client.force_authenticate(user=UserFactory())
+
+        response = client.get(reverse('api:tournament-standings', kwargs={'pk': tournament.pk}))
+
+        standings = response.data['results']['standings']
+        assert [(row['id'], row['rank']) for row in standings] == [(high.id, 1), (low.id, 2)]
@@ -0,0 +1,112 @@
+# lolo/tournament/test_api/test_media_probe.py
+import struct
+from datetime import timedelta
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from lolo.users.tests.factories import UserFactory
+from ..media_probe import ProbeError, RangedReader, probe
+from ..models import VideoSubmission
+from .test_groups import upload
+
+
+def box(box_type, payload=b''):
+    return struct.pack('>I4s', 8 + len(payload), box_type) + payload
+
+
+def track(handler, codec, width=0, height=0):
+    tkhd = bytes(76) + struct.pack('>II', width << 16, height << 16)
+    hdlr = bytes(8) + handler + bytes(12)
+    entry = codec + bytes(24) + struct.pack('>HH', width, height) + bytes(50)
+    stsd = struct.pack('>II', 0, 1) + struct.pack('>I', 4 + len(entry)) + entry
+    stbl = box(b'stbl', box(b'stsd', stsd) + box(b'stsz', bytes(4096)))
+    return box(b'trak', box(b'tkhd', tkhd) + box(b'mdia', box(b'hdlr', hdlr) + box(b'minf', stbl)))
+
+
+def mp4(media_size=0, seconds=12.5):
+    mvhd = struct.pack('>IIIII', 0, 0, 0, 1000, int(seconds * 1000)) + bytes(80)
+    moov = box(b'moov', box(b'mvhd', mvhd) + track(b'soun', b'mp4a') + track(b'vide', b'avc1', 1280, 720))
+    # Not "fast start": the index sits after the media data
+    return box(b'ftyp', b'isom\x00\x00\x02\x00') + box(b'mdat', bytes(media_size)) + moov
+
+
+def chunk(chunk_id, payload):
+    return struct.pack('<4sI', chunk_id, len(payload)) + payload + bytes(len(payload) & 1)
+
+
+def avi(frames=250, usec_per_frame=40000):
+    avih = struct.pack('<IIIII', usec_per_frame, 0, 0, 0, frames) + struct.pack('<III', 0, 1, 0)
+    avih += struct.pack('<II', 640, 480) + bytes(16)
+    strh = b'vidsh264' + bytes(48)
+    strf = struct.pack('<IiiHH4s', 40, 640, 480, 1, 24, b'H264') + bytes(20)
+    strl = chunk(b'LIST', b'strl' + chunk(b'strh', strh) + chunk(b'strf', strf))
+    hdrl = chunk(b'LIST', b'hdrl' + chunk(b'avih', avih) + strl)
+    movi = chunk(b'LIST', b'movi' + chunk(b'00dc', bytes(1000)))
+    return chunk(b'RIFF', b'AVI ' + hdrl + movi)
+
+
+class FakeS3:
+    def __init__(self, data):
+        self.data = data
+        self.fetched = 0
+
+    def head_object(self, Bucket, Key):
+        return {'ContentLength': len(self.data)}
+
+    def get_object(self, Bucket, Key, Range):
+        start, end = map(int, Range.removeprefix('bytes=').split('-'))
+        body = self.data[start:end + 1]
+        self.fetched += len(body)
+        return {'Body': BytesIO(body)}
+
+
+class TestProbe:
+    def test_mp4_reads_video_track(self):
+        metadata = probe(BytesIO(mp4()))
+
+        assert metadata.duration == timedelta(seconds=12.5)
+        assert (metadata.width, metadata.height, metadata.codec) == (1280, 720, 'avc1')
+
+    def test_avi_reads_main_header(self):
+        metadata = probe(BytesIO(avi()))
+
+        assert metadata.duration == timedelta(seconds=10)
+        assert (metadata.width, metadata.height, metadata.codec) == (640, 480, 'H264')
+
+    def test_ranged_reads_skip_media_data(self):
+        data = mp4(media_size=20 * 1024 * 1024)
+        client = FakeS3(data)
+
+        metadata = probe(RangedReader(client, 'bucket', 'key'))
+
+        assert metadata.codec == 'avc1'
+        assert client.fetched < 256 * 1024
+
+    def test_unknown_container(self):
+        with pytest.raises(ProbeError):
+            probe(BytesIO(b'not a video at all'))
+
+
+@pytest.mark.django_db
+class TestMetadataTask:
+    def test_upload_is_probed_after_commit(self, django_capture_on_commit_callbacks):
+        fields = upload()
+        fields['video_file'] = SimpleUploadedFile('clip.mp4', mp4(), 'video/mp4')
+
+        with django_capture_on_commit_callbacks(execute=True):
+            video = VideoSubmission.objects.create(user=UserFactory(), **fields)
+
+        video.refresh_from_db()
+        assert video.processed
+        assert video.duration == timedelta(seconds=12.5)
+        assert (video.width, video.height, video.video_codec) == (1280, 720, 'avc1')
+
+    def test_unreadable_upload_stays_unprocessed(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            video = VideoSubmission.objects.create(user=UserFactory(), **upload())
+
+        video.refresh_from_db()
+        assert not video.processed
+        assert video.duration is None
@@ -0,0 +1,88 @@
+# lolo/tournament/test_api/test_public_cache.py
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ..models import Category, Sponsor, Tournament
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def showcased():
+    now = timezone.now()
+    return Tournament.objects.create(
+        title='On show',
+        description='On show',
+        category=Category.objects.create(name='Public'),
+        start_time=now - timezone.timedelta(days=1),
+        end_time=now + timezone.timedelta(days=1),
+        is_showcase=True
+    )
+
+
+@pytest.mark.django_db
+class TestPublicCache:
+    def test_steady_state_skips_database(self, showcased):
+        client = APIClient()
+        url = reverse('api:public-tournaments-showcase')
+        client.get(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [row['id'] for row in response.data] == [showcased.id]
+        assert response.data[0]['category'] == 'Public'
+        assert not [query for query in queries.captured_queries if query['sql'].startswith('SELECT')]
+
+    def test_revalidation_returns_304(self, showcased):
+        client = APIClient()
+        url = reverse('api:public-tournaments-showcase')
+        first = client.get(url)
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert first['Last-Modified']
+        assert 'public' in first['Cache-Control']
+
+    def test_saves_invalidate_sponsors(self, django_capture_on_commit_callbacks):
+        client = APIClient()
+        url = reverse('api:sponsor-public')
+        with django_capture_on_commit_callbacks(execute=True):
+            sponsor = Sponsor.objects.create(name='Acme', logo='sponsor_logos/acme.png')
+        first = client.get(url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            sponsor.name = 'Acme Ltd'
+            sponsor.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[0]['name'] == 'Acme Ltd'
+        assert response['ETag'] != first['ETag']
+
+    def test_entry_expires_at_next_boundary(self, showcased, monkeypatch):
+        stored = {}
+        original_set = cache.set
+
+        def capture_set(key, value, timeout=None, *args, **kwargs):
+            if key.startswith('public:showcase'):
+                stored['timeout'] = timeout
+            return original_set(key, value, timeout, *args, **kwargs)
+
+        monkeypatch.setattr(cache, 'set', capture_set)
+        showcased.end_time = timezone.now() + timezone.timedelta(minutes=10)
+        showcased.save()
+        APIClient().get(reverse('api:public-tournaments-showcase'))
+
+        assert 590 < stored['timeout'] <= 600
@@ -0,0 +1,113 @@
+# lolo/tournament/test_api/test_rankings.py
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from lolo.users.tests.factories import UserFactory
+from ..models import Category, Participation, Tournament, VideoSubmission
+from ..rankings import CLOSING_SOON_CACHE_KEY, rank_closing_soon
+from ..tasks import refresh_closing_soon_ranking
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def category():
+    return Category.objects.create(name='Rankings')
+
+
+def make_tournament(category, title, start, end=None, **kwargs):
+    return Tournament.objects.create(
+        title=title,
+        description=title,
+        category=category,
+        start_time=start,
+        end_time=end,
+        **kwargs
+    )
+
+
+@pytest.mark.django_db
+class TestClosingSoonRanking:
+    def test_buckets_are_ranked_in_priority_order(self, category):
+        now = timezone.now()
+        day = timezone.timedelta(days=1)
+        ended = make_tournament(category, 'ended', now - 3 * day, now - day)
+        active = make_tournament(category, 'active', now - day, now + 10 * day)
+        ending = make_tournament(category, 'ending', now - day, now + timezone.timedelta(hours=5))
+        nearly_full = make_tournament(
+            category, 'nearly full', now - day, now + 10 * day,
+            participant_limit=10, participant_count=9
+        )
+        fuller = make_tournament(
+            category, 'fuller', now - day, now + 10 * day,
+            participant_limit=5, participant_count=5
+        )
+        half_full = make_tournament(
+            category, 'half full', now - day, now + 10 * day,
+            participant_limit=10, participant_count=5
+        )
+        empty = make_tournament(
+            category, 'empty', now - day, now + 10 * day, participant_limit=10
+        )
+        featured_empty = make_tournament(
+            category, 'featured empty', now - 2 * day, participant_limit=10,
+            featured=True, is_repeating=True
+        )
+        make_tournament(category, 'upcoming', now + day, now + 2 * day)
+
+        assert rank_closing_soon(now) == [
+            featured_empty.id,
+            empty.id,
+            fuller.id,
+            nearly_full.id,
+            ending.id,
+            active.id,
+            half_full.id,
+            ended.id,
+        ]
+
+    def test_endpoint_serves_cached_ranking(self, category):
+        now = timezone.now()
+        tournament = make_tournament(
+            category, 'cached', now - timezone.timedelta(days=1), now + timezone.timedelta(days=1)
+        )
+        refresh_closing_soon_ranking()
+        client = APIClient()
+        client.force_authenticate(user=UserFactory())
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse('api:tournament-closing-soon'))
+
+        # ATOMIC_REQUESTS adds a savepoint around the view; only the hydrate query reads
+        selects = [query for query in queries.captured_queries if query['sql'].startswith('SELECT')]
+        assert len(selects) == 1
+        assert response.status_code == status.HTTP_200_OK
+        assert [row['id'] for row in response.data] == [tournament.id]
+        assert response.data[0]['status'] == 'active'
+
+    def test_participation_invalidates_ranking(self, category, django_capture_on_commit_callbacks):
+        now = timezone.now()
+        tournament = make_tournament(
+            category, 'invalidated', now - timezone.timedelta(days=1), participant_limit=2
+        )
+        refresh_closing_soon_ranking()
+        assert cache.get(CLOSING_SOON_CACHE_KEY) == [tournament.id]
+
+        entrant = UserFactory()
+        with django_capture_on_commit_callbacks(execute=True):
+            Participation.objects.create(
+                user=entrant,
+                tournament=tournament,
+                video_submission=VideoSubmission.objects.create(title='Entry', user=entrant)
+            )
+
+        assert cache.get(CLOSING_SOON_CACHE_KEY) is None
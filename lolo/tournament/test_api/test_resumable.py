@@ -0,0 +1,173 @@
+# lolo/tournament/test_api/test_resumable.py
+import base64
+import fcntl
+import os
+import time
+from io import BytesIO
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from lolo.users.tests.factories import UserFactory
+from ..models import VideoSubmission
+from ..resumable import OffsetConflict, RESUMABLE_ORPHAN_AGE, ResumableUpload, remove_orphaned_parts
+from .test_groups import upload as submission_fields
+from .test_media_probe import mp4
+
+VIDEO = mp4(media_size=2048)
+
+
+@pytest.fixture(autouse=True)
+def _upload_root(settings, tmp_path):
+    settings.RESUMABLE_UPLOAD_ROOT = str(tmp_path / 'uploads')
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def create(client, length=len(VIDEO), filename='clip.mp4'):
+    return client.post(
+        reverse('api:resumable-upload-list'),
+        HTTP_UPLOAD_LENGTH=str(length),
+        HTTP_UPLOAD_METADATA=f'filename {base64.b64encode(filename.encode()).decode()}'
+    )
+
+
+def patch(client, location, offset, chunk):
+    return client.generic(
+        'PATCH',
+        location,
+        chunk,
+        content_type='application/offset+octet-stream',
+        HTTP_UPLOAD_OFFSET=str(offset)
+    )
+
+
+@pytest.mark.django_db
+class TestResumableUploads:
+    def test_chunks_assemble_into_submission(self, user):
+        client = client_for(user)
+        location = create(client)['Location']
+
+        first = patch(client, location, 0, VIDEO[:1000])
+        second = patch(client, location, 1000, VIDEO[1000:])
+        head = client.head(location)
+        submitted = client.post(f'{location}submit/', submission_fields(), format='multipart')
+
+        assert first.status_code == status.HTTP_204_NO_CONTENT
+        assert first['Upload-Offset'] == '1000'
+        assert second['Upload-Offset'] == str(len(VIDEO))
+        assert head['Upload-Offset'] == head['Upload-Length'] == str(len(VIDEO))
+        assert head['Tus-Resumable'] == '1.0.0'
+        assert submitted.status_code == status.HTTP_201_CREATED
+        video = VideoSubmission.objects.get(pk=submitted.data['id'])
+        assert video.video_file.name.startswith('tournament_videos/clip')
+        with video.video_file.open('rb') as stored:
+            assert stored.read() == VIDEO
+        assert client.head(location).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_dropped_chunk_resumes_from_what_arrived(self, user):
+        client = client_for(user)
+        location = create(client)['Location']
+        upload_id = location.rstrip('/').rsplit('/', 1)[1]
+        upload = ResumableUpload.get(upload_id, user)
+
+        # The connection dies 300 bytes into a 1000 byte chunk
+        upload.append(BytesIO(VIDEO[:300]), 0, 1000)
+        head = client.head(location)
+        resumed = patch(client, location, 300, VIDEO[300:])
+
+        assert head['Upload-Offset'] == '300'
+        assert resumed['Upload-Offset'] == str(len(VIDEO))
+        with open(upload.path, 'rb') as partial:
+            assert partial.read() == VIDEO
+
+    def test_stale_offset_conflicts(self, user):
+        client = client_for(user)
+        location = create(client)['Location']
+        patch(client, location, 0, VIDEO[:500])
+
+        response = patch(client, location, 0, VIDEO[:500])
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert client.head(location)['Upload-Offset'] == '500'
+
+    def test_uploads_are_private(self, user):
+        location = create(client_for(user))['Location']
+
+        response = patch(client_for(UserFactory()), location, 0, VIDEO[:500])
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_incomplete_upload_cannot_be_submitted(self, user):
+        client = client_for(user)
+        location = create(client)['Location']
+        patch(client, location, 0, VIDEO[:500])
+
+        response = client.post(f'{location}submit/', submission_fields(), format='multipart')
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert not VideoSubmission.objects.exists()
+
+    def test_rejects_unsupported_files(self, user):
+        response = create(client_for(user), filename='clip.exe')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_chunk_in_progress_holds_the_part_file(self, user):
+        client = client_for(user)
+        location = create(client)['Location']
+        upload = ResumableUpload.get(location.rstrip('/').rsplit('/', 1)[1], user)
+
+        with open(upload.path, 'r+b') as writing:
+            fcntl.flock(writing, fcntl.LOCK_EX)
+            with pytest.raises(OffsetConflict):
+                upload.append(BytesIO(VIDEO[:500]), 0, 500)
+        upload.append(BytesIO(VIDEO[:500]), 0, 500)
+
+        assert client.head(location)['Upload-Offset'] == '500'
+
+    def test_expired_part_files_are_removed(self, user, redis_client):
+        live = ResumableUpload.create(user, len(VIDEO), 'live.mp4')
+        expired = ResumableUpload.create(user, len(VIDEO), 'expired.mp4')
+        fresh = ResumableUpload.create(user, len(VIDEO), 'fresh.mp4')
+        redis_client.delete(expired.key(expired.id), fresh.key(fresh.id))
+        old = time.time() - RESUMABLE_ORPHAN_AGE - 60
+        for upload in (live, expired):
+            os.utime(upload.path, (old, old))
+
+        assert remove_orphaned_parts() == 1
+        assert os.path.exists(live.path)
+        assert not os.path.exists(expired.path)
+        assert os.path.exists(fresh.path)
+
+    def test_renamed_binary_is_refused_at_submit(self, user):
+        client = client_for(user)
+        payload = b'MZ\x90\x00' + bytes(range(256)) * 4
+        location = create(client, length=len(payload))['Location']
+        patch(client, location, 0, payload)
+
+        response = client.post(f'{location}submit/', submission_fields(), format='multipart')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'video_file' in response.data
+        assert not VideoSubmission.objects.exists()
+        assert client.head(location).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_upload_is_submitted_once(self, user):
+        client = client_for(user)
+        location = create(client)['Location']
+        patch(client, location, 0, VIDEO)
+        # A concurrent submit of the same upload got there first
+        upload = ResumableUpload.get(location.rstrip('/').rsplit('/', 1)[-1], user)
+        assert upload.claim()
+
+        response = client.post(f'{location}submit/', submission_fields(), format='multipart')
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert not VideoSubmission.objects.exists()
@@ -0,0 +1,87 @@
+# lolo/tournament/test_api/test_search.py
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from lolo.users.tests.factories import UserFactory
+from ..models import Category, Participation, Tournament, VideoSubmission
+
+
+@pytest.fixture
+def category():
+    return Category.objects.create(name='Search')
+
+
+def make_tournament(category, title, description='', **kwargs):
+    now = timezone.now()
+    return Tournament.objects.create(
+        title=title,
+        description=description,
+        category=category,
+        start_time=now - timezone.timedelta(days=1),
+        end_time=now + timezone.timedelta(days=1),
+        **kwargs
+    )
+
+
+def enter(tournament, title, description='', user=None):
+    user = user or UserFactory()
+    return Participation.objects.create(
+        user=user,
+        tournament=tournament,
+        video_submission=VideoSubmission.objects.create(
+            title=title, description=description, user=user
+        )
+    )
+
+
+@pytest.mark.django_db
+class TestFullTextSearch:
+    def test_search_vector_follows_text_edits(self, category):
+        tournament = make_tournament(category, 'Dance battle')
+
+        tournament.title = 'Cooking contest'
+        tournament.save()
+
+        matches = Tournament.objects.filter(search_vector='cook')
+        assert list(matches) == [tournament]
+
+    def test_tournaments_ranked_by_relevance(self, category, user):
+        in_description = make_tournament(category, 'Weekly', 'A skateboarding session')
+        in_title = make_tournament(category, 'Skateboarding tricks', 'Show your best')
+        make_tournament(category, 'Singing', 'Vocals only')
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response = client.get(reverse('api:tournament-list'), {'search': 'skateboard'})
+
+        assert [row['id'] for row in response.data['results']] == [in_title.id, in_description.id]
+
+    def test_explicit_sort_wins_over_rank(self, category, user):
+        quiet = make_tournament(category, 'Skate park', vote_count=1)
+        busy = make_tournament(category, 'Park', 'skate', vote_count=9)
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response = client.get(
+            reverse('api:tournament-list'), {'search': 'skate', 'sort_by': 'most_votes'}
+        )
+
+        assert [row['id'] for row in response.data['results']] == [busy.id, quiet.id]
+
+    def test_participants_match_video_text_or_username(self, category, user):
+        tournament = make_tournament(category, 'Open mic')
+        by_title = enter(tournament, 'Guitar solo')
+        by_username = enter(tournament, 'Untitled', user=UserFactory(username='guitarhero'))
+        enter(tournament, 'Drums')
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response = client.get(
+            reverse('api:tournament-participants', kwargs={'pk': tournament.pk}),
+            {'search': 'guitar'}
+        )
+
+        ids = [row['id'] for row in response.data['results']['participants']]
+        assert ids == [by_title.id, by_username.id]
@@ -0,0 +1,111 @@
+# lolo/tournament/test_api/test_server_timing.py
+import json
+import logging
+import re
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from lolo.server_timing import sample_rate
+from ..models import Category, Tournament
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def tournament():
+    now = timezone.now()
+    return Tournament.objects.create(
+        title='Timed',
+        description='Timed',
+        category=Category.objects.create(name='Timing'),
+        start_time=now - timezone.timedelta(days=1),
+        end_time=now + timezone.timedelta(days=1),
+        is_showcase=True
+    )
+
+
+def parse(header):
+    metrics = {}
+    for entry in header.split(', '):
+        name, *params = entry.split(';')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+    return metrics
+
+
+@pytest.mark.django_db
+class TestServerTiming:
+    def test_not_sampled_by_default(self, tournament, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get(reverse('api:tournament-list'))
+        assert 'Server-Timing' not in response
+
+    def test_reports_queries_serializer_and_view(self, settings, tournament, user):
+        settings.SERVER_TIMING_ENDPOINTS = {'api:tournament-*': 1}
+        client = APIClient()
+        client.force_authenticate(user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse('api:tournament-list'))
+
+        metrics = parse(response['Server-Timing'])
+        assert metrics['db']['desc'] == f'"{len(queries.captured_queries)} queries"'
+        assert float(metrics['serializer']['dur']) > 0
+        assert float(metrics['view']['dur']) >= float(metrics['serializer']['dur'])
+
+    def test_counts_cache_hits_and_misses(self, settings, tournament):
+        settings.SERVER_TIMING_SAMPLE_RATE = 1
+        client = APIClient()
+        url = reverse('api:public-tournaments-showcase')
+
+        cold = parse(client.get(url)['Server-Timing'])['cache']['desc']
+        warm = parse(client.get(url)['Server-Timing'])['cache']['desc']
+
+        assert re.match(r'"\d+ hits [1-9]\d* misses"', cold)
+        assert re.match(r'"[1-9]\d* hits 0 misses"', warm)
+
+    def test_logs_structured_line(self, settings, tournament, caplog):
+        settings.SERVER_TIMING_SAMPLE_RATE = 1
+        settings.SERVER_TIMING_HEADER = False
+        with caplog.at_level(logging.INFO, logger='lolo.server_timing'):
+            response = APIClient().get(reverse('api:public-tournaments-showcase'))
+
+        assert 'Server-Timing' not in response
+        [record] = [r for r in caplog.records if r.name == 'lolo.server_timing']
+        line = json.loads(record.getMessage())
+        assert line['view'] == 'api:public-tournaments-showcase'
+        assert line['status'] == 200
+        assert line['db_queries'] > 0
+
+    def test_endpoint_rates(self, settings):
+        settings.SERVER_TIMING_SAMPLE_RATE = 0.01
+        settings.SERVER_TIMING_ENDPOINTS = {'api:tournament-list': 0, 'api:tournament-*': 0.5}
+        assert sample_rate('api:tournament-list') == 0
+        assert sample_rate('api:tournament-detail') == 0.5
+        assert sample_rate('tickets:webhook') == 0.01
+
+    def test_sampled_over_asgi(self, settings, tournament, user):
+        settings.SERVER_TIMING_SAMPLE_RATE = 1
+        token = Token.objects.create(user=user)
+        response = async_to_sync(AsyncClient().get)(
+            reverse('api:tournament-list'),
+            headers={'Authorization': f'Token {token.key}'}
+        )
+
+        assert response.status_code == 200
+        metrics = parse(response['Server-Timing'])
+        assert int(metrics['db']['desc'].strip('"').split()[0]) > 0
+        assert re.match(r'"\d+ hits [1-9]\d* misses"', metrics['cache']['desc'])
+        assert float(metrics['serializer']['dur']) > 0
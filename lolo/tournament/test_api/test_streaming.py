@@ -0,0 +1,139 @@
+# lolo/tournament/test_api/test_streaming.py
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import RequestFactory
+from django.urls import reverse
+
+from ..streaming import RangeNotSatisfiable, parse_range_header, range_response
+
+DATA = bytes(range(256)) * 40
+
+
+def content(response):
+    return b''.join(response.streaming_content) if response.streaming else response.content
+
+
+@pytest.fixture
+def video_url():
+    name = default_storage.save('tournament_videos/clip.mp4', ContentFile(DATA))
+    return reverse('tournament:stream-video', kwargs={'name': name})
+
+
+class TestParseRange:
+    def test_forms(self):
+        assert parse_range_header('bytes=0-9', 100) == [(0, 9)]
+        assert parse_range_header('bytes=90-', 100) == [(90, 99)]
+        assert parse_range_header('bytes=-10', 100) == [(90, 99)]
+        assert parse_range_header('bytes=50-500', 100) == [(50, 99)]
+
+    def test_multiple_ranges_are_merged(self):
+        assert parse_range_header('bytes=20-29, 0-9, 5-14', 100) == [(0, 14), (20, 29)]
+
+    def test_ignored_headers(self):
+        assert parse_range_header('items=0-9', 100) is None
+        assert parse_range_header('bytes=9-0', 100) is None
+        assert parse_range_header('bytes=a-b', 100) is None
+        assert parse_range_header(','.join(f'bytes={n * 3}-{n * 3}' for n in range(20)), 100) is None
+
+    def test_unsatisfiable(self):
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range_header('bytes=100-', 100)
+
+
+class TestStreamVideo:
+    def test_full_file(self, client, video_url):
+        response = client.get(video_url)
+
+        assert response.status_code == 200
+        assert response['Accept-Ranges'] == 'bytes'
+        assert response['Content-Type'] == 'video/mp4'
+        assert content(response) == DATA
+
+    def test_single_range(self, client, video_url):
+        response = client.get(video_url, HTTP_RANGE='bytes=1000-1099')
+
+        assert response.status_code == 206
+        assert response['Content-Range'] == f'bytes 1000-1099/{len(DATA)}'
+        assert response['Content-Length'] == '100'
+        assert content(response) == DATA[1000:1100]
+
+    def test_multiple_ranges(self, client, video_url):
+        response = client.get(video_url, HTTP_RANGE='bytes=0-4,-5')
+
+        body = content(response)
+        assert response.status_code == 206
+        assert response['Content-Type'].startswith('multipart/byteranges; boundary=')
+        assert int(response['Content-Length']) == len(body)
+        assert f'Content-Range: bytes 0-4/{len(DATA)}'.encode() in body
+        assert DATA[:5] in body and DATA[-5:] in body
+
+    def test_unsatisfiable_range(self, client, video_url):
+        response = client.get(video_url, HTTP_RANGE=f'bytes={len(DATA)}-')
+
+        assert response.status_code == 416
+        assert response['Content-Range'] == f'bytes */{len(DATA)}'
+
+    def test_validators(self, client, video_url):
+        etag = client.get(video_url)['ETag']
+
+        assert client.get(video_url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        stale = client.get(video_url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        assert stale.status_code == 200
+        assert client.get(video_url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag).status_code == 206
+
+    def test_only_video_paths_are_served(self, client):
+        default_storage.save('user_avatars/me.png', ContentFile(b'png'))
+
+        assert client.get('/media/user_avatars/me.png').status_code == 404
+        assert client.get('/media/tournament_videos/missing.mp4').status_code == 404
+        assert client.post('/media/tournament_videos/missing.mp4').status_code == 405
+
+
+class FakeBody:
+    def __init__(self, data):
+        self.data = data
+
+    def iter_chunks(self, size):
+        for index in range(0, len(self.data), size):
+            yield self.data[index:index + size]
+
+    def close(self):
+        pass
+
+
+class FakeS3Client:
+    def __init__(self):
+        self.ranges = []
+
+    def head_object(self, Bucket, Key):
+        return {
+            'ContentLength': len(DATA),
+            'LastModified': datetime(2024, 1, 1, tzinfo=timezone.utc),
+            'ETag': '"abc123"',
+        }
+
+    def get_object(self, Bucket, Key, Range):
+        self.ranges.append(Range)
+        start, end = map(int, Range.removeprefix('bytes=').split('-'))
+        return {'Body': FakeBody(DATA[start:end + 1])}
+
+
+class TestS3Proxy:
+    def test_only_requested_bytes_are_fetched(self):
+        s3 = FakeS3Client()
+        storage = SimpleNamespace(
+            bucket_name='bucket', location='media', connection=SimpleNamespace(meta=SimpleNamespace(client=s3))
+        )
+        request = RequestFactory().get('/', HTTP_RANGE='bytes=10-19,100-109')
+
+        response = range_response(request, 'tournament_videos/clip.mp4', storage=storage)
+
+        body = b''.join(response.streaming_content)
+        assert response.status_code == 206
+        assert response['ETag'] == '"abc123"'
+        assert s3.ranges == ['bytes=10-19', 'bytes=100-109']
+        assert DATA[10:20] in body and DATA[100:110] in body
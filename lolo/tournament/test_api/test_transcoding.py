@@ -0,0 +1,133 @@
+# lolo/tournament/test_api/test_transcoding.py
+import os
+import shutil
+import subprocess
+
+import pytest
+from celery.exceptions import SoftTimeLimitExceeded
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from lolo.users.tests.factories import UserFactory
+from ..models import TranscodeJob, VideoRendition, VideoSubmission
+from ..transcoding import (
+    acquire_slot,
+    master_playlist,
+    release_slot,
+    rendition_ladder,
+    rendition_size,
+    run_pipeline,
+)
+from .test_groups import upload
+
+
+class TestLadder:
+    def test_skips_rungs_above_the_source(self):
+        assert [rung[0] for rung in rendition_ladder(1280, 720)] == ['720p', '480p', '360p']
+        assert [rung[0] for rung in rendition_ladder(320, 240)] == ['360p']
+
+    def test_portrait_sizes_follow_the_short_edge(self):
+        assert rendition_ladder(1080, 1920)[0][0] == '1080p'
+        assert rendition_size(1080, 1920, 720) == (720, 1280)
+        assert rendition_size(1920, 1080, 480) == (854, 480)
+
+    def test_master_playlist_lists_variants(self):
+        playlist = master_playlist([('720p', 1280, 720, 2800), ('360p', 640, 360, 800)])
+
+        assert playlist.splitlines() == [
+            '#EXTM3U',
+            '#EXT-X-VERSION:3',
+            '#EXT-X-STREAM-INF:BANDWIDTH=2928000,RESOLUTION=1280x720',
+            '720p/index.m3u8',
+            '#EXT-X-STREAM-INF:BANDWIDTH=928000,RESOLUTION=640x360',
+            '360p/index.m3u8',
+        ]
+
+    def test_slots_cap_concurrent_transcodes(self, settings):
+        settings.VIDEO_TRANSCODE_CONCURRENCY = 1
+
+        slot = acquire_slot()
+        assert slot is not None
+        assert acquire_slot() is None
+        release_slot(slot)
+        assert acquire_slot() == slot
+
+
+@pytest.mark.django_db
+class TestPipeline:
+    def test_missing_ffmpeg_fails_the_job(self, settings):
+        settings.FFMPEG_BINARY = '/nonexistent/ffmpeg'
+        video = VideoSubmission.objects.create(user=UserFactory(), **upload())
+
+        job = run_pipeline(video.pk)
+
+        assert job.status == 'failed'
+        assert 'not found' in job.error
+        assert job.attempts == 1
+        assert not VideoRendition.objects.exists()
+
+    def test_interrupted_transcode_fails_the_job_and_removes_outputs(self, settings, monkeypatch):
+        def fake_ffmpeg(*args):
+            with open(args[-1], 'wb') as output:
+                output.write(b'encoded')
+
+        def time_limit(variants):
+            raise SoftTimeLimitExceeded()
+
+        monkeypatch.setattr('lolo.tournament.transcoding.run_ffmpeg', fake_ffmpeg)
+        monkeypatch.setattr('lolo.tournament.transcoding.master_playlist', time_limit)
+        video = VideoSubmission.objects.create(user=UserFactory(), **upload())
+
+        with pytest.raises(SoftTimeLimitExceeded):
+            run_pipeline(video.pk)
+
+        job = TranscodeJob.objects.get(video=video)
+        assert job.status == 'failed'
+        assert job.finished_at
+        assert not VideoRendition.objects.exists()
+        outputs = os.path.join(settings.MEDIA_ROOT, 'video_renditions', str(video.pk))
+        assert not [name for _, _, names in os.walk(outputs) for name in names]
+
+    def test_retranscode_removes_previous_outputs(self, settings, monkeypatch, django_capture_on_commit_callbacks):
+        def fake_ffmpeg(*args):
+            with open(args[-1], 'wb') as output:
+                output.write(b'encoded')
+
+        monkeypatch.setattr('lolo.tournament.transcoding.run_ffmpeg', fake_ffmpeg)
+        video = VideoSubmission.objects.create(user=UserFactory(), **upload())
+        outputs = os.path.join(settings.MEDIA_ROOT, 'video_renditions', str(video.pk))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            first = run_pipeline(video.pk).hls_playlist.name
+        with django_capture_on_commit_callbacks(execute=True):
+            second = run_pipeline(video.pk).hls_playlist.name
+
+        assert first != second
+        runs = {os.path.relpath(root, outputs).split(os.sep)[0] for root, _, names in os.walk(outputs) if names}
+        assert runs == {second.split('/')[2]}
+        assert VideoRendition.objects.filter(video=video).exists()
+
+    @pytest.mark.skipif(shutil.which('ffmpeg') is None, reason='ffmpeg is not installed')
+    def test_renditions_and_cover_are_recorded(self, tmp_path):
+        source = tmp_path / 'source.mp4'
+        subprocess.run(
+            ['ffmpeg', '-y', '-loglevel', 'error', '-f', 'lavfi', '-i', 'testsrc=size=640x360:rate=25',
+             '-f', 'lavfi', '-i', 'sine', '-t', '2', '-c:v', 'libx264', '-c:a', 'aac', str(source)],
+            check=True
+        )
+        video = VideoSubmission.objects.create(
+            user=UserFactory(),
+            title='Source',
+            video_file=SimpleUploadedFile('source.mp4', source.read_bytes(), 'video/mp4'),
+            width=640,
+            height=360
+        )
+
+        job = run_pipeline(video.pk)
+
+        assert job.status == 'done', job.error
+        assert set(video.renditions.values_list('kind', 'label')) == {('mp4', '360p'), ('hls', '360p')}
+        assert b'360p/index.m3u8' in job.hls_playlist.read()
+        video.refresh_from_db()
+        assert video.processed
+        assert video.cover_image.name.endswith('.jpg')
+        assert TranscodeJob.objects.get(video=video).finished_at
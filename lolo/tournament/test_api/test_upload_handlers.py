@@ -0,0 +1,112 @@
+# lolo/tournament/test_api/test_upload_handlers.py
+import struct
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from PIL import Image
+
+from lolo.users.tests.factories import UserFactory
+from ..images import ImageHeaderIncomplete, ImageRejected, read_image_header
+from ..media_probe import ProbeError, sniff_container
+from ..models import VideoSubmission
+from ..upload_handlers import MediaUploadHandler, UploadRejected
+from .test_media_probe import avi, mp4
+from .test_resumable import client_for
+
+
+def encoded(image_format, size=(640, 480)):
+    image = BytesIO()
+    Image.new('RGB', size, 'blue').save(image, image_format)
+    return image.getvalue()
+
+
+class TestSniffing:
+    def test_containers(self):
+        assert sniff_container(mp4()[:64]) == 'mp4'
+        assert sniff_container(avi()[:64]) == 'avi'
+        with pytest.raises(ProbeError):
+            sniff_container(b'MZ\x90\x00' + bytes(60))
+        with pytest.raises(ProbeError):
+            sniff_container(struct.pack('>I4s', 16, b'ftyp') + bytes(8) + b'\x00\x00\x00\x10\x01\x02\x03\x04')
+
+    @pytest.mark.parametrize('image_format', ['JPEG', 'PNG', 'GIF', 'WEBP'])
+    def test_image_headers(self, image_format):
+        data = encoded(image_format)
+
+        assert read_image_header(data[:4096] if image_format != 'WEBP' else data[:64]) == (image_format, 640, 480)
+
+    def test_truncated_and_foreign_images(self):
+        with pytest.raises(ImageHeaderIncomplete):
+            read_image_header(encoded('PNG')[:16])
+        with pytest.raises(ImageRejected):
+            read_image_header(b'%PDF-1.7' + bytes(64))
+
+
+class TestHandler:
+    def test_rejects_on_the_first_chunk(self, settings):
+        handler = MediaUploadHandler()
+        handler.new_file('video_file', 'clip.mp4', 'video/mp4', None)
+
+        with pytest.raises(UploadRejected):
+            handler.receive_data_chunk(b'\x7fELF' + bytes(handler.chunk_size), 0)
+
+    def test_enforces_the_field_cap_while_streaming(self, settings):
+        settings.MAX_AVATAR_UPLOAD_SIZE = 1000
+        handler = MediaUploadHandler()
+        handler.new_file('avatar', 'me.png', 'image/png', None)
+        data = encoded('PNG')
+
+        assert handler.receive_data_chunk(data[:800], 0) == data[:800]
+        with pytest.raises(UploadRejected) as excinfo:
+            handler.receive_data_chunk(data[800:1600], 800)
+        assert excinfo.value.too_large
+
+    def test_extension_must_match_container(self):
+        handler = MediaUploadHandler()
+        handler.new_file('video_file', 'clip.avi', 'video/avi', None)
+        handler.receive_data_chunk(mp4(), 0)
+
+        with pytest.raises(UploadRejected, match='extension'):
+            handler.file_complete(len(mp4()))
+
+
+@pytest.mark.django_db
+class TestUploadEndpoint:
+    def post(self, video, cover):
+        return client_for(UserFactory()).post(
+            reverse('api:videosubmission-list'),
+            {'title': 'Clip', 'video_file': video, 'cover_image': cover},
+            format='multipart'
+        )
+
+    def test_valid_upload(self):
+        response = self.post(
+            SimpleUploadedFile('clip.mp4', mp4(), 'video/mp4'),
+            SimpleUploadedFile('cover.webp', encoded('WEBP'), 'image/webp')
+        )
+
+        assert response.status_code == 201, response.data
+        assert VideoSubmission.objects.count() == 1
+
+    def test_renamed_binary_is_refused(self):
+        response = self.post(
+            SimpleUploadedFile('clip.mp4', b'MZ' + bytes(200_000), 'video/mp4'),
+            SimpleUploadedFile('cover.png', encoded('PNG'), 'image/png')
+        )
+
+        assert response.status_code == 400
+        assert 'video_file' in response.data
+        assert not VideoSubmission.objects.exists()
+
+    def test_oversized_cover_is_refused(self, settings):
+        settings.MAX_IMAGE_UPLOAD_SIZE = 1024
+
+        response = self.post(
+            SimpleUploadedFile('clip.mp4', mp4(), 'video/mp4'),
+            SimpleUploadedFile('cover.jpg', encoded('JPEG', (1200, 900)), 'image/jpeg')
+        )
+
+        assert response.status_code == 413
+        assert 'cover_image' in response.data
@@ -0,0 +1,134 @@
+# lolo/tournament/test_api/test_view_counters.py
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from redis.exceptions import ConnectionError as RedisConnectionError
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from lolo.users.tests.factories import UserFactory
+from ..models import Category, Participation, Tournament, VideoSubmission, ViewFlush
+from ..tasks import flush_view_counters
+from ..view_counters import BUFFER_KEYS, flush_views, live_views_count, record_view
+
+
+@pytest.fixture
+def participation():
+    now = timezone.now()
+    tournament = Tournament.objects.create(
+        title='Viewed',
+        description='Viewed',
+        category=Category.objects.create(name='Views'),
+        start_time=now - timezone.timedelta(days=1),
+        end_time=now + timezone.timedelta(days=1)
+    )
+    entrant = UserFactory()
+    return Participation.objects.create(
+        user=entrant,
+        tournament=tournament,
+        video_submission=VideoSubmission.objects.create(
+            title='Entry',
+            user=entrant,
+            video_file='tournament_videos/entry.mp4',
+            cover_image='video_covers/entry.jpg'
+        )
+    )
+
+
+@pytest.mark.django_db
+class TestBufferedViewCounters:
+    def test_views_are_buffered_until_flushed(self, participation, redis_client):
+        client = APIClient()
+        client.force_authenticate(user=UserFactory())
+        url = reverse('api:tournament-video-detail', kwargs={'pk': participation.tournament_id})
+
+        client.get(url, {'video_id': participation.video_submission_id})
+        response = client.get(url, {'video_id': participation.video_submission_id})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['video']['views_count'] == 2
+        video = VideoSubmission.objects.get(pk=participation.video_submission_id)
+        assert video.views_count == 0
+
+        flush_view_counters()
+
+        video.refresh_from_db()
+        assert video.views_count == 2
+        assert live_views_count(video) == 2
+        assert not redis_client.exists(BUFFER_KEYS[VideoSubmission])
+
+    def test_retrieve_buffers_tournament_view(self, participation):
+        client = APIClient()
+        client.force_authenticate(user=UserFactory())
+
+        client.get(reverse('api:tournament-detail', kwargs={'pk': participation.tournament_id}))
+        flush_view_counters()
+
+        participation.tournament.refresh_from_db()
+        assert participation.tournament.views_count == 1
+
+    def test_interrupted_flush_is_retried(self, participation, redis_client):
+        tournament = participation.tournament
+        key = BUFFER_KEYS[Tournament]
+        # A flush claimed this batch and died before applying it
+        record_view(Tournament, tournament.pk)
+        redis_client.rename(key, f'{key}:batch:claimed')
+        redis_client.sadd(f'{key}:batches', f'{key}:batch:claimed')
+        record_view(Tournament, tournament.pk)
+
+        flush_view_counters()
+        flush_view_counters()
+
+        tournament.refresh_from_db()
+        assert tournament.views_count == 2
+        assert not redis_client.exists(f'{key}:batches')
+
+    def test_claimed_batch_still_counts_as_live(self, participation, redis_client):
+        tournament = participation.tournament
+        key = BUFFER_KEYS[Tournament]
+        # A flush has claimed this batch but not applied it yet
+        record_view(Tournament, tournament.pk)
+        redis_client.rename(key, f'{key}:batch:claimed')
+        redis_client.sadd(f'{key}:batches', f'{key}:batch:claimed')
+        record_view(Tournament, tournament.pk)
+
+        assert live_views_count(tournament) == 2
+
+    def test_applied_batch_is_not_applied_again(self, participation, redis_client):
+        tournament = participation.tournament
+        key = BUFFER_KEYS[Tournament]
+        # A flush committed this batch but died before deleting it from Redis
+        record_view(Tournament, tournament.pk)
+        redis_client.rename(key, f'{key}:batch:applied')
+        redis_client.sadd(f'{key}:batches', f'{key}:batch:applied')
+        ViewFlush.objects.create(batch=f'{key}:batch:applied')
+
+        assert flush_views(Tournament) == 0
+
+        tournament.refresh_from_db()
+        assert tournament.views_count == 0
+        assert not redis_client.exists(f'{key}:batch:applied')
+
+    def test_overlapping_flush_backs_off(self, participation, redis_client):
+        tournament = participation.tournament
+        record_view(Tournament, tournament.pk)
+        redis_client.set(f'{BUFFER_KEYS[Tournament]}:lock', b'other')
+
+        assert flush_views(Tournament) == 0
+        redis_client.delete(f'{BUFFER_KEYS[Tournament]}:lock')
+        assert flush_views(Tournament) == 1
+
+        tournament.refresh_from_db()
+        assert tournament.views_count == 1
+        assert not redis_client.exists(f'{BUFFER_KEYS[Tournament]}:lock')
+
+    def test_falls_back_to_direct_update_without_redis(self, participation, redis_client, monkeypatch):
+        def unavailable(*args, **kwargs):
+            raise RedisConnectionError
+
+        monkeypatch.setattr(redis_client, 'hincrby', unavailable)
+
+        record_view(Tournament, participation.tournament_id)
+
+        participation.tournament.refresh_from_db()
+        assert participation.tournament.views_count == 1
@@ -0,0 +1,98 @@
+# lolo/tournament/test_api/test_vote.py
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from lolo.users.tests.factories import UserFactory
+from ..models import Category, Participation, Tournament, VideoSubmission, Vote
+
+
+@pytest.fixture
+def tournament():
+    now = timezone.now()
+    return Tournament.objects.create(
+        title='Voting',
+        description='Voting',
+        category=Category.objects.create(name='Votes'),
+        start_time=now - timezone.timedelta(days=1),
+        end_time=now + timezone.timedelta(days=1)
+    )
+
+
+def enter(tournament, user=None):
+    user = user or UserFactory()
+    return Participation.objects.create(
+        user=user,
+        tournament=tournament,
+        video_submission=VideoSubmission.objects.create(title='Entry', user=user)
+    )
+
+
+def cast(tournament, voter, participation_id):
+    client = APIClient()
+    client.force_authenticate(user=voter)
+    return client.post(
+        reverse('api:tournament-vote', kwargs={'pk': tournament.pk}),
+        {'participation_id': participation_id}
+    )
+
+
+@pytest.mark.django_db
+class TestVote:
+    def test_vote_returns_slim_payload(self, tournament):
+        voter = enter(tournament).user
+        target = enter(tournament)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = cast(tournament, voter, target.id)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['participation'] == {'id': target.id, 'votes_received': 1}
+        # tournament lookup, the combined entry check and the post-update read
+        selects = [query for query in queries.captured_queries if query['sql'].startswith('SELECT')]
+        assert len(selects) == 3
+
+    def test_second_vote_is_rejected_by_constraint(self, tournament):
+        voter = enter(tournament).user
+        target = enter(tournament)
+        other = enter(tournament)
+
+        cast(tournament, voter, target.id)
+        response = cast(tournament, voter, other.id)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Vote.objects.filter(voter=voter).count() == 1
+        other.refresh_from_db()
+        tournament.refresh_from_db()
+        assert other.votes_received == 0
+        assert tournament.vote_count == 1
+
+    @pytest.mark.parametrize('case, expected', [
+        ('outsider', status.HTTP_403_FORBIDDEN),
+        # The participant check comes before the id is validated
+        ('outsider_garbage', status.HTTP_403_FORBIDDEN),
+        ('missing', status.HTTP_400_BAD_REQUEST),
+        ('unknown', status.HTTP_404_NOT_FOUND),
+        ('garbage', status.HTTP_404_NOT_FOUND),
+        ('own', status.HTTP_400_BAD_REQUEST),
+    ])
+    def test_rejections(self, tournament, case, expected):
+        own = enter(tournament)
+        voter = UserFactory() if case.startswith('outsider') else own.user
+        participation_id = {
+            'outsider': enter(tournament).id,
+            'outsider_garbage': 'abc',
+            'missing': '',
+            'unknown': 999999,
+            'garbage': 'abc',
+            'own': own.id,
+        }[case]
+
+        response = cast(tournament, voter, participation_id)
+
+        assert response.status_code == expected
+        assert not Vote.objects.exists()
@@ -0,0 +1,294 @@
+# lolo/tournament/transcoding.py
+import logging
+import os
+import posixpath
+import shutil
+import subprocess
+import tempfile
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .images import queue_derivatives
+from .models import TranscodeJob, VideoRendition, VideoSubmission
+from .redis_store import get_redis
+
+logger = logging.getLogger(__name__)
+
+# (label, short edge, video kbit/s), best first. Rungs above the source are skipped.
+RENDITION_LADDER = [
+    ('1080p', 1080, 5000),
+    ('720p', 720, 2800),
+    ('480p', 480, 1400),
+    ('360p', 360, 800),
+]
+AUDIO_BITRATE = 128
+HLS_SEGMENT_SECONDS = 4
+# Covers larger than this are replaced by an extracted frame
+MAX_COVER_SIZE = 1024 * 1024
+COVER_MAX_WIDTH = 1280
+# Slots are held for at most the task's hard time limit
+TRANSCODE_SLOT_TIMEOUT = 60 * 60
+TRANSCODE_SLOT_KEY = 'transcode:slot:{}'
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class TranscodeError(Exception):
+    """ffmpeg is missing or failed"""
+
+
+def rendition_ladder(width, height):
+    """Rungs no larger than the source; always at least the smallest one"""
+    if not (width and height):
+        return RENDITION_LADDER
+    rungs = [rung for rung in RENDITION_LADDER if rung[1] <= min(width, height)]
+    return rungs or RENDITION_LADDER[-1:]
+
+
+def rendition_size(width, height, short_edge):
+    """Output size with the given short edge, keeping the aspect ratio (portrait too)"""
+    if not (width and height):
+        return short_edge * 16 // 9, short_edge
+    if width >= height:
+        return round(width * short_edge / height / 2) * 2, short_edge
+    return short_edge, round(height * short_edge / width / 2) * 2
+
+
+def master_playlist(variants):
+    """HLS master playlist for (label, width, height, kbit/s) variants"""
+    lines = ['#EXTM3U', '#EXT-X-VERSION:3']
+    for label, width, height, bitrate in variants:
+        bandwidth = (bitrate + AUDIO_BITRATE) * 1000
+        lines.append(f'#EXT-X-STREAM-INF:BANDWIDTH={bandwidth},RESOLUTION={width}x{height}')
+        lines.append(f'{label}/index.m3u8')
+    return '\n'.join(lines) + '\n'
+
+
+def acquire_slot():
+    """
+    Take one of VIDEO_TRANSCODE_CONCURRENCY cluster-wide slots, returning its
+    key, or None when all are busy. Caps transcodes across every media worker.
+    """
+    redis = get_redis()
+    for index in range(settings.VIDEO_TRANSCODE_CONCURRENCY):
+        key = TRANSCODE_SLOT_KEY.format(index)
+        if redis.set(key, 1, nx=True, ex=TRANSCODE_SLOT_TIMEOUT):
+            return key
+    return None
+
+
+def release_slot(key):
+    get_redis().delete(key)
+
+
+def run_ffmpeg(*args):
+    try:
+        subprocess.run(
+            [settings.FFMPEG_BINARY, '-hide_banner', '-loglevel', 'error', '-y', *args],
+            check=True,
+            capture_output=True,
+            stdin=subprocess.DEVNULL
+        )
+    except FileNotFoundError:
+        raise TranscodeError(f"ffmpeg binary not found: {settings.FFMPEG_BINARY}")
+    except subprocess.CalledProcessError as e:
+        raise TranscodeError(e.stderr.decode(errors='replace')[-2000:])
+
+
+@contextmanager
+def local_source(field_file, workdir):
+    """A filesystem path for the stored video, streamed down if storage is remote"""
+    try:
+        path = field_file.path
+    except NotImplementedError:
+        path = os.path.join(workdir, 'source' + posixpath.splitext(field_file.name)[1])
+        with field_file.open('rb') as source, open(path, 'wb') as target:
+            shutil.copyfileobj(source, target, COPY_CHUNK_SIZE)
+    yield path
+
+
+def _store(path, name, stored):
+    with open(path, 'rb') as handle:
+        name = default_storage.save(name, File(handle))
+    stored.append(name)
+    return name
+
+
+def _discard(storage, names):
+    """Best-effort removal of outputs that never made it into the database"""
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception:
+            logger.exception("Could not delete transcode output %s", name)
+
+
+def _stored_under(storage, directory):
+    """Every file name below `directory` in `storage`"""
+    directories, files = storage.listdir(directory)
+    names = [posixpath.join(directory, name) for name in files]
+    for subdirectory in directories:
+        names.extend(_stored_under(storage, posixpath.join(directory, subdirectory)))
+    return names
+
+
+def _discard_runs(storage, directories):
+    """Best-effort removal of earlier runs' outputs, HLS segments included"""
+    for directory in directories:
+        try:
+            names = _stored_under(storage, directory)
+        except Exception:
+            logger.exception("Could not list transcode outputs in %s", directory)
+            continue
+        _discard(storage, names)
+
+
+def transcode(video, stored):
+    """
+    Encode each rung of the ladder to a faststart MP4, remux it into HLS
+    segments without re-encoding, write a master playlist and, if needed,
+    extract a cover frame. Returns (renditions, playlist name, cover name).
+    Every stored name is appended to `stored` as soon as it is written.
+    """
+    prefix = f'video_renditions/{video.pk}/{uuid.uuid4().hex}'
+    renditions, variants = [], []
+    cover = None
+
+    with tempfile.TemporaryDirectory(prefix='transcode-') as workdir:
+        with local_source(video.video_file, workdir) as source:
+            for label, short_edge, bitrate in rendition_ladder(video.width, video.height):
+                width, height = rendition_size(video.width, video.height, short_edge)
+                mp4_path = os.path.join(workdir, f'{label}.mp4')
+                run_ffmpeg(
+                    '-i', source,
+                    '-vf', f'scale={width}:{height}' if video.height else f'scale=-2:{short_edge}',
+                    '-c:v', 'libx264', '-preset', 'veryfast', '-profile:v', 'main',
+                    '-b:v', f'{bitrate}k', '-maxrate', f'{bitrate * 3 // 2}k', '-bufsize', f'{bitrate * 2}k',
+                    # Keyframes line up with segment boundaries
+                    '-force_key_frames', f'expr:gte(t,n_forced*{HLS_SEGMENT_SECONDS})',
+                    '-c:a', 'aac', '-b:a', f'{AUDIO_BITRATE}k',
+                    '-movflags', '+faststart',
+                    mp4_path
+                )
+                hls_dir = os.path.join(workdir, label)
+                os.mkdir(hls_dir)
+                run_ffmpeg(
+                    '-i', mp4_path,
+                    '-c', 'copy',
+                    '-f', 'hls',
+                    '-hls_time', str(HLS_SEGMENT_SECONDS),
+                    '-hls_playlist_type', 'vod',
+                    '-hls_segment_filename', os.path.join(hls_dir, 'segment_%04d.ts'),
+                    os.path.join(hls_dir, 'index.m3u8')
+                )
+
+                renditions.append(VideoRendition(
+                    video=video, kind='mp4', label=label, width=width, height=height, bitrate=bitrate,
+                    file=_store(mp4_path, f'{prefix}/{label}.mp4', stored)
+                ))
+                for filename in sorted(os.listdir(hls_dir)):
+                    name = _store(os.path.join(hls_dir, filename), f'{prefix}/{label}/{filename}', stored)
+                    if filename == 'index.m3u8':
+                        renditions.append(VideoRendition(
+                            video=video, kind='hls', label=label, width=width, height=height,
+                            bitrate=bitrate, file=name
+                        ))
+                variants.append((label, width, height, bitrate))
+
+            master_path = os.path.join(workdir, 'master.m3u8')
+            with open(master_path, 'w') as master:
+                master.write(master_playlist(variants))
+            playlist = _store(master_path, f'{prefix}/master.m3u8', stored)
+
+            if needs_cover(video):
+                cover_path = os.path.join(workdir, 'cover.jpg')
+                seek = min(1.0, video.duration.total_seconds() / 2) if video.duration else 0
+                run_ffmpeg(
+                    '-ss', str(seek),
+                    '-i', source,
+                    '-frames:v', '1',
+                    '-vf', f"scale='min({COVER_MAX_WIDTH},iw)':-2",
+                    '-q:v', '3',
+                    cover_path
+                )
+                cover = _store(
+                    cover_path,
+                    video.cover_image.field.generate_filename(video, f'{video.pk}_cover.jpg'),
+                    stored
+                )
+
+    return renditions, playlist, cover
+
+
+def needs_cover(video):
+    if not video.cover_image:
+        return True
+    try:
+        return video.cover_image.size > MAX_COVER_SIZE
+    except OSError:
+        return True
+
+
+def run_pipeline(video_id):
+    """
+    Transcode a submission and record the result. Returns the job, or None
+    if the video is gone. Failures are recorded on the job; ffmpeg failures
+    are not raised, anything else is re-raised once recorded.
+    """
+    video = VideoSubmission.objects.filter(pk=video_id).first()
+    if video is None or not video.video_file:
+        return None
+    job, _ = TranscodeJob.objects.get_or_create(video=video)
+    TranscodeJob.objects.filter(pk=job.pk).update(
+        status='running',
+        error='',
+        attempts=F('attempts') + 1,
+        started_at=timezone.now()
+    )
+
+    # Each run writes under its own directory; the previous one's files are
+    # only dropped once the new renditions have replaced them
+    previous = {
+        posixpath.dirname(name)
+        for name in [job.hls_playlist.name, *VideoRendition.objects.filter(
+            video=video, kind='mp4'
+        ).values_list('file', flat=True)]
+        if name
+    }
+    stored = []
+    try:
+        renditions, playlist, cover = transcode(video, stored)
+        with transaction.atomic():
+            VideoRendition.objects.filter(video=video).delete()
+            VideoRendition.objects.bulk_create(renditions)
+            fields = {'processed': True}
+            if cover:
+                fields['cover_image'] = cover
+            # update() keeps the save signals from queueing the pipeline again
+            VideoSubmission.objects.filter(pk=video.pk).update(**fields)
+            queue_derivatives(cover)
+            TranscodeJob.objects.filter(pk=job.pk).update(
+                status='done',
+                hls_playlist=playlist,
+                finished_at=timezone.now()
+            )
+            transaction.on_commit(lambda: _discard_runs(default_storage, previous))
+    except Exception as e:
+        # Time limits and storage errors too: the job must never stay 'running'
+        logger.warning("Transcoding video %s failed: %s", video_id, e)
+        _discard(default_storage, stored)
+        TranscodeJob.objects.filter(pk=job.pk).update(
+            status='failed',
+            error=str(e) or type(e).__name__,
+            finished_at=timezone.now()
+        )
+        if not isinstance(e, TranscodeError):
+            raise
+    job.refresh_from_db()
+    return job
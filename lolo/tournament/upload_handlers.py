@@ -0,0 +1,105 @@
+# lolo/tournament/upload_handlers.py
+import posixpath
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler
+
+from .images import IMAGE_HEADER_LIMIT, ImageHeaderIncomplete, ImageRejected, read_image_header
+from .media_probe import ProbeError, sniff_container
+
+# Container each allowed video extension must actually hold
+VIDEO_CONTAINERS = {'mp4': 'mp4', 'mov': 'mp4', 'avi': 'avi'}
+# Leading bytes of a video whose box/chunk headers are checked
+VIDEO_SNIFF_SIZE = 64 * 1024
+
+
+def video_content_error(head, extension):
+    """Why the first VIDEO_SNIFF_SIZE bytes of a video aren't a .`extension` file, or None"""
+    try:
+        container = sniff_container(head[:VIDEO_SNIFF_SIZE])
+    except ProbeError as e:
+        return f"Not a valid video file: {e}"
+    if container != VIDEO_CONTAINERS.get(extension):
+        return f"File content doesn't match the .{extension} extension"
+    return None
+
+
+class UploadRejected(Exception):
+    """A file upload was refused while it was still streaming in"""
+
+    def __init__(self, field_name, message, too_large=False):
+        super().__init__(message)
+        self.field_name = field_name
+        self.too_large = too_large
+
+
+def upload_rules():
+    """Upload field name -> (kind, max bytes); other file fields only get the global cap"""
+    return {
+        'video_file': ('video', settings.MAX_UPLOAD_SIZE),
+        'cover_image': ('image', settings.MAX_IMAGE_UPLOAD_SIZE),
+        'image': ('image', settings.MAX_IMAGE_UPLOAD_SIZE),
+        'logo': ('image', settings.MAX_IMAGE_UPLOAD_SIZE),
+        'avatar': ('image', settings.MAX_AVATAR_UPLOAD_SIZE),
+    }
+
+
+class MediaUploadHandler(FileUploadHandler):
+    """
+    Runs ahead of Django's storing handlers and refuses a file as soon as its
+    first chunks show it is wrong: bad magic bytes or container structure, an
+    unparseable image header, or more bytes than its field allows. Chunks are
+    passed on untouched, so an accepted upload costs one header parse.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.rules = upload_rules()
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        self.kind, self.limit = self.rules.get(field_name, (None, settings.MAX_UPLOAD_SIZE))
+        self.head = b''
+        self.checked = self.kind is None
+        if self.content_length and self.content_length > self.limit:
+            self.reject(f"File exceeds the {self.limit} byte limit", too_large=True)
+        if self.kind == 'video':
+            self.extension = posixpath.splitext(file_name)[1].lower().lstrip('.')
+            if self.extension not in VIDEO_CONTAINERS or self.extension not in settings.ALLOWED_VIDEO_EXTENSIONS:
+                self.reject(f"File type not supported. Allowed types: {', '.join(settings.ALLOWED_VIDEO_EXTENSIONS)}")
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.limit:
+            self.reject(f"File exceeds the {self.limit} byte limit", too_large=True)
+        if not self.checked:
+            self.head += raw_data
+            self.check(complete=False)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if not self.checked:
+            self.check(complete=True)
+        # The next handler builds the file object
+        return None
+
+    def check(self, complete):
+        if self.kind == 'video':
+            if len(self.head) < VIDEO_SNIFF_SIZE and not complete:
+                return
+            error = video_content_error(self.head, self.extension)
+            if error:
+                self.reject(error)
+        else:
+            try:
+                read_image_header(self.head)
+            except ImageHeaderIncomplete as e:
+                if not complete and len(self.head) < IMAGE_HEADER_LIMIT:
+                    return
+                self.reject(f"Upload a valid image: {e}")
+            except ImageRejected as e:
+                self.reject(str(e))
+        self.checked = True
+        self.head = b''
+
+    def reject(self, message, too_large=False):
+        raise UploadRejected(self.field_name, message, too_large=too_large)
@@ -0,0 +1,13 @@
+# lolo/tournament/urls.py
+from django.urls import re_path
+
+from .views import stream_video
+
+app_name = "tournament"
+urlpatterns = [
+    re_path(
+        r"^(?P<name>(?:tournament_videos|video_renditions)/.+)$",
+        stream_video,
+        name="stream-video",
+    ),
+]
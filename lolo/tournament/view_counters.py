@@ -0,0 +1,150 @@
+# lolo/tournament/view_counters.py
+import logging
+import uuid
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+from redis.exceptions import RedisError, WatchError
+
+from .models import Tournament, VideoSubmission, ViewFlush
+from .redis_store import get_redis
+
+logger = logging.getLogger(__name__)
+
+# One Redis hash per model: field = object id, value = views not yet flushed
+BUFFER_KEYS = {
+    Tournament: 'views:tournament',
+    VideoSubmission: 'views:videosubmission',
+}
+FLUSH_BATCH_SIZE = 500
+# Only one flush per model runs at a time; the lock outlives any sane flush
+FLUSH_LOCK_TIMEOUT = 5 * 60
+# Applied-batch markers are kept long enough to outlast any batch left in Redis
+VIEW_FLUSH_RETENTION = timedelta(days=1)
+
+
+def record_view(model, pk):
+    """Buffer a single view; falls back to a direct UPDATE without Redis"""
+    try:
+        get_redis().hincrby(BUFFER_KEYS[model], pk, 1)
+    except RedisError:
+        logger.warning("View buffer unavailable, writing %s %s directly", model.__name__, pk)
+        model.objects.filter(pk=pk).update(views_count=F('views_count') + 1)
+
+
+def pending_views(model, pks):
+    """
+    Views per id that have not reached the database yet: the live hash plus
+    any batches claimed by a flush but not yet applied. Only while a batch
+    is being applied can a count be briefly off by that batch.
+    """
+    pks = list(pks)
+    if not pks:
+        return {}
+    key = BUFFER_KEYS[model]
+    client = get_redis()
+    try:
+        # One MULTI, so views renamed into a new batch are read in exactly one place
+        pipe = client.pipeline()
+        pipe.smembers(f'{key}:batches')
+        pipe.hmget(key, pks)
+        batches, live = pipe.execute()
+        pipe = client.pipeline(transaction=False)
+        for batch_key in batches:
+            pipe.hmget(batch_key, pks)
+        buffered = [live, *pipe.execute()]
+    except RedisError:
+        return {}
+    pending = {}
+    for values in buffered:
+        for pk, value in zip(pks, values):
+            if value:
+                pending[pk] = pending.get(pk, 0) + int(value)
+    return pending
+
+
+def live_views_count(obj):
+    """views_count of an instance including its buffered views"""
+    return obj.views_count + pending_views(type(obj), [obj.pk]).get(obj.pk, 0)
+
+
+def _release_lock(client, lock_key, token):
+    """Delete the lock only if it is still ours; it may have expired and been retaken"""
+    with client.pipeline() as pipe:
+        try:
+            pipe.watch(lock_key)
+            if pipe.get(lock_key) == token:
+                pipe.multi()
+                pipe.delete(lock_key)
+                pipe.execute()
+        except WatchError:
+            pass
+
+
+def _apply_batch(model, client, batch_key):
+    """
+    Add one claimed batch to views_count. The ViewFlush marker commits with
+    the counts, so a batch whose Redis copy outlived a crash is only deleted.
+    """
+    deltas = {
+        int(pk): int(delta)
+        for pk, delta in client.hgetall(batch_key).items()
+    }
+    pks = sorted(deltas)
+    with transaction.atomic():
+        _, created = ViewFlush.objects.get_or_create(batch=batch_key)
+        if created:
+            for start in range(0, len(pks), FLUSH_BATCH_SIZE):
+                batch = pks[start:start + FLUSH_BATCH_SIZE]
+                model.objects.filter(pk__in=batch).update(
+                    views_count=F('views_count') + Case(
+                        *[When(pk=pk, then=Value(deltas[pk])) for pk in batch],
+                        default=Value(0),
+                        output_field=IntegerField()
+                    )
+                )
+    pipe = client.pipeline()
+    pipe.delete(batch_key)
+    pipe.srem(f'{BUFFER_KEYS[model]}:batches', batch_key)
+    pipe.execute()
+    return sum(deltas.values()) if created else 0
+
+
+def flush_views(model):
+    """
+    Move buffered views for `model` into views_count with batched UPDATEs.
+    Under a per-model lock, the live hash is renamed to a uniquely named
+    batch (views recorded meanwhile land in a fresh hash) and the batch is
+    registered in one MULTI. Registered batches, including any left by a
+    failed flush, are then applied exactly once.
+    """
+    client = get_redis()
+    key = BUFFER_KEYS[model]
+    batches_key = f'{key}:batches'
+    lock_key = f'{key}:lock'
+    token = uuid.uuid4().hex.encode()
+    if not client.set(lock_key, token, nx=True, ex=FLUSH_LOCK_TIMEOUT):
+        return 0
+    try:
+        # record_view only ever adds to the live hash, so it can't vanish before the rename
+        if client.exists(key):
+            batch_key = f'{key}:batch:{uuid.uuid4().hex}'
+            pipe = client.pipeline()
+            pipe.rename(key, batch_key)
+            pipe.sadd(batches_key, batch_key)
+            pipe.execute()
+
+        flushed = sum(
+            _apply_batch(model, client, batch_key.decode())
+            for batch_key in client.smembers(batches_key)
+        )
+    finally:
+        _release_lock(client, lock_key, token)
+    ViewFlush.objects.filter(flushed_at__lt=timezone.now() - VIEW_FLUSH_RETENTION).delete()
+    return flushed
+
+
+def flush_all_views():
+    return {model.__name__: flush_views(model) for model in BUFFER_KEYS}
@@ -1,3 +1,20 @@
-from django.shortcuts import render
+# lolo/tournament/views.py
+from django.core.exceptions import SuspiciousFileOperation
+from django.db import transaction
+from django.http import Http404
+from django.views.decorators.http import require_safe
 
-# Create your views here.
+from .streaming import VIDEO_STREAM_PREFIXES, range_response
+
+
+# Streams can outlive any sensible transaction and never touch the database
+@transaction.non_atomic_requests
+@require_safe
+def stream_video(request, name):
+    """Byte-range video streaming for uploads and renditions"""
+    if not name.startswith(VIDEO_STREAM_PREFIXES):
+        raise Http404
+    try:
+        return range_response(request, name)
+    except (FileNotFoundError, IsADirectoryError, SuspiciousFileOperation):
+        raise Http404
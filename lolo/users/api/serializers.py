@@ -1,12 +1,15 @@
 from rest_framework import serializers
 
+from lolo.tournament.api.fields import MEDIA_FIELD_MAPPING, ImageVariantsField
 from lolo.users.models import User
 
 
 class UserSerializer(serializers.ModelSerializer[User]):
+    avatar_variants = ImageVariantsField(source='avatar')
+
     class Meta:
         model = User
-        fields = ["username", "name", "url", "tickets", "bio", "avatar","first_time_login",]
+        fields = ["username", "name", "url", "tickets", "bio", "avatar", "avatar_variants", "first_time_login",]
         read_only_fields = ('email',)
         extra_kwargs = {
             "url": {"view_name": "api:user-detail", "lookup_field": "username"},
@@ -14,6 +17,15 @@ class UserSerializer(serializers.ModelSerializer[User]):
 
 # Optional: Create a separate serializer for profile updates
 class UserProfileUpdateSerializer(serializers.ModelSerializer[User]):
+    serializer_field_mapping = MEDIA_FIELD_MAPPING
+
     class Meta:
         model = User
-        fields = ["name", "bio", "avatar","first_time_login"]
\ No newline at end of file
+        fields = ["name", "bio", "avatar","first_time_login"]
+
+    def update(self, instance, validated_data):
+        # The user may come from the auth cache; only write the edited fields
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=list(validated_data))
+        return instance
\ No newline at end of file
@@ -8,10 +8,12 @@ from rest_framework.viewsets import GenericViewSet
 from dj_rest_auth.registration.views import VerifyEmailView
 from rest_framework import status
 from rest_framework.decorators import api_view
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import FormParser, JSONParser
+from django.conf import settings
 from django.utils.translation import gettext_lazy as _
+from lolo.tournament.api.parsers import MediaMultiPartParser
+from lolo.users.authentication import email_verification
 from lolo.users.models import User
-from allauth.account.models import EmailAddress
 
 from .serializers import UserSerializer, UserProfileUpdateSerializer
 
@@ -20,7 +22,7 @@ class UserViewSet(RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericV
     serializer_class = UserSerializer
     queryset = User.objects.all()
     lookup_field = "username"
-    parser_classes = (MultiPartParser, FormParser, JSONParser)
+    parser_classes = (MediaMultiPartParser, FormParser, JSONParser)
 
     def get_queryset(self, *args, **kwargs):
         assert isinstance(self.request.user.id, int)
@@ -35,16 +37,9 @@ class UserViewSet(RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericV
         user = request.user
         serializer = UserSerializer(user, context={"request": request})
         
-        # Get email verification status from allauth
-        email_status = EmailAddress.objects.filter(user=user).first()
-        
-        # Combine user data with email status
+        # Combine user data with email status (cached with the auth token)
         data = serializer.data
-        data['email_verification'] = {
-            'email': user.email,
-            'verified': email_status.verified if email_status else False,
-            'primary': email_status.primary if email_status else False,
-        }
+        data['email_verification'] = email_verification(user)
         
         return Response(data)
 
@@ -54,14 +49,7 @@ class UserViewSet(RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericV
         A dedicated endpoint just for checking email status
         Like looking at just the "verified" checkmark
         """
-        user = request.user
-        email_status = EmailAddress.objects.filter(user=user).first()
-        
-        return Response({
-            'email': user.email,
-            'verified': email_status.verified if email_status else False,
-            'primary': email_status.primary if email_status else False
-        })
+        return Response(email_verification(request.user))
     
     
 
@@ -89,9 +77,15 @@ class UserViewSet(RetrieveModelMixin, ListModelMixin, UpdateModelMixin, GenericV
                 {'error': _('No avatar file provided')},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        if request.FILES['avatar'].size > settings.MAX_AVATAR_UPLOAD_SIZE:
+            return Response(
+                {'error': _('Avatar must be at most %(size)s bytes') % {'size': settings.MAX_AVATAR_UPLOAD_SIZE}},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
         request.user.avatar = request.FILES['avatar']
-        request.user.save()
+        # The user may come from the auth cache; only write the avatar
+        request.user.save(update_fields=['avatar'])
         return Response(
             UserSerializer(request.user, context={"request": request}).data
         )
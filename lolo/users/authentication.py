@@ -0,0 +1,73 @@
+import hashlib
+
+from allauth.account.models import EmailAddress
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+
+# Snapshots are also dropped explicitly whenever the user, token or email changes
+AUTH_TOKEN_CACHE_TIMEOUT = 2 * 60
+
+
+def token_cache_key(key):
+    # Never put raw tokens in cache key listings
+    return f'auth:token:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def _email_verification(user):
+    email_status = EmailAddress.objects.filter(user=user).first()
+    return {
+        'email': user.email,
+        'verified': email_status.verified if email_status else False,
+        'primary': email_status.primary if email_status else False,
+    }
+
+
+def email_verification(user):
+    """The user's allauth email status; cached with their token snapshot"""
+    status = getattr(user, '_email_verification', None)
+    if status is None:
+        status = user._email_verification = _email_verification(user)
+    return status
+
+
+def forget_token(key):
+    cache.delete(token_cache_key(key))
+
+
+def invalidate_user(user_id):
+    """
+    Drop the cached snapshots for the user's tokens, now and again once the
+    current transaction commits, so a request that read the old row while
+    the change was in flight can't leave it cached.
+    """
+    keys = [token_cache_key(key) for key in Token.objects.filter(user_id=user_id).values_list('key', flat=True)]
+    if keys:
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication backed by a short-lived token -> (token, user, email
+    status) snapshot in the cache, so authenticated requests skip the
+    Token/User join.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        snapshot = cache.get(cache_key)
+        if snapshot is None:
+            user, token = super().authenticate_credentials(key)
+            snapshot = (token, email_verification(user))
+            cache.set(cache_key, snapshot, AUTH_TOKEN_CACHE_TIMEOUT)
+            return user, token
+
+        token, email_status = snapshot
+        user = token.user
+        if not user.is_active:
+            raise AuthenticationFailed('User inactive or deleted.')
+        user._email_verification = email_status
+        return user, token
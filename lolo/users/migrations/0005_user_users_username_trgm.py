@@ -0,0 +1,44 @@
+# Generated by Django 5.0.9 on 2026-10-17 04:41
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+# pg_trgm ships with the standard PostgreSQL contrib package but not with every
+# managed or embedded server. Without it username searches still work, they
+# just aren't index-backed, so the index is only built where it can be.
+CREATE_TRIGRAM_INDEX = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX IF NOT EXISTS users_username_trgm
+            ON users_user USING gin (UPPER(username) gin_trgm_ops);
+    END IF;
+END
+$$;
+"""
+
+DROP_TRIGRAM_INDEX = "DROP INDEX IF EXISTS users_username_trgm;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0004_user_first_time_login'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(CREATE_TRIGRAM_INDEX, DROP_TRIGRAM_INDEX),
+            ],
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='user',
+                    index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('username'), name='gin_trgm_ops'), name='users_username_trgm'),
+                ),
+            ],
+        ),
+    ]
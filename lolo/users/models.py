@@ -1,4 +1,6 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
 from django.db.models import CharField, PositiveIntegerField
 from django.db import models
 from django.urls import reverse
@@ -28,7 +30,18 @@ class User(AbstractUser):
         _("First Time Login"),
         default=True,  # Everyone starts with True (they're new!)
         help_text=_("Indicates if this is the user's first time logging in")
-    )    
+    )
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Serves username__icontains, which Django compiles to
+            # UPPER(username) LIKE UPPER('%term%')
+            GinIndex(
+                OpClass(Upper('username'), name='gin_trgm_ops'),
+                name='users_username_trgm',
+            ),
+        ]
+
     def get_absolute_url(self) -> str:
         """Get URL for user's detail view.
 
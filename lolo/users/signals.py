@@ -0,0 +1,26 @@
+from allauth.account.models import EmailAddress
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import forget_token, invalidate_user
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_snapshots(sender, instance, **kwargs):
+    # Profile edits, password changes and deactivation all save the user
+    invalidate_user(instance.pk)
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    # Logout deletes the token
+    forget_token(instance.key)
+
+
+@receiver(post_save, sender=EmailAddress)
+@receiver(post_delete, sender=EmailAddress)
+def invalidate_email_status(sender, instance, **kwargs):
+    invalidate_user(instance.user_id)
@@ -0,0 +1,83 @@
+import pytest
+from allauth.account.models import EmailAddress
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+from lolo.users.authentication import CachedTokenAuthentication, invalidate_user
+from lolo.users.models import User
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def token(user: User) -> Token:
+    return Token.objects.create(user=user)
+
+
+def authenticate(key: str):
+    return CachedTokenAuthentication().authenticate_credentials(key)
+
+
+class TestCachedTokenAuthentication:
+    def test_repeat_requests_skip_the_database(self, token: Token, django_assert_num_queries):
+        authenticate(token.key)
+
+        with django_assert_num_queries(0):
+            user, cached = authenticate(token.key)
+
+        assert user.pk == token.user_id
+        assert cached.key == token.key
+
+    def test_user_save_refreshes_the_snapshot(self, user: User, token: Token):
+        authenticate(token.key)
+        user.name = "Renamed"
+        user.save()
+
+        assert authenticate(token.key)[0].name == "Renamed"
+
+    def test_ticket_updates_refresh_the_snapshot(self, user: User, token: Token):
+        authenticate(token.key)
+        User.objects.filter(pk=user.pk).update(tickets=42)
+        invalidate_user(user.pk)
+
+        assert authenticate(token.key)[0].tickets == 42
+
+    def test_logout_revokes_immediately(self, token: Token):
+        key = token.key
+        authenticate(key)
+        token.delete()
+
+        with pytest.raises(AuthenticationFailed):
+            authenticate(key)
+
+    def test_deactivated_user_is_refused(self, user: User, token: Token):
+        authenticate(token.key)
+        user.is_active = False
+        user.save()
+
+        with pytest.raises(AuthenticationFailed):
+            authenticate(token.key)
+
+    def test_email_status_is_cached_and_invalidated(self, user: User, token: Token):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        url = reverse("api:user-email-status")
+        assert client.get(url).data["verified"] is False
+
+        with CaptureQueriesContext(connection) as queries:
+            client.get(url)
+        # Only the request transaction's savepoint remains
+        assert not [query for query in queries if "SELECT" in query["sql"]]
+
+        EmailAddress.objects.create(user=user, email=user.email, verified=True, primary=True)
+        assert client.get(url).data == {"email": user.email, "verified": True, "primary": True}